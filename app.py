@@ -1,116 +1,233 @@
 import os
 import queue
 import time
-import sounddevice as sd
-import vosk
-import nltk
-import re
-from nltk.corpus import stopwords
-from nltk.tokenize import sent_tokenize, word_tokenize
-import heapq
 import json
-from flask import Flask, request, jsonify
+import re
+from flask import Flask, Response, request, jsonify
 from flask_cors import CORS
-from flask_socketio import SocketIO, emit
+from flask_socketio import SocketIO, emit, join_room, leave_room
 import threading
-
-# Download NLTK data
-nltk.download('punkt')
-nltk.download('stopwords')
+from contextlib import nullcontext
+from vosk_models import registry as model_registry
+from transcription_sessions import SessionManager
+from audio_buffer import OVERFLOW_POLICIES
+from transcript_cleaning import get_cleaner
+from summarization import summarize_text
+from live_summary import LiveSummarizer
+from summary_cache import SummaryCache, summary_key
+from finalize_jobs import JobQueue, finalize_meeting
+from transcript_segments import PartialCoalescer, SegmentStore
+from vad import VoiceActivityGate
+from dual_capture import ChannelRecognizer, TimeOrderedMerger, split_channels
+import transcript_journal
+from pipeline_metrics import (CONTENT_TYPE as METRICS_CONTENT_TYPE, PipelineMetrics, format_counter,
+                              format_gauge)
+
+# NLTK, vosk and sounddevice are imported on first use so the server starts
+# without network access; see summarization.ensure_nltk_data
+
+# 'threading' for the development server; start_transcript_server.py --production
+# sets 'gevent' or 'eventlet' (cooperative, one green thread per connection)
+SOCKETIO_ASYNC_MODE = os.environ.get("SOCKETIO_ASYNC_MODE", "threading")
 
 # Initialize Flask app with SocketIO
 app = Flask(__name__)
 CORS(app)
-socketio = SocketIO(app, cors_allowed_origins="*")
+socketio = SocketIO(app, cors_allowed_origins="*", async_mode=SOCKETIO_ASYNC_MODE)
 
 # ---------------- Configuration ----------------
 TRANSCRIPT_FOLDER = "transcripts"
 SUMMARY_FOLDER = "meeting_summaries"
+RECORDINGS_FOLDER = "recordings"  # batch transcription reads WAV files from here
 os.makedirs(TRANSCRIPT_FOLDER, exist_ok=True)
 os.makedirs(SUMMARY_FOLDER, exist_ok=True)
 
 MODEL_PATH = "vosk-model-small-en-us-0.15"  # path to Vosk model folder
 SAMPLE_RATE = 16000
 
-FILLER_WORDS = ["en", "then", "uh", "um", "okay", "so", "like", "actually", "basically"]
+# Concurrent recognizers per server; extra meetings wait in a bounded queue
+MAX_ACTIVE_SESSIONS = int(os.environ.get("MAX_TRANSCRIPTION_SESSIONS", 4))
+MAX_QUEUED_SESSIONS = int(os.environ.get("MAX_QUEUED_TRANSCRIPTIONS", 8))
+
+# Audio waiting for a meeting's recognizer is capped at this many seconds; when the
+# recognizer falls behind, the overflow policy decides what gives (see audio_buffer.py)
+AUDIO_BUFFER_SECONDS = float(os.environ.get("AUDIO_BUFFER_SECONDS", 10))
+AUDIO_OVERFLOW_POLICY = os.environ.get("AUDIO_OVERFLOW_POLICY", "drop_oldest")
+# Cheaper model a degraded session switches to under the fallback_model policy
+FALLBACK_MODEL_PATH = os.environ.get("FALLBACK_MODEL_PATH")
+if AUDIO_OVERFLOW_POLICY not in OVERFLOW_POLICIES:
+    raise ValueError(f"AUDIO_OVERFLOW_POLICY must be one of {', '.join(OVERFLOW_POLICIES)}")
+if AUDIO_OVERFLOW_POLICY == "fallback_model" and not FALLBACK_MODEL_PATH:
+    print("⚠️  AUDIO_OVERFLOW_POLICY=fallback_model without FALLBACK_MODEL_PATH; "
+          "a full buffer will drop the oldest audio")
+
+# Voice-activity gate in front of each meeting's recognizer; VAD=0 feeds it every block
+VAD_ENABLED = os.environ.get("VAD", "1") != "0"
+
+# Lag reports go to the meeting room at most this often, while the lag is above the minimum
+LAG_REPORT_INTERVAL = 2.0
+LAG_REPORT_MIN_SECONDS = 1.0
+
+# 'local' captures the server's microphone, 'stream' takes PCM frames from clients
+# 'dual' captures the microphone and the meeting audio as two channels of one input
+AUDIO_SOURCES = ("local", "stream", "dual")
+# PortAudio calls back on its own OS thread, which green-thread servers can't take input from
+LOCAL_CAPTURE_ASYNC_MODES = ("threading",)
+
+# Dual-source capture: a multi-channel input device (e.g. an aggregate or loopback device)
+# with the microphone and the meeting audio on the given 0-based channels
+DUAL_CAPTURE_DEVICE = os.environ.get("DUAL_CAPTURE_DEVICE") or None
+if DUAL_CAPTURE_DEVICE is not None and DUAL_CAPTURE_DEVICE.isdigit():
+    DUAL_CAPTURE_DEVICE = int(DUAL_CAPTURE_DEVICE)
+DUAL_MIC_CHANNEL = int(os.environ.get("DUAL_MIC_CHANNEL", 0))
+DUAL_MEETING_CHANNEL = int(os.environ.get("DUAL_MEETING_CHANNEL", 1))
+
+# Seconds between live summary pushes while a meeting is running
+LIVE_SUMMARY_INTERVAL = 5
+
+# Events emitted for each action item or decision found in a finalized chunk
+ITEM_EVENTS = {'action': 'action_item_detected', 'decision': 'decision_detected'}
+
+# A stream session whose sending client disconnects is stopped unless it reconnects within this
+STREAM_RECONNECT_GRACE_SECONDS = float(os.environ.get("STREAM_RECONNECT_GRACE_SECONDS", 15))
+
+# Transcript journal group commit: fsync at most once per interval unless this many bytes wait
+JOURNAL_COMMIT_INTERVAL = 1.0
+JOURNAL_COMMIT_BYTES = 64 * 1024
+
+# Upper bound on partial-result emits per meeting (per channel for dual sessions); unchanged partials are never re-sent
+MAX_PARTIAL_EMITS_PER_SECOND = float(os.environ.get("MAX_PARTIAL_EMITS_PER_SECOND", 4))
+
+# Filler lexicon name ("en") or path to a words file, one filler per line
+FILLER_LEXICON = os.environ.get("FILLER_LEXICON", "en")
+transcript_cleaner = get_cleaner(FILLER_LEXICON)
+
+# Summaries kept in memory by the summary cache; older ones are still read back from disk
+SUMMARY_CACHE_ENTRIES = int(os.environ.get("SUMMARY_CACHE_ENTRIES", 64))
+# Worker processes that write final transcripts and summaries after a meeting ends;
+# 0 does it inline in the transcription thread
+FINALIZE_WORKERS = int(os.environ.get("FINALIZE_WORKERS", 1))
+# Times a failed final transcript and summary job is run again before summary_ready reports it
+FINALIZE_RETRIES = int(os.environ.get("FINALIZE_RETRIES", 1))
+
+# Most key points GET /api/meetings/<id>/summary will produce
+MAX_SUMMARY_SENTENCES = 50
+
+# Stage timings are recorded only while /metrics was scraped within this many seconds
+METRICS_IDLE_SECONDS = float(os.environ.get("METRICS_IDLE_SECONDS", 300))
+pipeline_metrics = PipelineMetrics(idle_seconds=METRICS_IDLE_SECONDS)
 
 # ---------------- Helper Functions ----------------
+def run_blocking(fn, *args):
+    """Call fn on a real OS thread when serving with green threads.
+
+    Recognizer calls hold the CPU for tens of milliseconds; under gevent or
+    eventlet they would stall every connection on the event loop.
+    """
+    if socketio.async_mode == 'gevent':
+        import gevent
+        return gevent.get_hub().threadpool.apply(fn, args)
+    if socketio.async_mode == 'eventlet':
+        from eventlet import tpool
+        return tpool.execute(fn, *args)
+    return fn(*args)
+
 def clean_transcript(text):
     """Clean the transcript: remove filler words, normalize whitespace."""
-    text = re.sub(r'\s+', ' ', text).strip()
-    for word in FILLER_WORDS:
-        text = re.sub(r'\b' + re.escape(word) + r'\b', '', text, flags=re.IGNORECASE)
-    return text
-
-def structured_summary(text, max_sentences=10):
-    """Generate a structured summary with key points, action items, and decisions."""
-    text = clean_transcript(text)
-    sentences = sent_tokenize(text)
-    stop_words = set(stopwords.words('english'))
-
-    # Score sentences by word frequency
-    word_freq = {}
-    for word in word_tokenize(text.lower()):
-        if word.isalpha() and word not in stop_words:
-            word_freq[word] = word_freq.get(word, 0) + 1
-
-    if not word_freq:
-        return "No meaningful content to summarize."
-
-    max_freq = max(word_freq.values())
-    for word in word_freq:
-        word_freq[word] /= max_freq
-
-    sentence_scores = {}
-    for sent in sentences:
-        for word in word_tokenize(sent.lower()):
-            if word in word_freq and len(sent.split()) <= 50:
-                sentence_scores[sent] = sentence_scores.get(sent, 0) + word_freq[word]
-
-    top_sentences = heapq.nlargest(max_sentences, sentence_scores, key=sentence_scores.get)
-
-    # Structured summary
-    summary_text = "📝 Meeting Summary\n\n"
-    summary_text += "Key Points:\n"
-    for s in top_sentences:
-        summary_text += f"- {s}\n"
-
-    # Action items
-    action_items = [s for s in sentences if re.search(r'\b(action|task|follow[- ]?up|responsible|assign)\b', s, re.IGNORECASE)]
-    if action_items:
-        summary_text += "\nAction Items:\n"
-        for a in action_items:
-            summary_text += f"- {a}\n"
-
-    # Decisions
-    decisions = [s for s in sentences if re.search(r'\b(decision|decided|approved|agreement)\b', s, re.IGNORECASE)]
-    if decisions:
-        summary_text += "\nDecisions Made:\n"
-        for d in decisions:
-            summary_text += f"- {d}\n"
-
-    return summary_text
-
-def save_final_transcript_and_summary(text, meeting_name="live_meeting"):
+    return transcript_cleaner.clean(text)
+
+def structured_summary(text, max_sentences=10, cleaned=False):
+    """Generate a structured summary with key points, action items, and decisions.
+
+    Pass cleaned=True when text already went through clean_transcript.
+    """
+    if not cleaned:
+        text = clean_transcript(text)
+    return summarize_text(text, max_sentences)
+
+def summarize_cleaned(text, max_sentences):
+    """Summary cache miss: run the full structured summary over already-cleaned text."""
+    with pipeline_metrics.timer('structured_summary'):
+        return structured_summary(text, max_sentences=max_sentences, cleaned=True)
+
+# Summaries by hash of the cleaned transcript and max_sentences: an in-memory LRU of
+# SUMMARY_CACHE_ENTRIES on top of files in SUMMARY_FOLDER/.cache
+summary_cache = SummaryCache(SUMMARY_FOLDER, summarize_cleaned, max_entries=SUMMARY_CACHE_ENTRIES)
+
+def meeting_file_name(meeting_id):
+    """File name stem for a meeting's transcript files; meeting ids come from clients."""
+    return "meeting_" + re.sub(r'[^A-Za-z0-9_.-]', '_', str(meeting_id)).lstrip('.')
+
+def save_final_transcript_and_summary(text, meeting_name="live_meeting", cleaned=False):
     """Save the final transcript and summary to files."""
-    cleaned_text = clean_transcript(text)
+    cleaned_text = text if cleaned else clean_transcript(text)
 
     transcript_file = os.path.join(TRANSCRIPT_FOLDER, meeting_name + "_transcript.txt")
-    with open(transcript_file, "w", encoding="utf8") as f:
+    with pipeline_metrics.timer('file_write'), open(transcript_file, "w", encoding="utf8") as f:
         f.write(cleaned_text)
 
-    summary = structured_summary(cleaned_text, max_sentences=12)
+    summary, _ = summary_cache.get(cleaned_text, 12)
     summary_file = os.path.join(SUMMARY_FOLDER, meeting_name + "_structured_summary.txt")
-    with open(summary_file, "w", encoding="utf8") as f:
+    with pipeline_metrics.timer('file_write'), open(summary_file, "w", encoding="utf8") as f:
         f.write(summary)
 
     print(f"\n✅ Final transcript saved: {transcript_file}")
     print(f"✅ Final summary saved: {summary_file}")
 
+def final_files(meeting_name):
+    """(transcript_file, summary_file) a meeting's final save writes."""
+    return (os.path.join(TRANSCRIPT_FOLDER, meeting_name + "_transcript.txt"),
+            os.path.join(SUMMARY_FOLDER, meeting_name + "_structured_summary.txt"))
+
+def finalize_in_background(meeting_id, journal_file):
+    """Queue the final transcript and summary of a meeting; summary_ready is emitted once written."""
+    transcript_file, summary_file = final_files(meeting_file_name(meeting_id))
+    queued_at = time.perf_counter()
+
+    def on_done(job):
+        pipeline_metrics.observe('finalize_job', time.perf_counter() - queued_at)
+        result = job['result'] or {}
+        # Stages the worker process timed, recorded here where /metrics reads them
+        for stage, seconds in result.get('timings', ()):
+            pipeline_metrics.observe(stage, seconds)
+        if result.get('summary_file'):
+            print(f"\n✅ Final transcript saved: {result['transcript_file']}")
+            print(f"✅ Final summary saved: {result['summary_file']}")
+        # A failed job leaves the journal in place; recover_transcripts retries it on restart
+        socketio.emit('summary_ready', {
+            'meeting_id': meeting_id,
+            'job_id': job['id'],
+            'status': job['status'],
+            'summary': result.get('summary'),
+            'transcript_file': result.get('transcript_file'),
+            'summary_file': result.get('summary_file'),
+            'error': job['error'],
+            'recover_on_restart': job['status'] == 'failed'
+        }, to=meeting_room(meeting_id))
+
+    return finalize_jobs.submit('finalize_meeting', finalize_meeting, journal_file, transcript_file,
+                                summary_file, FILLER_LEXICON, 12, meeting_id=meeting_id,
+                                on_done=on_done)
+
+def recover_transcripts():
+    """Finish transcripts of meetings whose server crashed before the final save."""
+    for journal_file in transcript_journal.pending_journals(TRANSCRIPT_FOLDER):
+        meeting_name = transcript_journal.journal_meeting_name(journal_file)
+        print(f"♻️  Recovering transcript from journal: {journal_file}")
+        try:
+            result = finalize_meeting(journal_file, *final_files(meeting_name), FILLER_LEXICON, 12)
+            if result['summary_file']:
+                print(f"\n✅ Final transcript saved: {result['transcript_file']}")
+                print(f"✅ Final summary saved: {result['summary_file']}")
+        except Exception as e:
+            print(f"Could not recover {journal_file}: {e}")
+
 # ---------------- Live Transcription ----------------
 def main():
+    import sounddevice as sd
+
     q = queue.Queue()
-    accumulated_text = ""
+    chunks = []
 
     def audio_callback(indata, frames, time_info, status):
         if status:
@@ -119,11 +236,9 @@ def main():
 
     print("🎤 Live transcription started. Press Ctrl+C to end the meeting.\n")
     
-    model = vosk.Model(MODEL_PATH)
-    rec = vosk.KaldiRecognizer(model, SAMPLE_RATE)
-
-    with sd.RawInputStream(samplerate=SAMPLE_RATE, blocksize=8000, dtype='int16',
-                           channels=1, callback=audio_callback):
+    with model_registry.recognizer(MODEL_PATH, SAMPLE_RATE) as rec, \
+            sd.RawInputStream(samplerate=SAMPLE_RATE, blocksize=8000, dtype='int16',
+                              channels=1, callback=audio_callback):
         try:
             while True:
                 data = q.get()
@@ -131,7 +246,7 @@ def main():
                     result = rec.Result()
                     text_chunk = json.loads(result)['text']
                     if text_chunk.strip():
-                        accumulated_text += " " + text_chunk.strip()
+                        chunks.append(text_chunk.strip())
                         print(f"[Live] {text_chunk.strip()}")
                 else:
                     partial = json.loads(rec.PartialResult())['partial']
@@ -139,104 +254,624 @@ def main():
                         print(f"[Partial] {partial}", end='\r')  # shows partial text live
 
         except KeyboardInterrupt:
-            save_final_transcript_and_summary(accumulated_text)
+            save_final_transcript_and_summary(" ".join(chunks))
             print("🛑 Live transcription stopped.")
 
 # ---------------- WebSocket Handlers ----------------
+def meeting_room(meeting_id):
+    """Socket.IO room holding the participants of one meeting."""
+    return f"meeting:{meeting_id}"
+
 @socketio.on('connect')
 def handle_connect():
+    global socketio_clients
+    with socketio_clients_lock:
+        socketio_clients += 1
     print('Client connected')
     emit('status', {'message': 'Connected to transcript service'})
 
 @socketio.on('disconnect')
 def handle_disconnect():
+    global socketio_clients
+    with socketio_clients_lock:
+        socketio_clients -= 1
     print('Client disconnected')
+    meeting_id = stream_clients.pop(request.sid, None)
+    if meeting_id is not None:
+        session = session_manager.get(meeting_id)
+        if session is not None and not session.stopped:
+            # Give the client a moment to reconnect and re-register before the session ends
+            socketio.start_background_task(stop_orphaned_stream, meeting_id, session)
+
+def stop_orphaned_stream(meeting_id, session):
+    """Stop a stream session whose audio source disconnected and did not come back in time."""
+    socketio.sleep(STREAM_RECONNECT_GRACE_SECONDS)
+    if meeting_id in stream_clients.values() or session_manager.get(meeting_id) is not session:
+        return
+    print(f'Stream source of meeting {meeting_id} did not reconnect, stopping transcription')
+    session_manager.stop(meeting_id)
+    socketio.emit('transcription_stopped', {'meeting_id': meeting_id}, to=meeting_room(meeting_id))
 
 @socketio.on('start_transcription')
 def handle_start_transcription(data):
     meeting_id = data.get('meeting_id', 'default')
-    print(f'Starting transcription for meeting: {meeting_id}')
-    
-    # Start transcription in a separate thread
-    thread = threading.Thread(target=start_live_transcription, args=(meeting_id,))
-    thread.daemon = True
-    thread.start()
-    
-    emit('transcription_started', {'meeting_id': meeting_id})
+    source = data.get('source', 'local')
+    if source not in AUDIO_SOURCES:
+        emit('transcription_rejected', {
+            'meeting_id': meeting_id,
+            'message': f"Unknown audio source: {source}"
+        })
+        return
+    if source != 'stream' and socketio.async_mode not in LOCAL_CAPTURE_ASYNC_MODES:
+        emit('transcription_rejected', {
+            'meeting_id': meeting_id,
+            'message': "Local microphone capture needs the development server; stream audio instead"
+        })
+        return
+    print(f'Starting transcription for meeting: {meeting_id} ({source})')
+    join_room(meeting_room(meeting_id))
+
+    # The session manager runs the meeting now, queues it, or rejects it when full
+    channels = max(DUAL_MIC_CHANNEL, DUAL_MEETING_CHANNEL) + 1 if source == 'dual' else 1
+    session, status = session_manager.start(meeting_id, source=source, channels=channels)
+    if session is not None and session.source == 'stream':
+        sources = [sid for sid, streamed_meeting in stream_clients.items()
+                   if streamed_meeting == meeting_id and sid != request.sid]
+        if sources:
+            # One audio source per meeting; this client stays in the room as a listener
+            emit('transcription_rejected', {
+                'meeting_id': meeting_id,
+                'message': 'Another client is already streaming audio for this meeting'
+            })
+            return
+        # Frames from this client carry no meeting id; route them by socket id
+        stream_clients[request.sid] = meeting_id
+    if status == 'queued':
+        queued = {'meeting_id': meeting_id}
+        position = session_manager.queue_position(meeting_id)
+        # A restart waits for its previous session to finish saving, not in the queue
+        if position is not None:
+            queued['position'] = position
+        emit('transcription_queued', queued)
+    elif status == 'rejected':
+        emit('transcription_rejected', {
+            'meeting_id': meeting_id,
+            'message': 'Transcription capacity reached, please try again later'
+        })
+    elif status == 'already_active':
+        emit('transcription_started', {'meeting_id': meeting_id, 'state': session.state})
+
+@socketio.on('join_meeting')
+def handle_join_meeting(data):
+    """Subscribe this client to one meeting's transcript events"""
+    meeting_id = data.get('meeting_id', 'default')
+    join_room(meeting_room(meeting_id))
+    emit('meeting_joined', {'meeting_id': meeting_id})
+
+@socketio.on('leave_meeting')
+def handle_leave_meeting(data):
+    meeting_id = data.get('meeting_id', 'default')
+    leave_room(meeting_room(meeting_id))
 
 @socketio.on('stop_transcription')
 def handle_stop_transcription(data):
     meeting_id = data.get('meeting_id', 'default')
     print(f'Stopping transcription for meeting: {meeting_id}')
-    # Set a flag to stop transcription
-    global transcription_active
-    transcription_active = False
+    # Only this meeting's session is stopped; other meetings keep running
+    session_manager.stop(meeting_id)
+    for sid, streamed_meeting in list(stream_clients.items()):
+        if streamed_meeting == meeting_id:
+            stream_clients.pop(sid, None)
     emit('transcription_stopped', {'meeting_id': meeting_id})
 
-# Global variables for transcription control
-transcription_active = False
-transcription_threads = {}
-
-def start_live_transcription(meeting_id):
-    global transcription_active
-    transcription_active = True
-    
-    q = queue.Queue()
-    accumulated_text = ""
+@socketio.on('audio_frame')
+def handle_audio_frame(pcm):
+    """Receive one binary frame of 16 kHz mono int16 PCM from a streaming client"""
+    meeting_id = stream_clients.get(request.sid)
+    if meeting_id is None:
+        return
+    # Socket.IO delivers binary attachments as raw bytes, no base64 decoding needed
+    if not isinstance(pcm, (bytes, bytearray)) or len(pcm) % 2:
+        emit('audio_frame_rejected', {
+            'meeting_id': meeting_id,
+            'message': 'Expected binary 16-bit PCM frames'
+        })
+        return
+    session = session_manager.get(meeting_id)
+    if session is not None and not session.stopped:
+        session.feed_audio(bytes(pcm))
+
+@socketio.on('transcript_resync')
+def handle_transcript_resync(data):
+    """Send a reconnecting client every segment after the last seq it has seen"""
+    meeting_id = data.get('meeting_id', 'default')
+    log = transcript_segments.get(meeting_id)
+    segments = log.since(data.get('since_seq', 0)) if log is not None else []
+    emit('transcript_segments', {
+        'meeting_id': meeting_id,
+        'segments': segments,
+        'last_seq': log.last_seq if log is not None else 0
+    })
+
+# Socket id -> meeting id for clients streaming their own audio
+stream_clients = {}
+
+# Connected Socket.IO clients, reported by /metrics
+socketio_clients = 0
+socketio_clients_lock = threading.Lock()
+
+# Numbered transcript segments per meeting, kept for a while after it ends for resyncs
+transcript_segments = SegmentStore()
+
+def start_live_transcription(session):
+    meeting_id = session.meeting_id
+    q = session.audio_queue
+    # Finalized chunks are numbered segments; clients only ever receive new ones
+    segments = transcript_segments.open(meeting_id)
+    # Segments are journaled as they arrive so a crash loses at most one commit window.
+    # The journal is this session's own: a finalize job still running for an earlier
+    # session of the meeting removes only its own journal.
+    journal_file = transcript_journal.journal_path(TRANSCRIPT_FOLDER, meeting_file_name(meeting_id))
+    journal = transcript_journal.TranscriptJournal(journal_file, JOURNAL_COMMIT_INTERVAL,
+                                                   JOURNAL_COMMIT_BYTES)
+    live_summary = LiveSummarizer(max_sentences=10)
+    last_summary_push = time.monotonic()
+    pushed_version = 0
+    last_lag_report = 0.0
+    lag_reported = False
     
     def audio_callback(indata, frames, time_info, status):
         if status:
             print(status)
-        q.put(bytes(indata))
+        session.feed_audio(bytes(indata))
     
     print(f"🎤 Live transcription started for meeting: {meeting_id}")
-    
-    model = vosk.Model(MODEL_PATH)
-    rec = vosk.KaldiRecognizer(model, SAMPLE_RATE)
-    
-    with sd.RawInputStream(samplerate=SAMPLE_RATE, blocksize=8000, dtype='int16',
-                           channels=1, callback=audio_callback):
+    room = meeting_room(meeting_id)
+    # Partials by speaker label (None for single-channel sessions): the lanes of a dual
+    # session are deduplicated, rate-limited and reset separately
+    coalescers = {}
+
+    def partials(label=None):
+        coalescer = coalescers.get(label)
+        if coalescer is None:
+            coalescer = coalescers[label] = PartialCoalescer(MAX_PARTIAL_EMITS_PER_SECOND)
+        return coalescer
+    # Drops silence between utterances before it reaches the recognizer
+    vad = VoiceActivityGate(SAMPLE_RATE) if VAD_ENABLED else None
+
+    def add_final(text_chunk, label=None):
+        if text_chunk.strip():
+            # Dual-source segments say who spoke: "[You] ..." or "[Meeting] ..."
+            text = f"{label} {text_chunk.strip()}" if label else text_chunk.strip()
+            segment = segments.append(text)
+            journal.append(segment)
+            # Emit only the new segment; clients resync with transcript_resync
+            with pipeline_metrics.timer('emit'):
+                socketio.emit('transcript_update', dict(segment, meeting_id=meeting_id), to=room)
+            print(f"[Live] {text}")
+            # Action items and decisions are announced as soon as the chunk that holds them arrives
+            for kind, sentence in live_summary.add_chunk(transcript_cleaner.clean_chunk(text_chunk)):
+                socketio.emit(ITEM_EVENTS[kind], {
+                    'meeting_id': meeting_id,
+                    'text': sentence,
+                    'speaker': label,
+                    'seq': segment['seq'],
+                    'timestamp': segment['timestamp']
+                }, to=room)
+
+    def send_partial(partial):
+        if partial:
+            # Emit partial results for real-time display, deduplicated and rate-limited
+            with pipeline_metrics.timer('emit'):
+                socketio.emit('transcript_partial', {
+                    'meeting_id': meeting_id,
+                    'partial_text': partial
+                }, to=room)
+            print(f"[Partial] {partial}", end='\r')
+
+    def emit_partial(partial, label=None):
+        text = f"{label} {partial}" if label else partial
+        send_partial(partials(label).offer(text, time.monotonic()))
+
+    def flush_partials():
+        now = time.monotonic()
+        for coalescer in coalescers.values():
+            send_partial(coalescer.flush(now))
+
+    def on_idle():
+        # A partial held back by the rate limit goes out once the interval has passed
+        flush_partials()
+        journal.maybe_commit()
+
+    def handle_result(active_rec, final):
+        if final:
+            result = active_rec.Result()
+            with pipeline_metrics.timer('json_parse'):
+                text_chunk = json.loads(result)['text']
+            add_final(text_chunk)
+            partials().reset()
+            return
+        result = active_rec.PartialResult()
+        with pipeline_metrics.timer('json_parse'):
+            partial = json.loads(result)['partial'].strip()
+        if partial:
+            emit_partial(partial)
+
+    def report_lag(lag_seconds):
+        socketio.emit('transcription_lag', {
+            'meeting_id': meeting_id,
+            'lag_seconds': round(lag_seconds, 3),
+            'buffered_seconds': round(q.buffered_seconds, 3),
+            'dropped_seconds': round(q.dropped_seconds, 3),
+            'degraded': fallback_rec is not None
+        }, to=room)
+
+    def after_block(captured_at):
+        nonlocal pushed_version, last_summary_push, last_lag_report, lag_reported
+        flush_partials()
+        # Push the running summary every few seconds if it changed
+        if (live_summary.version != pushed_version and
+                time.monotonic() - last_summary_push >= LIVE_SUMMARY_INTERVAL):
+            socketio.emit('summary_update', dict(live_summary.snapshot(), meeting_id=meeting_id),
+                          to=room)
+            pushed_version = live_summary.version
+            last_summary_push = time.monotonic()
+        lag_seconds = time.monotonic() - captured_at
+        session.record_progress(time.thread_time(), lag_seconds)
+        # Tell clients while the transcript trails live audio, and once more when it recovers
+        if ((lag_seconds >= LAG_REPORT_MIN_SECONDS or lag_reported) and
+                time.monotonic() - last_lag_report >= LAG_REPORT_INTERVAL):
+            report_lag(lag_seconds)
+            lag_reported = lag_seconds >= LAG_REPORT_MIN_SECONDS
+            last_lag_report = time.monotonic()
+
+    socketio.emit('transcription_started', {'meeting_id': meeting_id, 'source': session.source}, to=room)
+
+    # Streaming sessions are fed by handle_audio_frame instead of the local microphone
+    if session.source == 'local':
+        import sounddevice as sd
+        capture = sd.RawInputStream(samplerate=SAMPLE_RATE, blocksize=8000, dtype='int16',
+                                    channels=1, callback=audio_callback)
+    elif session.source == 'dual':
+        import sounddevice as sd
+        capture = sd.RawInputStream(samplerate=SAMPLE_RATE, blocksize=8000, dtype='int16',
+                                    channels=session.channels, device=DUAL_CAPTURE_DEVICE,
+                                    callback=audio_callback)
+    else:
+        capture = nullcontext()
+
+    fallback_rec = None
+    with model_registry.recognizer(MODEL_PATH, SAMPLE_RATE) as rec, capture:
         try:
-            while transcription_active:
-                data = q.get()
-                if rec.AcceptWaveform(data):
-                    result = rec.Result()
-                    text_chunk = json.loads(result)['text']
-                    if text_chunk.strip():
-                        accumulated_text += " " + text_chunk.strip()
-                        # Emit real-time transcript to connected clients
-                        socketio.emit('transcript_update', {
-                            'meeting_id': meeting_id,
-                            'text': text_chunk.strip(),
-                            'full_transcript': accumulated_text
-                        })
-                        print(f"[Live] {text_chunk.strip()}")
-                else:
-                    partial = json.loads(rec.PartialResult())['partial']
-                    if partial.strip():
-                        # Emit partial results for real-time display
-                        socketio.emit('transcript_partial', {
-                            'meeting_id': meeting_id,
-                            'partial_text': partial.strip()
-                        })
-                        print(f"[Partial] {partial}", end='\r')
+            if session.source == 'dual':
+                # Runs until the session stops and the audio captured before the stop is used up
+                transcribe_channels(session, rec, add_final, emit_partial,
+                                    lambda label: partials(label).reset(), after_block, on_idle)
+            else:
+                while True:
+                    try:
+                        block = session.next_block()
+                    except queue.Empty:
+                        on_idle()
+                        continue
+                    if block is None:
+                        break
+                    captured_at, data = block
+                    # fallback_model policy: use the cheaper model while the buffer is backed up.
+                    # The outgoing recognizer's pending words are finalized so no utterance is lost.
+                    if FALLBACK_MODEL_PATH and q.degraded != (fallback_rec is not None):
+                        if fallback_rec is None:
+                            add_final(json.loads(rec.FinalResult())['text'])
+                            fallback_rec = run_blocking(model_registry.acquire, FALLBACK_MODEL_PATH,
+                                                        SAMPLE_RATE)
+                            print(f"⚠️  {meeting_id}: recognizer behind, switched to {FALLBACK_MODEL_PATH}")
+                        else:
+                            add_final(json.loads(fallback_rec.FinalResult())['text'])
+                            model_registry.release(fallback_rec)
+                            fallback_rec = None
+                            print(f"✅ {meeting_id}: caught up, back on {MODEL_PATH}")
+                        partials().reset()
+                        report_lag(time.monotonic() - captured_at)
+                    audio_seconds = len(data) / 2 / SAMPLE_RATE
+                    if vad is not None:
+                        with pipeline_metrics.timer('vad'):
+                            data = vad.process(data)
+                        session.vad_skipped_fraction = vad.skipped_fraction
+                    accept_seconds = 0.0
+                    # Silence the gate held back never reaches the recognizer
+                    if data:
+                        active_rec = fallback_rec or rec
+                        accept_started = time.perf_counter()
+                        final = run_blocking(active_rec.AcceptWaveform, data)
+                        accept_seconds = time.perf_counter() - accept_started
+                        pipeline_metrics.observe('accept_waveform', accept_seconds)
+                        handle_result(active_rec, final)
+                    if vad is not None and vad.closed:
+                        # The gate dropped the silence the recognizer would endpoint on; end the utterance here
+                        add_final(json.loads((fallback_rec or rec).FinalResult())['text'])
+                        partials().reset()
+                    # Real-time factor: recognizer time per second of meeting audio, skipped silence included
+                    session.record_recognizer(accept_seconds, audio_seconds)
+                    after_block(captured_at)
         except Exception as e:
             print(f"Transcription error: {e}")
         finally:
-            # Save final transcript when stopping
-            if accumulated_text.strip():
-                save_final_transcript_and_summary(accumulated_text, f"meeting_{meeting_id}")
+            for coalescer in coalescers.values():
+                send_partial(coalescer.drain())
+            # Words still pending in the recognizer are the meeting's last utterance
+            try:
+                add_final(json.loads((fallback_rec or rec).FinalResult())['text'])
+            except Exception as e:
+                print(f"Could not finalize the last utterance: {e}")
+            if fallback_rec is not None:
+                model_registry.release(fallback_rec)
+            if VAD_ENABLED:
+                print(f"🔇 {meeting_id}: voice-activity gate skipped "
+                      f"{session.vad_skipped_fraction:.0%} of the audio")
+            # Save final transcript when stopping. The files are written by a background job,
+            # so clients get the transcript now and summary_ready once the summary exists.
+            transcript_segments.finish(meeting_id)
+            journal.close()
+            job_id = finalize_in_background(meeting_id, journal_file)
+            if segments.last_seq:
                 socketio.emit('transcript_complete', {
                     'meeting_id': meeting_id,
-                    'final_transcript': accumulated_text
-                })
+                    'final_transcript': segments.text(),
+                    'last_seq': segments.last_seq,
+                    'job_id': job_id
+                }, to=room)
+
+def transcribe_channels(session, rec, on_final, on_partial, on_endpoint, on_block, on_idle):
+    """Dual-source loop: each channel gets its own recognizer thread, finals are merged by start time.
+
+    on_partial(text, label) and on_endpoint(label) are called as soon as a
+    lane reports them; on_final(text, label) once the merger releases a final.
+    """
+    results = queue.Queue()
+    meeting_rec = run_blocking(model_registry.acquire, MODEL_PATH, SAMPLE_RATE)
+    lanes = [ChannelRecognizer(label, channel, channel_rec, results, SAMPLE_RATE,
+                               vad=VoiceActivityGate(SAMPLE_RATE) if VAD_ENABLED else None)
+             for label, channel, channel_rec in (('[You]', DUAL_MIC_CHANNEL, rec),
+                                                 ('[Meeting]', DUAL_MEETING_CHANNEL, meeting_rec))]
+    merger = TimeOrderedMerger(lanes)
+
+    def deliver(watermark):
+        while True:
+            try:
+                kind, lane, at, text = results.get_nowait()
+            except queue.Empty:
+                break
+            if kind == 'final':
+                # That lane's utterance ended; its next partial starts a new one
+                on_endpoint(lane.label)
+                merger.add(at, lane, text)
+            else:
+                on_partial(text, lane.label)
+        for _, lane, text in merger.release(watermark):
+            on_final(text, lane.label)
+
+    for lane in lanes:
+        lane.start()
+    try:
+        while True:
+            # Taken before reading results: any final queued later started after it
+            watermark = merger.watermark()
+            try:
+                item = session.next_block()
+            except queue.Empty:
+                deliver(watermark)
+                on_idle()
+                continue
+            if item is None:
+                break
+            captured_at, block = item
+            views = split_channels(block, session.channels)
+            for lane in lanes:
+                # A full inbox waits here, so a slow channel backs up the session's audio buffer
+                while True:
+                    try:
+                        lane.inbox.put((captured_at, views[lane.channel]), timeout=0.5)
+                        break
+                    except queue.Full:
+                        deliver(watermark)
+            deliver(watermark)
+            # Real-time factor of the meeting: both recognizers' time per second of audio
+            session.recognizer_seconds = sum(lane.recognizer_seconds for lane in lanes)
+            session.audio_seconds = max(lane.audio_seconds for lane in lanes)
+            if VAD_ENABLED:
+                session.vad_skipped_fraction = sum(lane.vad.skipped_fraction for lane in lanes) / len(lanes)
+            on_block(captured_at)
+    finally:
+        for lane in lanes:
+            lane.close()
+        deliver(float('inf'))
+        model_registry.release(meeting_rec)
+
+# Final transcript and summary jobs, off the transcription threads
+finalize_jobs = JobQueue(workers=FINALIZE_WORKERS, retries=FINALIZE_RETRIES)
+
+# One session per meeting, with a cap on concurrently running recognizers
+session_manager = SessionManager(start_live_transcription,
+                                 max_active=MAX_ACTIVE_SESSIONS,
+                                 max_queued=MAX_QUEUED_SESSIONS,
+                                 buffer_seconds=AUDIO_BUFFER_SECONDS,
+                                 overflow_policy=AUDIO_OVERFLOW_POLICY)
 
 # ---------------- API Routes ----------------
 @app.route('/api/health', methods=['GET'])
 def health_check():
     return jsonify({'status': 'healthy', 'service': 'transcript-service'})
 
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Prometheus text exposition of pipeline stage timings, queues, sessions and clients"""
+    status = session_manager.status()
+    sessions = status['active'] + status['queued']
+    lines = pipeline_metrics.render()
+    lines += format_gauge('transcript_audio_queue_depth',
+                          'Audio blocks waiting for the recognizer, per meeting.',
+                          [({'meeting_id': s['meeting_id']}, s['queue_depth']) for s in sessions])
+    lines += format_gauge('transcript_recognizer_real_time_factor',
+                          'AcceptWaveform time per second of audio, per running meeting.',
+                          [({'meeting_id': s['meeting_id']}, s['real_time_factor'])
+                           for s in status['active']])
+    lines += format_gauge('transcript_lag_seconds',
+                          'How far the recognizer trails live audio, per running meeting.',
+                          [({'meeting_id': s['meeting_id']}, s['lag_seconds'])
+                           for s in status['active']])
+    lines += format_gauge('transcript_audio_buffered_seconds',
+                          'Seconds of audio waiting for the recognizer, per meeting.',
+                          [({'meeting_id': s['meeting_id']}, s['buffered_seconds']) for s in sessions])
+    lines += format_gauge('transcript_audio_dropped_seconds',
+                          'Seconds of audio discarded by the overflow policy, per meeting.',
+                          [({'meeting_id': s['meeting_id']}, s['dropped_seconds']) for s in sessions])
+    lines += format_gauge('transcript_vad_skipped_ratio',
+                          'Fraction of audio the voice-activity gate kept from the recognizer, per meeting.',
+                          [({'meeting_id': s['meeting_id']}, s['vad_skipped_fraction'])
+                           for s in status['active']])
+    cache_stats = summary_cache.stats()
+    lines += format_counter('transcript_summary_cache_hits_total', 'Summaries served from the cache.',
+                            [({'tier': tier}, hits) for tier, hits in cache_stats['hits'].items()])
+    lines += format_counter('transcript_summary_cache_misses_total',
+                            'Summaries computed because no cache tier had them.',
+                            [({}, cache_stats['misses'])])
+    lines += format_gauge('transcript_finalize_jobs', 'Final transcript and summary jobs by status.',
+                          [({'status': status}, n) for status, n in sorted(finalize_jobs.counts().items())])
+    lines += format_gauge('transcript_active_sessions', 'Running transcription sessions.',
+                          [({}, len(status['active']))])
+    lines += format_gauge('transcript_queued_sessions', 'Sessions waiting for a recognizer slot.',
+                          [({}, len(status['queued']))])
+    lines += format_gauge('transcript_socketio_clients', 'Connected Socket.IO clients.',
+                          [({}, socketio_clients)])
+    return Response("\n".join(lines) + "\n", content_type=METRICS_CONTENT_TYPE)
+
+@app.route('/api/models', methods=['GET'])
+def model_status():
+    """Report load time, memory and recognizer pool usage of loaded models"""
+    return jsonify(model_registry.stats())
+
+@app.route('/api/sessions', methods=['GET'])
+def session_status():
+    """List running and queued transcription sessions with CPU time and lag"""
+    return jsonify(session_manager.status())
+
+@app.route('/api/batch/transcriptions', methods=['POST'])
+def start_batch_transcription():
+    """Transcribe a directory of WAV recordings under RECORDINGS_FOLDER in the background"""
+    data = request.get_json(silent=True) or {}
+    recordings_root = os.path.realpath(RECORDINGS_FOLDER)
+    directory = os.path.realpath(os.path.join(recordings_root, data.get('directory', '')))
+    if os.path.commonpath([recordings_root, directory]) != recordings_root:
+        return jsonify({'error': 'Directory must be inside the recordings folder'}), 400
+    if not os.path.isdir(directory):
+        return jsonify({'error': 'Directory not found'}), 404
+
+    batch_id = f"batch_{len(batch_jobs) + 1}"
+    batch_jobs[batch_id] = {'id': batch_id, 'directory': directory, 'status': 'running', 'files': []}
+
+    def run_batch():
+        from batch_transcribe import transcribe_directory
+        try:
+            batch_jobs[batch_id]['files'] = transcribe_directory(
+                directory, save_final_transcript_and_summary,
+                model_path=MODEL_PATH, workers=data.get('workers'))
+            batch_jobs[batch_id]['status'] = 'completed'
+        except Exception as e:
+            batch_jobs[batch_id].update(status='failed', error=str(e))
+
+    thread = threading.Thread(target=run_batch, name=batch_id)
+    thread.daemon = True
+    thread.start()
+    return jsonify(batch_jobs[batch_id]), 202
+
+@app.route('/api/batch/transcriptions/<batch_id>', methods=['GET'])
+def get_batch_transcription(batch_id):
+    """Get the status and per-file report of a batch transcription"""
+    if batch_id not in batch_jobs:
+        return jsonify({'error': 'Batch not found'}), 404
+    return jsonify(batch_jobs[batch_id])
+
+@app.route('/api/summaries/batch', methods=['POST'])
+def summarize_transcripts_batch():
+    """Summarize many transcripts in one vectorized pass"""
+    data = request.get_json(silent=True) or {}
+    transcripts = data.get('transcripts', [])
+    if not isinstance(transcripts, list) or not all(isinstance(t, dict) for t in transcripts):
+        return jsonify({'error': 'transcripts must be a list of {id, text} objects'}), 400
+
+    try:
+        max_sentences = int(data.get('max_sentences', 10))
+    except (TypeError, ValueError):
+        max_sentences = 0
+    if not 1 <= max_sentences <= MAX_SUMMARY_SENTENCES:
+        return jsonify({'error': f'max_sentences must be between 1 and {MAX_SUMMARY_SENTENCES}'}), 400
+
+    from batch_summary import summarize_batch
+    summaries = summarize_batch([t.get('text', '') for t in transcripts],
+                                max_sentences=max_sentences, clean=clean_transcript)
+    return jsonify({'summaries': [{'id': t.get('id'), 'summary': summary}
+                                  for t, summary in zip(transcripts, summaries)]})
+
+@app.route('/api/meetings/<meeting_id>/segments', methods=['GET'])
+def get_transcript_segments(meeting_id):
+    """Get transcript segments after ?since=<seq> for a live or recently finished meeting"""
+    log = transcript_segments.get(meeting_id)
+    if log is None:
+        return jsonify({'error': 'No transcript for this meeting'}), 404
+    since = request.args.get('since', 0, type=int)
+    return jsonify({
+        'meeting_id': meeting_id,
+        'segments': log.since(since),
+        'last_seq': log.last_seq
+    })
+
+@app.route('/api/meetings/<meeting_id>/summary', methods=['GET'])
+def get_meeting_summary(meeting_id):
+    """Structured summary of a live, recent or saved meeting transcript, from the summary cache"""
+    max_sentences = request.args.get('max_sentences', 12, type=int)
+    if not 1 <= max_sentences <= MAX_SUMMARY_SENTENCES:
+        return jsonify({'error': f'max_sentences must be between 1 and {MAX_SUMMARY_SENTENCES}'}), 400
+
+    # Live and recently finished meetings summarize their segments; older ones their saved file
+    log = transcript_segments.get(meeting_id)
+    if log is not None and log.last_seq:
+        cleaned_text = clean_transcript(log.text())
+    else:
+        transcript_file = os.path.join(TRANSCRIPT_FOLDER, meeting_file_name(meeting_id) + "_transcript.txt")
+        try:
+            with open(transcript_file, encoding="utf8") as f:
+                cleaned_text = f.read()
+        except FileNotFoundError:
+            return jsonify({'error': 'No transcript for this meeting'}), 404
+
+    # The cache key identifies the summary's content, so it doubles as the ETag
+    etag = summary_key(cleaned_text, max_sentences)
+    if etag in request.if_none_match:
+        return '', 304, {'ETag': f'"{etag}"'}
+    summary, tier = summary_cache.get(cleaned_text, max_sentences)
+    response = jsonify({
+        'meeting_id': meeting_id,
+        'max_sentences': max_sentences,
+        'summary': summary,
+        'cache': tier
+    })
+    response.set_etag(etag)
+    return response
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """Status of a background job, e.g. the finalize_meeting job named in transcript_complete"""
+    job = finalize_jobs.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job)
+
+# Batch transcription runs started through the API
+batch_jobs = {}
+
 # ---------------- Entry Point ----------------
 if __name__ == "__main__":
+    recover_transcripts()
+    # Models and NLTK data load on first use; start_transcript_server.py --preload loads them up front
     # Run the Flask-SocketIO app
     socketio.run(app, host='0.0.0.0', port=5000, debug=True)
@@ -0,0 +1,106 @@
+"""
+Bounded audio buffer between capture and the recognizer.
+Capture callbacks must never block, so when the recognizer falls behind the
+buffer makes room according to an overflow policy instead of growing:
+
+  drop_oldest     discard the oldest audio (the transcript skips ahead)
+  skip_silence    discard silent blocks first, then the oldest audio
+  fallback_model  flag the session as degraded so the worker switches to a
+                  cheaper model until it catches up; drops the oldest audio
+                  only if even that is not enough
+"""
+
+import queue
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+OVERFLOW_POLICIES = ("drop_oldest", "skip_silence", "fallback_model")
+
+SILENCE_RMS = 300  # int16 RMS below which a block counts as silence
+
+# fallback_model: degrade once the buffer is this full, recover once it drains to this
+DEGRADE_FILL = 0.5
+RECOVER_FILL = 0.1
+
+
+def block_rms(pcm):
+    """RMS level of one block of 16-bit mono PCM."""
+    samples = np.frombuffer(pcm, dtype="<i2").astype(np.float32)
+    return float(np.sqrt((samples ** 2).mean())) if samples.size else 0.0
+
+
+class AudioRingBuffer:
+    """Holds at most max_seconds of (captured_at, pcm) blocks; get() mirrors queue.Queue."""
+
+    def __init__(self, max_seconds=10.0, policy="drop_oldest", sample_rate=16000, channels=1):
+        if policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {policy}")
+        self.bytes_per_second = sample_rate * 2 * channels
+        self.max_bytes = int(max_seconds * self.bytes_per_second)
+        self.policy = policy
+        self._blocks = deque()
+        self._bytes = 0
+        self._not_empty = threading.Condition(threading.Lock())
+        self.dropped_bytes = 0
+        self.degraded = False
+
+    def _seconds(self, n_bytes):
+        return n_bytes / self.bytes_per_second
+
+    @property
+    def buffered_seconds(self):
+        return self._seconds(self._bytes)
+
+    @property
+    def dropped_seconds(self):
+        return self._seconds(self.dropped_bytes)
+
+    def qsize(self):
+        return len(self._blocks)
+
+    def put(self, item):
+        """Add a (captured_at, pcm) block, making room first if the buffer is full. Never blocks."""
+        pcm = item[1]
+        with self._not_empty:
+            if self._bytes + len(pcm) > self.max_bytes:
+                self._make_room(len(pcm))
+            self._blocks.append(item)
+            self._bytes += len(pcm)
+            if self.policy == "fallback_model" and self._bytes >= self.max_bytes * DEGRADE_FILL:
+                self.degraded = True
+            self._not_empty.notify()
+
+    def _make_room(self, needed):
+        # Caller holds the lock
+        if self.policy == "skip_silence":
+            kept = deque()
+            for block in self._blocks:
+                if self._bytes + needed > self.max_bytes and block_rms(block[1]) < SILENCE_RMS:
+                    self._drop(len(block[1]))
+                else:
+                    kept.append(block)
+            self._blocks = kept
+        while self._blocks and self._bytes + needed > self.max_bytes:
+            self._drop(len(self._blocks.popleft()[1]))
+
+    def _drop(self, n_bytes):
+        self._bytes -= n_bytes
+        self.dropped_bytes += n_bytes
+
+    def get(self, timeout=None):
+        """Oldest block; raises queue.Empty if none arrives within timeout."""
+        with self._not_empty:
+            deadline = None if timeout is None else time.monotonic() + timeout
+            while not self._blocks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise queue.Empty
+                self._not_empty.wait(remaining)
+            item = self._blocks.popleft()
+            self._bytes -= len(item[1])
+            if self.degraded and self._bytes <= self.max_bytes * RECOVER_FILL:
+                self.degraded = False
+            return item
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Batch summarization of many transcripts at once.
+All sentences of all documents go into one sparse sentence/term count
+matrix, so word frequencies and sentence scores for the whole batch are a
+couple of sparse matrix products instead of a Python loop per document.
+
+Usage: python batch_summary.py transcripts/ --max-sentences 12
+"""
+
+import argparse
+import os
+
+import numpy as np
+from scipy import sparse
+
+from summarization import (MAX_SENTENCE_WORDS, NO_CONTENT_SUMMARY, format_summary, split_items,
+                           stop_words, tokenizers)
+
+
+def summarize_batch(texts, max_sentences=10, clean=None):
+    """Return one structured summary per text, matching structured_summary.
+
+    Each sentence is tokenized once and those tokens feed both the document
+    word frequencies and the sentence scores. Ties keep transcript order,
+    exactly like heapq.nlargest over sentence_scores.
+    """
+    if not texts:
+        return []
+
+    sent_tokenize, word_tokenize = tokenizers()
+    vocabulary = {}
+    stop = stop_words()
+    doc_sentences = []
+    doc_unique = []
+    row_doc, eligible = [], []
+    rows, cols = [], []
+
+    for doc, text in enumerate(texts):
+        if clean is not None:
+            text = clean(text)
+        sentences = sent_tokenize(text)
+        # Repeated sentences share one row, their counts add up like sentence_scores did
+        unique = {}
+        for sent in sentences:
+            row = unique.get(sent)
+            if row is None:
+                row = unique[sent] = len(row_doc)
+                row_doc.append(doc)
+                eligible.append(len(sent.split()) <= MAX_SENTENCE_WORDS)
+            for word in word_tokenize(sent.lower()):
+                if word.isalpha() and word not in stop:
+                    rows.append(row)
+                    cols.append(vocabulary.setdefault(word, len(vocabulary)))
+        doc_sentences.append(sentences)
+        doc_unique.append(list(unique))
+
+    if not vocabulary:
+        # Nothing but stop words and punctuation anywhere in the batch
+        return [NO_CONTENT_SUMMARY] * len(texts)
+
+    n_rows = len(row_doc)
+    row_doc = np.asarray(row_doc, dtype=np.int64)
+    rows = np.asarray(rows, dtype=np.int64)
+    cols = np.asarray(cols, dtype=np.int64)
+    counts = sparse.csr_matrix((np.ones(len(rows), dtype=np.int64), (rows, cols)),
+                               shape=(n_rows, len(vocabulary)))
+
+    # Document x term frequencies: sum the sentence rows belonging to each document
+    membership = sparse.csr_matrix((np.ones(n_rows, dtype=np.int64), (row_doc, np.arange(n_rows))),
+                                   shape=(len(texts), n_rows))
+    doc_freq = membership @ counts
+    max_freq = doc_freq.max(axis=1).toarray().ravel()
+
+    # Each token contributes its normalized document frequency. bincount adds the
+    # tokens in transcript order, so the float scores (and their ties) come out
+    # bit-for-bit the same as the per-sentence loop in structured_summary.
+    token_docs = row_doc[rows]
+    weights = np.asarray(doc_freq[token_docs, cols]).ravel() / max_freq[token_docs]
+    scores = np.bincount(rows, weights=weights, minlength=n_rows)
+    scores[~np.asarray(eligible, dtype=bool)] = 0
+    has_words = np.diff(doc_freq.indptr) > 0
+
+    summaries = []
+    offset = 0
+    for doc, sentences in enumerate(doc_sentences):
+        unique = doc_unique[doc]
+        doc_scores = scores[offset:offset + len(unique)]
+        offset += len(unique)
+        if not has_words[doc]:
+            summaries.append(NO_CONTENT_SUMMARY)
+            continue
+        # Stable sort keeps earlier sentences first among equal scores
+        order = np.argsort(-doc_scores, kind='stable')[:max_sentences]
+        summaries.append(format_summary(
+            [unique[i] for i in order if doc_scores[i] > 0],
+            *split_items(sentences),
+        ))
+    return summaries
+
+
+def summarize_files(paths, summary_folder, max_sentences=12, clean=None):
+    """Summarize transcript files in one batch and write <name>_structured_summary.txt files."""
+    texts = []
+    for path in paths:
+        with open(path, encoding="utf8") as f:
+            texts.append(f.read())
+
+    written = []
+    for path, summary in zip(paths, summarize_batch(texts, max_sentences, clean=clean)):
+        meeting_name = os.path.basename(path)
+        for suffix in ("_transcript.txt", ".txt"):
+            if meeting_name.endswith(suffix):
+                meeting_name = meeting_name[:-len(suffix)]
+                break
+        summary_file = os.path.join(summary_folder, meeting_name + "_structured_summary.txt")
+        with open(summary_file, "w", encoding="utf8") as f:
+            f.write(summary)
+        written.append(summary_file)
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize a directory of transcripts in one batch.")
+    parser.add_argument("directory", help="directory containing .txt transcripts")
+    parser.add_argument("--output", default="meeting_summaries", help="folder for the summaries")
+    parser.add_argument("--max-sentences", type=int, default=12, help="key points per summary")
+    args = parser.parse_args()
+
+    from transcript_cleaning import get_cleaner
+
+    paths = sorted(os.path.join(args.directory, name) for name in os.listdir(args.directory)
+                   if name.endswith(".txt"))
+    os.makedirs(args.output, exist_ok=True)
+    written = summarize_files(paths, args.output, args.max_sentences, clean=get_cleaner().clean)
+    print(f"✅ Wrote {len(written)} summaries to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Batch transcription of recorded WAV files.
+Recordings are memory-mapped, split into chunks at silence boundaries and
+transcribed in parallel by a process pool with one Vosk model per worker.
+
+Usage: python batch_transcribe.py recordings/ --workers 4
+"""
+
+import argparse
+import json
+import mmap
+import os
+import struct
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+DEFAULT_MODEL_PATH = "vosk-model-small-en-us-0.15"
+
+# Chunking: cut at the first silent window between MIN and MAX seconds
+MIN_CHUNK_SECONDS = 30
+MAX_CHUNK_SECONDS = 120
+ENERGY_WINDOW_SECONDS = 0.1
+SILENCE_RMS = 300  # int16 RMS below which a window counts as silence
+
+RECOGNIZER_BLOCK_FRAMES = 8000
+
+# ---------------- WAV Access ----------------
+def wav_layout(mm):
+    """Parse the RIFF header of a mapped WAV file.
+
+    Returns (sample_rate, channels, data_offset, frame_count). Only 16-bit
+    PCM is supported because that is what Vosk expects.
+    """
+    if mm[0:4] != b"RIFF" or mm[8:12] != b"WAVE":
+        raise ValueError("Not a RIFF/WAVE file")
+
+    offset = 12
+    fmt = None
+    while offset + 8 <= len(mm):
+        chunk_id = mm[offset:offset + 4]
+        chunk_size = struct.unpack("<I", mm[offset + 4:offset + 8])[0]
+        body = offset + 8
+        if chunk_id == b"fmt ":
+            audio_format, channels, sample_rate = struct.unpack("<HHI", mm[body:body + 8])
+            bits = struct.unpack("<H", mm[body + 14:body + 16])[0]
+            fmt = (audio_format, channels, sample_rate, bits)
+        elif chunk_id == b"data":
+            if fmt is None:
+                raise ValueError("WAV data chunk before fmt chunk")
+            audio_format, channels, sample_rate, bits = fmt
+            if audio_format != 1 or bits != 16:
+                raise ValueError("Only 16-bit PCM WAV files are supported")
+            # Recorders that are killed mid-write leave a bogus data size
+            data_size = min(chunk_size, len(mm) - body)
+            return sample_rate, channels, body, data_size // (2 * channels)
+        # Chunks are padded to an even number of bytes
+        offset = body + chunk_size + (chunk_size & 1)
+    raise ValueError("WAV file has no data chunk")
+
+
+class MappedWav:
+    """Read-only memory-mapped WAV file exposing channel 0 as an int16 array view."""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.sample_rate, self.channels, offset, self.frame_count = wav_layout(self._mm)
+        frames = np.frombuffer(self._mm, dtype="<i2", count=self.frame_count * self.channels,
+                               offset=offset).reshape(-1, self.channels)
+        # Strided view: pages are only read from disk when a slice is touched
+        self.samples = frames[:, 0]
+
+    @property
+    def duration(self):
+        return self.frame_count / self.sample_rate
+
+    def close(self):
+        self.samples = None
+        self._mm.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# ---------------- Silence Chunking ----------------
+def window_energies(samples, window_frames, block_windows=4096):
+    """RMS energy per window, computed block by block to keep memory bounded."""
+    n_windows = len(samples) // window_frames
+    energies = np.empty(n_windows, dtype=np.float32)
+    for start in range(0, n_windows, block_windows):
+        stop = min(start + block_windows, n_windows)
+        block = samples[start * window_frames:stop * window_frames].astype(np.float32)
+        energies[start:stop] = np.sqrt((block.reshape(-1, window_frames) ** 2).mean(axis=1))
+    return energies
+
+
+def split_at_silence(samples, sample_rate, min_seconds=MIN_CHUNK_SECONDS,
+                     max_seconds=MAX_CHUNK_SECONDS, silence_rms=SILENCE_RMS):
+    """Return (start_frame, end_frame) chunks cut at silent windows.
+
+    Each chunk is at least min_seconds long (except the last) and at most
+    max_seconds; if no window in that range is silent the quietest one is used.
+    """
+    window_frames = max(1, int(sample_rate * ENERGY_WINDOW_SECONDS))
+    energies = window_energies(samples, window_frames)
+    min_windows = max(1, int(min_seconds / ENERGY_WINDOW_SECONDS))
+    max_windows = max(min_windows, int(max_seconds / ENERGY_WINDOW_SECONDS))
+
+    chunks = []
+    start = 0
+    n = len(energies)
+    while n - start > max_windows:
+        region = energies[start + min_windows:start + max_windows]
+        quiet = np.flatnonzero(region < silence_rms)
+        cut = start + min_windows + (int(quiet[0]) if quiet.size else int(np.argmin(region)))
+        chunks.append((start * window_frames, cut * window_frames))
+        start = cut
+    chunks.append((start * window_frames, len(samples)))
+    return chunks
+
+
+# ---------------- Worker Process ----------------
+_worker_model = None
+
+
+def _init_worker(model_path):
+    """Load the Vosk model once per worker process."""
+    global _worker_model
+    import vosk
+    vosk.SetLogLevel(-1)
+    _worker_model = vosk.Model(model_path)
+
+
+def _transcribe_chunk(path, start_frame, end_frame):
+    """Transcribe frames [start_frame, end_frame) of a WAV file in a worker."""
+    import vosk
+
+    with MappedWav(path) as wav:
+        rec = vosk.KaldiRecognizer(_worker_model, wav.sample_rate)
+        pieces = []
+        for block_start in range(start_frame, end_frame, RECOGNIZER_BLOCK_FRAMES):
+            block_end = min(block_start + RECOGNIZER_BLOCK_FRAMES, end_frame)
+            if rec.AcceptWaveform(wav.samples[block_start:block_end].tobytes()):
+                pieces.append(json.loads(rec.Result())['text'])
+        pieces.append(json.loads(rec.FinalResult())['text'])
+    return " ".join(p.strip() for p in pieces if p.strip())
+
+
+# ---------------- Batch Driver ----------------
+def find_recordings(directory):
+    """List .wav files in directory, sorted by name."""
+    return sorted(os.path.join(directory, name) for name in os.listdir(directory)
+                  if name.lower().endswith(".wav"))
+
+
+def transcribe_directory(directory, save, model_path=DEFAULT_MODEL_PATH, workers=None,
+                         min_seconds=MIN_CHUNK_SECONDS, max_seconds=MAX_CHUNK_SECONDS):
+    """Transcribe every WAV file in directory and save each through save(text, name).
+
+    save has the signature of save_final_transcript_and_summary, so outputs
+    land in TRANSCRIPT_FOLDER/SUMMARY_FOLDER the same way live meetings do.
+    Returns a per-file report.
+    """
+    started = time.perf_counter()
+    recordings = find_recordings(directory)
+    chunk_plan = {}
+    report = []
+    for path in recordings:
+        try:
+            with MappedWav(path) as wav:
+                chunk_plan[path] = split_at_silence(wav.samples, wav.sample_rate,
+                                                    min_seconds, max_seconds)
+        except (OSError, ValueError) as e:
+            report.append({'file': path, 'status': 'failed', 'error': str(e)})
+
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(model_path,)) as pool:
+        futures = {path: [pool.submit(_transcribe_chunk, path, start, end) for start, end in chunks]
+                   for path, chunks in chunk_plan.items()}
+
+        for path, chunk_futures in futures.items():
+            meeting_name = os.path.splitext(os.path.basename(path))[0]
+            try:
+                text = " ".join(t for t in (f.result() for f in chunk_futures) if t)
+            except Exception as e:
+                report.append({'file': path, 'status': 'failed', 'error': str(e)})
+                continue
+            if text:
+                save(text, meeting_name)
+            report.append({
+                'file': path,
+                'meeting_name': meeting_name,
+                'status': 'completed' if text else 'empty',
+                'chunks': len(chunk_futures),
+                'words': len(text.split()),
+            })
+
+    print(f"✅ Transcribed {len(recordings)} recordings in {time.perf_counter() - started:.1f}s")
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Transcribe a directory of WAV recordings.")
+    parser.add_argument("directory", help="directory containing .wav recordings")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes (default: one per CPU core)")
+    parser.add_argument("--model", default=DEFAULT_MODEL_PATH, help="path to the Vosk model")
+    parser.add_argument("--min-chunk", type=float, default=MIN_CHUNK_SECONDS,
+                        help="minimum chunk length in seconds")
+    parser.add_argument("--max-chunk", type=float, default=MAX_CHUNK_SECONDS,
+                        help="maximum chunk length in seconds")
+    args = parser.parse_args()
+
+    from app import save_final_transcript_and_summary
+
+    report = transcribe_directory(args.directory, save_final_transcript_and_summary,
+                                  model_path=args.model, workers=args.workers,
+                                  min_seconds=args.min_chunk, max_seconds=args.max_chunk)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Benchmark the single-pass transcript cleaner against the original
+per-filler-word clean_transcript on synthetic transcripts of 1k-200k words.
+
+Usage: python benchmarks/bench_clean_transcript.py
+"""
+
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from transcript_cleaning import FILLER_WORDS, TranscriptCleaner
+
+SIZES = [1_000, 10_000, 50_000, 100_000, 200_000]
+VOCABULARY = ("we need to finish the mobile release before the client demo and "
+              "review the api rate limits with the backend team next week").split()
+
+
+def legacy_clean_transcript(text):
+    """The original implementation: one re.sub per filler word."""
+    text = re.sub(r'\s+', ' ', text).strip()
+    for word in FILLER_WORDS:
+        text = re.sub(r'\b' + re.escape(word) + r'\b', '', text, flags=re.IGNORECASE)
+    return text
+
+
+def synthetic_transcript(words, seed=0):
+    rng = random.Random(seed)
+    pool = VOCABULARY * 4 + FILLER_WORDS + [w.capitalize() for w in FILLER_WORDS]
+    return " ".join(rng.choice(pool) for _ in range(words))
+
+
+def best_of(fn, text, repeats=3):
+    best = float('inf')
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn(text)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    cleaner = TranscriptCleaner(FILLER_WORDS, cache_size=0)
+    print(f"{'words':>8}  {'legacy ms':>10}  {'single-pass ms':>14}  {'speedup':>7}")
+    for size in SIZES:
+        text = synthetic_transcript(size)
+        assert cleaner.clean_chunk(text) == legacy_clean_transcript(text), "outputs differ"
+        legacy = best_of(legacy_clean_transcript, text)
+        single = best_of(cleaner.clean_chunk, text)
+        print(f"{size:>8}  {legacy * 1000:>10.2f}  {single * 1000:>14.2f}  {legacy / single:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Hold many idle client connections open against a running server and measure
+how a request on top of them is served.
+
+  sse       transcript streams on the simple API
+            (GET /api/meetings/<id>/transcript/stream)
+  socketio  Socket.IO clients on the transcript server (Engine.IO long-polling
+            handshake + connect, then a parked poll request)
+
+Prints a JSON report: connections established, failures, and /api/health
+latency percentiles while they are held, with the machine and settings of
+the run.
+
+Usage:
+  python start_simple_api.py --production --workers 1 &
+  python benchmarks/load_connections.py --mode sse --connections 2000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import time
+from urllib.parse import urlsplit
+
+
+async def http_request(host, port, method, path, body=b"", read_body=True):
+    """Send one HTTP/1.1 request; returns (status, body, reader, writer)."""
+    reader, writer = await asyncio.open_connection(host, port)
+    head = (f"{method} {path} HTTP/1.1\r\nHost: {host}:{port}\r\n"
+            f"Content-Length: {len(body)}\r\nContent-Type: text/plain;charset=UTF-8\r\n\r\n")
+    writer.write(head.encode("ascii") + body)
+    await writer.drain()
+    status_line = await reader.readline()
+    status = int(status_line.split()[1])
+    length, chunked = None, False
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+        elif name.lower() == "transfer-encoding" and "chunked" in value:
+            chunked = True
+    data = b""
+    if read_body and length is not None:
+        data = await reader.readexactly(length)
+    elif read_body and not chunked:
+        data = await reader.read()
+    return status, data, reader, writer
+
+
+async def open_sse(host, port, meeting_id):
+    status, _, reader, writer = await http_request(
+        host, port, "GET", f"/api/meetings/{meeting_id}/transcript/stream", read_body=False)
+    if status != 200:
+        raise ConnectionError(f"HTTP {status}")
+    # Wait for the first event (the reset with the full transcript)
+    await reader.readuntil(b"\n\n")
+    return writer
+
+
+async def open_socketio(host, port):
+    _, data, _, writer = await http_request(host, port, "GET", "/socket.io/?EIO=4&transport=polling")
+    writer.close()
+    handshake = json.loads(data[data.index(b"{"):])
+    sid = handshake["sid"]
+    path = f"/socket.io/?EIO=4&transport=polling&sid={sid}"
+    status, _, _, writer = await http_request(host, port, "POST", path, b"40")
+    writer.close()
+    if status != 200:
+        raise ConnectionError(f"HTTP {status}")
+    _, _, _, writer = await http_request(host, port, "GET", path)  # connect ack
+    writer.close()
+    # This poll request stays parked on the server until it has something to send
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: {host}:{port}\r\n\r\n".encode("ascii"))
+    await writer.drain()
+    return writer
+
+
+async def probe_health(host, port, samples):
+    latencies = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        status, _, _, writer = await http_request(host, port, "GET", "/api/health")
+        latencies.append((time.perf_counter() - started) * 1000)
+        writer.close()
+        if status != 200:
+            raise ConnectionError(f"health check returned HTTP {status}")
+    return latencies
+
+
+async def run(args):
+    url = urlsplit(args.url)
+    host, port = url.hostname, url.port or 80
+    baseline = await probe_health(host, port, args.samples)
+
+    semaphore = asyncio.Semaphore(args.concurrency)
+    errors = {}
+
+    async def connect():
+        async with semaphore:
+            try:
+                if args.mode == "sse":
+                    return await asyncio.wait_for(open_sse(host, port, args.meeting_id), args.timeout)
+                return await asyncio.wait_for(open_socketio(host, port), args.timeout)
+            except (OSError, ValueError, asyncio.TimeoutError, asyncio.IncompleteReadError) as e:
+                errors[type(e).__name__] = errors.get(type(e).__name__, 0) + 1
+                return None
+
+    started = time.perf_counter()
+    writers = [w for w in await asyncio.gather(*(connect() for _ in range(args.connections))) if w]
+    connect_seconds = time.perf_counter() - started
+    await asyncio.sleep(args.hold)
+    loaded = await probe_health(host, port, args.samples)
+    for writer in writers:
+        writer.close()
+
+    def summary(latencies):
+        ordered = sorted(latencies)
+        return {"p50_ms": round(statistics.median(ordered), 2),
+                "p99_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))], 2)}
+
+    return {
+        "mode": args.mode,
+        "url": args.url,
+        "client_cpu_count": os.cpu_count(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "concurrency": args.concurrency,
+        "hold_seconds": args.hold,
+        "samples": args.samples,
+        "connections_requested": args.connections,
+        "connections_held": len(writers),
+        "errors": errors,
+        "connect_seconds": round(connect_seconds, 2),
+        "health_idle": summary(baseline),
+        "health_under_load": summary(loaded),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Idle-connection load test.")
+    parser.add_argument("--mode", choices=["sse", "socketio"], default="sse")
+    parser.add_argument("--url", default="http://127.0.0.1:5000")
+    parser.add_argument("--connections", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=200, help="connections opened at once")
+    parser.add_argument("--meeting-id", default="meeting_1", help="meeting to stream (sse mode)")
+    parser.add_argument("--hold", type=float, default=2.0, help="seconds to hold before probing")
+    parser.add_argument("--samples", type=int, default=50, help="health checks per probe")
+    parser.add_argument("--timeout", type=float, default=10.0)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
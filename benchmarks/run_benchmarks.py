@@ -0,0 +1,388 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the text and API hot paths, runnable offline.
+
+  text  clean_transcript, structured_summary and
+        save_final_transcript_and_summary on synthetic transcripts
+  live  a whole streamed meeting through start_live_transcription, with Vosk
+        replaced by a stub recognizer that finalizes a scripted sentence
+        every few frames, and the voice-activity gate over the same meeting's
+        audio
+  api   simple_app routes through the Flask test client against a temporary
+        database
+
+Each benchmark runs at growing sizes. The report shows the growth exponent
+between the smallest and largest size (1.0 = linear, 2.0 = quadratic), so a
+quadratic spot stands out before a long meeting hits it. Results are written
+as JSON; pass --compare with an earlier file to flag regressions.
+
+The summarizer needs the NLTK punkt and stopwords data; point NLTK_DATA_DIR at
+a folder that has them to run without network access.
+
+Usage:
+  python benchmarks/run_benchmarks.py [--quick] [--only text,live,api]
+                                      [--output FILE] [--compare OLD.json]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import math
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO)
+
+GROUPS = ("text", "live", "api")
+SIZES = {
+    # words per transcript
+    "text": [1_000, 10_000, 50_000, 100_000],
+    "live": [500, 2_000, 8_000],
+    # meetings in the database / segments in a transcript
+    "api": [100, 500, 2_000],
+}
+QUICK_SIZES = {"text": [1_000, 5_000], "live": [500, 2_000], "api": [50, 200]}
+SUPERLINEAR_EXPONENT = 1.3
+SENTENCES = [
+    "we need to finish the mobile release before the client demo",
+    "um I think the api rate limits are too strict for enterprise accounts",
+    "Jane will send the staging credentials after this meeting",
+    "we decided to move the design review to next week",
+    "uh the database migration is about forty percent faster now",
+    "action item Bob to prepare the performance metrics",
+    "you know the onboarding flow improved conversion a lot",
+    "let's agree on the budget for the second quarter",
+]
+FRAME_BYTES = 8000  # 0.25 s of 16 kHz int16 audio
+FRAMES_PER_SENTENCE = 4
+
+
+def synthetic_transcript(words, seed=0):
+    rng = random.Random(seed)
+    sentences, count = [], 0
+    while count < words:
+        sentence = rng.choice(SENTENCES)
+        sentences.append(sentence[0].upper() + sentence[1:] + ".")
+        count += len(sentence.split())
+    return " ".join(sentences)
+
+
+def measure(fn, repeats):
+    """Run fn repeats times; returns best and median wall time in milliseconds."""
+    times = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - started) * 1000)
+    return {"best_ms": round(min(times), 3), "median_ms": round(statistics.median(times), 3),
+            "repeats": repeats}
+
+
+def result(group, name, size, unit, timing):
+    return dict({"group": group, "name": name, "size": size, "unit": unit}, **timing)
+
+
+# ---------------- text ----------------
+
+def text_benchmarks(sizes, repeats, workdir):
+    import app
+
+    app.TRANSCRIPT_FOLDER = os.path.join(workdir, "transcripts")
+    app.SUMMARY_FOLDER = os.path.join(workdir, "summaries")
+    os.makedirs(app.TRANSCRIPT_FOLDER, exist_ok=True)
+    os.makedirs(app.SUMMARY_FOLDER, exist_ok=True)
+    app.structured_summary("Warm up the tokenizers. They load lazily.")
+    # Every repeat summarizes the same text; measure the summarizer, not the summary cache
+    app.summary_cache = app.SummaryCache(None, app.summarize_cleaned, max_entries=0)
+
+    results = []
+    for size in sizes:
+        text = synthetic_transcript(size)
+        # clean_transcript caches whole transcripts; measure the uncached path
+        results.append(result("text", "clean_transcript", size, "words",
+                              measure(lambda: app.transcript_cleaner.clean_chunk(text), repeats)))
+        results.append(result("text", "structured_summary", size, "words",
+                              measure(lambda: app.structured_summary(text), repeats)))
+        with contextlib.redirect_stdout(io.StringIO()):
+            timing = measure(lambda: app.save_final_transcript_and_summary(text, "bench"), repeats)
+        results.append(result("text", "save_final_transcript_and_summary", size, "words", timing))
+    return results
+
+
+# ---------------- live ----------------
+
+class StubRecognizer:
+    """Stands in for vosk.KaldiRecognizer: finalizes one scripted sentence every few frames."""
+
+    def __init__(self, sentences, on_exhausted):
+        self.sentences = sentences
+        self.on_exhausted = on_exhausted
+        self.frames = 0
+        self.index = 0
+
+    def AcceptWaveform(self, data):
+        self.frames += 1
+        return self.frames % FRAMES_PER_SENTENCE == 0
+
+    def Result(self):
+        text = self.sentences[self.index] if self.index < len(self.sentences) else ""
+        self.index += 1
+        if self.index >= len(self.sentences):
+            self.on_exhausted()
+        return json.dumps({"text": text})
+
+    def PartialResult(self):
+        words = self.sentences[min(self.index, len(self.sentences) - 1)].split()
+        return json.dumps({"partial": " ".join(words[:self.frames % FRAMES_PER_SENTENCE * 3])})
+
+    def Reset(self):
+        pass
+
+
+class StubRegistry:
+    def __init__(self):
+        self.next_recognizer = None
+
+    @contextlib.contextmanager
+    def recognizer(self, model_path, sample_rate):
+        yield self.next_recognizer
+
+
+def meeting_audio(n_frames, speech_frames=4, silent_frames=8, seed=0):
+    """Frames of a quiet meeting: a second of noisy tone, then two seconds of low noise, repeated."""
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    t = np.arange(FRAME_BYTES // 2)
+    tone = 3000 * np.sin(2 * np.pi * 220 * t / 16000)
+    return [(rng.normal(0, 30, t.size) + (tone if i % (speech_frames + silent_frames) < speech_frames else 0)).astype("<i2").tobytes()
+            for i in range(n_frames)]
+
+
+def live_benchmarks(sizes, repeats, workdir):
+    import app
+    from transcription_sessions import TranscriptionSession
+    from vad import VoiceActivityGate
+
+    app.TRANSCRIPT_FOLDER = os.path.join(workdir, "transcripts")
+    app.SUMMARY_FOLDER = os.path.join(workdir, "summaries")
+    os.makedirs(app.TRANSCRIPT_FOLDER, exist_ok=True)
+    os.makedirs(app.SUMMARY_FOLDER, exist_ok=True)
+    registry = StubRegistry()
+    app.model_registry = registry
+    # The stub counts frames to finalize sentences; gating its silent frames would change the work
+    app.VAD_ENABLED = False
+    # Finalize inline so each run includes writing the transcript and summary
+    app.finalize_jobs = app.JobQueue(workers=0)
+
+    def run_meeting(sentences):
+        n_frames = len(sentences) * FRAMES_PER_SENTENCE
+        # The whole meeting is queued up front, so the buffer must hold all of it
+        session = TranscriptionSession("bench_live", source="stream",
+                                       buffer_seconds=n_frames * FRAME_BYTES / 2 / app.SAMPLE_RATE + 1)
+        registry.next_recognizer = StubRecognizer(sentences, session.stop)
+        frame = bytes(FRAME_BYTES)
+        for _ in range(n_frames):
+            session.feed_audio(frame)
+        with contextlib.redirect_stdout(io.StringIO()):
+            app.start_live_transcription(session)
+
+    results = []
+    for size in sizes:
+        text = synthetic_transcript(size)
+        sentences = [s.strip() + "." for s in text.split(".") if s.strip()]
+        results.append(result("live", "streamed_meeting", size, "words",
+                              measure(lambda: run_meeting(sentences), repeats)))
+        frames = meeting_audio(len(sentences) * FRAMES_PER_SENTENCE)
+
+        def gate_meeting():
+            gate = VoiceActivityGate()
+            for frame in frames:
+                gate.process(frame)
+
+        results.append(result("live", "vad_gate", size, "words", measure(gate_meeting, repeats)))
+    return results
+
+
+# ---------------- api ----------------
+
+def api_benchmarks(sizes, repeats, workdir):
+    os.environ["MEETINGS_DB"] = os.path.join(workdir, "meetings.db")
+    os.environ["SEARCH_INDEX"] = os.path.join(workdir, "search_index.json.gz")
+    os.environ["TRANSCRIPT_FOLDER"] = os.path.join(workdir, "api_transcripts")
+    os.environ["SUMMARY_FOLDER"] = os.path.join(workdir, "api_summaries")
+    import simple_app
+
+    client = simple_app.app.test_client()
+    rng = random.Random(1)
+    created = 3  # sample meetings
+    results = []
+    for size in sizes:
+        while created < size:
+            client.post("/api/meetings", json={
+                "title": f"Meeting {created}",
+                "date": f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+                "participants": [f"user{rng.randint(1, 50)}@example.com"],
+                "aiNotes": synthetic_transcript(1_000, seed=created),
+            })
+            created += 1
+
+        def list_full():
+            assert client.get(f"/api/meetings?limit={size}").status_code == 200
+
+        def list_projected():
+            assert client.get(f"/api/meetings?limit={size}&fields=title,date,time,status").status_code == 200
+
+        def search():
+            assert client.get("/api/search?q=staging credentials").status_code == 200
+
+        results.append(result("api", "GET /api/meetings", size, "meetings", measure(list_full, repeats)))
+        results.append(result("api", "GET /api/meetings?fields=", size, "meetings",
+                              measure(list_projected, repeats)))
+        results.append(result("api", "GET /api/search", size, "meetings", measure(search, repeats)))
+
+    # Appends and reads against a transcript that already has `size` segments
+    segments = 0
+    for size in sizes:
+        while segments < size:
+            client.post("/api/meetings/meeting_1/transcript/update", json={"text": SENTENCES[segments % 8]})
+            segments += 1
+
+        def append():
+            nonlocal segments
+            client.post("/api/meetings/meeting_1/transcript/update", json={"text": "one more line"})
+            segments += 1
+
+        def read_since():
+            assert client.get(f"/api/meetings/meeting_1/transcript?since={segments - 1}").status_code == 200
+
+        def read_meeting():
+            assert client.get("/api/meetings/meeting_1").status_code == 200
+
+        results.append(result("api", "POST /transcript/update", size, "segments", measure(append, repeats)))
+        results.append(result("api", "GET /transcript?since=", size, "segments", measure(read_since, repeats)))
+        results.append(result("api", "GET /api/meetings/<id>", size, "segments", measure(read_meeting, repeats)))
+    # The temporary folder is gone by exit time; don't let the app save its index there
+    simple_app.search_index.path = None
+    return results
+
+
+# ---------------- report ----------------
+
+def growth(results):
+    """Growth exponent of each benchmark between its smallest and largest size."""
+    by_name = {}
+    for r in results:
+        by_name.setdefault((r["group"], r["name"]), []).append(r)
+    exponents = {}
+    for key, runs in by_name.items():
+        runs.sort(key=lambda r: r["size"])
+        first, last = runs[0], runs[-1]
+        if last["size"] > first["size"] and first["median_ms"] > 0:
+            exponents[key] = (math.log(max(last["median_ms"], 1e-6) / first["median_ms"]) /
+                              math.log(last["size"] / first["size"]))
+    return exponents
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline_path, threshold):
+    with open(baseline_path, encoding="utf8") as f:
+        baseline = {(r["group"], r["name"], r["size"]): r for r in json.load(f)["results"]}
+    regressions = []
+    for r in results:
+        old = baseline.get((r["group"], r["name"], r["size"]))
+        if old and old["median_ms"] > 0:
+            ratio = r["median_ms"] / old["median_ms"]
+            if ratio > threshold:
+                regressions.append((r, old, ratio))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the text and API benchmarks.")
+    parser.add_argument("--only", default=",".join(GROUPS), help="comma-separated groups to run")
+    parser.add_argument("--quick", action="store_true", help="small sizes, for a smoke run")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--output", help="JSON results file (default: benchmarks/results/<time>.json)")
+    parser.add_argument("--compare", help="earlier results file to compare against")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="median slowdown ratio reported as a regression (default: 1.25)")
+    args = parser.parse_args()
+
+    groups = [g.strip() for g in args.only.split(",") if g.strip()]
+    unknown = set(groups) - set(GROUPS)
+    if unknown:
+        parser.error(f"unknown groups: {', '.join(sorted(unknown))}")
+    sizes = QUICK_SIZES if args.quick else SIZES
+    runners = {"text": text_benchmarks, "live": live_benchmarks, "api": api_benchmarks}
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix="aibuddy-bench-") as workdir:
+        # The apps create their data folders relative to the working directory
+        cwd = os.getcwd()
+        os.chdir(workdir)
+        try:
+            for group in groups:
+                print(f"Running {group} benchmarks...", file=sys.stderr)
+                results.extend(runners[group](sizes[group], args.repeats, workdir))
+        finally:
+            os.chdir(cwd)
+
+    exponents = growth(results)
+    print(f"{'benchmark':<40} {'size':>8} {'median ms':>10} {'best ms':>10}  growth")
+    for r in results:
+        exponent = exponents.get((r["group"], r["name"]))
+        is_last = r["size"] == max(x["size"] for x in results if x["name"] == r["name"])
+        note = ""
+        if is_last and exponent is not None:
+            note = f"n^{exponent:.2f}" + ("  <- superlinear" if exponent > SUPERLINEAR_EXPONENT else "")
+        print(f"{r['group'] + ': ' + r['name']:<40} {r['size']:>8} {r['median_ms']:>10.2f} "
+              f"{r['best_ms']:>10.2f}  {note}")
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "quick": args.quick,
+            "repeats": args.repeats,
+        },
+        "results": results,
+        "growth": {f"{group}: {name}": round(e, 3) for (group, name), e in exponents.items()},
+    }
+    output = args.output or os.path.join(REPO, "benchmarks", "results",
+                                         time.strftime("%Y%m%d-%H%M%S") + ".json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.threshold)
+        for r, old, ratio in regressions:
+            print(f"REGRESSION {r['group']}: {r['name']} @ {r['size']}: "
+                  f"{old['median_ms']:.2f} -> {r['median_ms']:.2f} ms ({ratio:.2f}x)")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions against {args.compare}")
+
+
+if __name__ == "__main__":
+    main()
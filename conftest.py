@@ -0,0 +1,32 @@
+# Lets the tests under tests/ import the top-level modules of this repo
+
+import os
+import pickle
+import shutil
+
+import pytest
+
+TEST_NLTK_DATA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tests", "nltk_data")
+
+
+@pytest.fixture(scope="session", autouse=True)
+def nltk_data(tmp_path_factory):
+    """Pinned NLTK data for the summarizers, so the tests run offline and never download.
+
+    The stop words are a copy of NLTK's English list; the Punkt tokenizer is
+    an untrained one, which splits sentences at every full stop.
+    """
+    from nltk.tokenize.punkt import PunktSentenceTokenizer
+
+    import summarization
+
+    folder = tmp_path_factory.mktemp("nltk_data")
+    shutil.copytree(os.path.join(TEST_NLTK_DATA, "corpora"), folder / "corpora")
+    punkt = folder / "tokenizers" / "punkt" / "PY3"
+    punkt.mkdir(parents=True)
+    with open(punkt / "english.pickle", "wb") as f:
+        pickle.dump(PunktSentenceTokenizer(), f)
+    # The environment reaches the finalize worker processes; the module is already imported here
+    os.environ["NLTK_DATA_DIR"] = str(folder)
+    summarization.NLTK_DATA_DIR = str(folder)
+    return folder
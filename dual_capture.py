@@ -0,0 +1,136 @@
+"""
+Dual-source live capture: one multi-channel input stream carrying the local
+microphone on one channel and the meeting audio (loopback) on another.
+Captured blocks are split into per-channel strided views of the interleaved
+buffer, without copying. Each channel runs its own recognizer on its own
+thread and makes the one contiguous copy the recognizer needs there. The
+finalized utterances are merged back into a single transcript ordered by
+when each utterance started.
+"""
+
+import heapq
+import itertools
+import json
+import queue
+import threading
+import time
+
+import numpy as np
+
+# Blocks a channel may have waiting; a full inbox pushes back on the session's audio buffer
+CHANNEL_INBOX_BLOCKS = 4
+
+
+def split_channels(block, channels):
+    """Strided views of each channel of an interleaved int16 block (no copies)."""
+    frames = np.frombuffer(block, dtype="<i2").reshape(-1, channels)
+    return [frames[:, channel] for channel in range(channels)]
+
+
+class ChannelRecognizer:
+    """Recognizes one channel on a worker thread; results go to a shared queue.
+
+    Results are ('final', lane, started_at, text) and ('partial', lane,
+    captured_at, text), where times are the capture times of the blocks.
+    """
+
+    def __init__(self, label, channel, rec, results, sample_rate=16000, vad=None):
+        self.label = label
+        self.channel = channel
+        self.rec = rec
+        self.results = results
+        self.sample_rate = sample_rate
+        self.vad = vad
+        self.inbox = queue.Queue(maxsize=CHANNEL_INBOX_BLOCKS)
+        self.recognizer_seconds = 0.0
+        self.audio_seconds = 0.0
+        self._lock = threading.Lock()
+        self._utterance_start = None
+        self._progress = 0.0
+        self.thread = threading.Thread(target=self._run, name=f"channel-{label}", daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def earliest_pending(self):
+        """Capture time before which this channel will produce no more finals."""
+        with self._lock:
+            return self._utterance_start if self._utterance_start is not None else self._progress
+
+    def close(self):
+        """Finish the channel: pending words are finalized and the thread exits."""
+        self.inbox.put(None)
+        self.thread.join()
+
+    def _run(self):
+        while True:
+            item = self.inbox.get()
+            if item is None:
+                break
+            captured_at, view = item
+            # The one copy per channel: contiguous samples for the recognizer
+            pcm = view.tobytes()
+            self.audio_seconds += len(pcm) / 2 / self.sample_rate
+            if self.vad is not None:
+                pcm = self.vad.process(pcm)
+            if pcm:
+                started = time.perf_counter()
+                final = self.rec.AcceptWaveform(pcm)
+                self.recognizer_seconds += time.perf_counter() - started
+                if final:
+                    self._finish_utterance(self.rec.Result(), captured_at)
+                else:
+                    partial = json.loads(self.rec.PartialResult())['partial'].strip()
+                    if partial:
+                        # An utterance starts with its first words, not with the silence before them
+                        with self._lock:
+                            if self._utterance_start is None:
+                                self._utterance_start = captured_at
+                        self.results.put(('partial', self, captured_at, partial))
+            if self.vad is not None and self.vad.closed:
+                # The gate dropped the silence the recognizer would endpoint on
+                self._finish_utterance(self.rec.FinalResult(), captured_at)
+            with self._lock:
+                self._progress = captured_at
+        self._finish_utterance(self.rec.FinalResult(), self._progress)
+        with self._lock:
+            # Closed: this channel no longer holds back the other channels' finals
+            self._progress = float('inf')
+
+    def _finish_utterance(self, result, captured_at):
+        text = json.loads(result)['text'].strip()
+        with self._lock:
+            if text:
+                # Words finalized without a partial first started in this block
+                started_at = (self._utterance_start if self._utterance_start is not None
+                              else captured_at)
+                self.results.put(('final', self, started_at, text))
+            self._utterance_start = None
+            self._progress = captured_at
+
+
+class TimeOrderedMerger:
+    """Releases finals from several channels in start-time order.
+
+    A final is held until every channel has moved past its start time, so an
+    utterance that finishes late on one channel still lands in its place.
+    """
+
+    def __init__(self, lanes):
+        self.lanes = lanes
+        self._pending = []
+        self._order = itertools.count()
+
+    def add(self, started_at, lane, text):
+        heapq.heappush(self._pending, (started_at, next(self._order), lane, text))
+
+    def release(self, watermark):
+        """Finals that started at or before watermark, oldest first."""
+        ready = []
+        while self._pending and self._pending[0][0] <= watermark:
+            started_at, _, lane, text = heapq.heappop(self._pending)
+            ready.append((started_at, lane, text))
+        return ready
+
+    def watermark(self):
+        return min(lane.earliest_pending() for lane in self.lanes)
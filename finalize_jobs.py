@@ -0,0 +1,173 @@
+"""
+Background jobs for the work that follows a meeting: building the final
+transcript from its journal, summarizing it and writing both files. Jobs run
+on a process pool, so tokenizing and summarizing a long meeting neither
+delays the transcription thread nor holds the Socket.IO server's GIL. Each
+job has an id and a status that the API can report.
+"""
+
+import itertools
+import multiprocessing
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+
+import transcript_journal
+from summarization import summarize_text
+from summary_cache import SummaryCache
+from transcript_cleaning import get_cleaner
+
+
+def finalize_meeting(journal_file, transcript_file, summary_file, filler_lexicon, max_sentences=12):
+    """Worker process: journal -> cleaned transcript file -> summary file, then drop the journal.
+
+    The summary goes through the on-disk tier of the summary cache, with the
+    server's summarizer, so the server finds it there later. Returns the
+    files written, the summary and the (stage, seconds) timings of the
+    structured_summary and file_write stages, which the server records.
+    """
+    result = {'transcript_file': None, 'summary_file': None, 'summary': None, 'words': 0,
+              'timings': []}
+    timings = result['timings']
+
+    def summarize(text, max_sentences):
+        started = time.perf_counter()
+        summary = summarize_text(text, max_sentences)
+        timings.append(('structured_summary', time.perf_counter() - started))
+        return summary
+
+    cleaner = get_cleaner(filler_lexicon)
+    started = time.perf_counter()
+    written = transcript_journal.write_transcript(journal_file, transcript_file, clean=cleaner.clean_chunk)
+    if written:
+        timings.append(('file_write', time.perf_counter() - started))
+        with open(transcript_file, encoding="utf8") as f:
+            cleaned_text = f.read()
+        cache = SummaryCache(os.path.dirname(summary_file), summarize, max_entries=0)
+        summary, _ = cache.get(cleaned_text, max_sentences)
+        started = time.perf_counter()
+        with open(summary_file, "w", encoding="utf8") as f:
+            f.write(summary)
+        timings.append(('file_write', time.perf_counter() - started))
+        result.update(transcript_file=transcript_file, summary_file=summary_file, summary=summary,
+                      words=len(cleaned_text.split()))
+    # Only drop the journal once the transcript and summary are on disk
+    os.remove(journal_file)
+    return result
+
+
+class JobQueue:
+    """Runs functions on a process pool and keeps each job's status by id.
+
+    With workers=0 jobs run inline in the submitting thread, as before there
+    was a queue (useful for benchmarks and single-process debugging).
+    A failed job is run again up to retries times under the same id before
+    it is reported as failed.
+    Create the queue at startup. Workers come from a forkserver (spawn where
+    that is unavailable), never from a fork of the threaded server, whose
+    locks other threads may hold at the time.
+    """
+
+    def __init__(self, workers=1, max_finished=256, retries=0):
+        self.workers = workers
+        self.retries = retries
+        self.max_finished = max_finished
+        self._lock = threading.Lock()
+        self._pool = None
+        if workers > 0:
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+            self._pool = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+        self._jobs = OrderedDict()
+        self._ids = itertools.count(1)
+
+    def submit(self, kind, fn, *args, meeting_id=None, on_done=None):
+        """Queue fn(*args); on_done(job) is called with the finished job. Returns the job id."""
+        with self._lock:
+            job_id = f"job_{next(self._ids)}"
+            job = {
+                'id': job_id,
+                'kind': kind,
+                'meeting_id': meeting_id,
+                'status': 'queued',
+                'created_at': time.time(),
+                'finished_at': None,
+                'result': None,
+                'error': None,
+                'attempts': 0,
+            }
+            self._jobs[job_id] = job
+        self._run(job, fn, args, on_done)
+        return job_id
+
+    def _run(self, job, fn, args, on_done):
+        with self._lock:
+            job['attempts'] += 1
+            pool = self._pool
+        if pool is not None:
+            future = pool.submit(fn, *args)
+        else:
+            future = Future()
+            future.set_running_or_notify_cancel()
+            try:
+                future.set_result(fn(*args))
+            except Exception as e:
+                future.set_exception(e)
+        with self._lock:
+            job['_future'] = future
+        future.add_done_callback(lambda f: self._finished(job, f, fn, args, on_done))
+
+    def _finished(self, job, future, fn, args, on_done):
+        if future.exception() is not None and job['attempts'] <= self.retries:
+            print(f"Job {job['id']} ({job['kind']}) failed, retrying: {future.exception()}")
+            self._run(job, fn, args, on_done)
+            return
+        with self._lock:
+            job['finished_at'] = time.time()
+            try:
+                job['result'] = future.result()
+                job['status'] = 'completed'
+            except Exception as e:
+                job.update(status='failed', error=str(e))
+                print(f"Job {job['id']} ({job['kind']}) failed: {e}")
+            job.pop('_future', None)
+            # Forget the oldest finished jobs past max_finished
+            finished = [job_id for job_id, j in self._jobs.items() if j['finished_at'] is not None]
+            for job_id in finished[:max(0, len(finished) - self.max_finished)]:
+                del self._jobs[job_id]
+        if on_done is not None:
+            try:
+                on_done(self.get(job['id']) or job)
+            except Exception as e:
+                print(f"Job {job['id']} callback failed: {e}")
+
+    def get(self, job_id):
+        """Snapshot of a job for the status API, or None if unknown."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            snapshot = {key: value for key, value in job.items() if key != '_future'}
+            future = job.get('_future')
+        if future is not None and future.running():
+            snapshot['status'] = 'running'
+        return snapshot
+
+    def counts(self):
+        """Jobs by status."""
+        with self._lock:
+            jobs = list(self._jobs)
+        counts = {}
+        for job_id in jobs:
+            job = self.get(job_id)
+            if job is not None:
+                counts[job['status']] = counts.get(job['status'], 0) + 1
+        return counts
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait)
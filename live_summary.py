@@ -0,0 +1,89 @@
+"""
+Incremental meeting summarizer.
+Fed one finalized transcript chunk at a time, it keeps running word
+frequencies and sentence scores so the live Key Points / Action Items /
+Decisions view costs time proportional to the new text only.
+"""
+
+import heapq
+from collections import Counter, deque
+
+from summarization import MAX_SENTENCE_WORDS, classify_sentence, stop_words, tokenizers
+
+
+class LiveSummarizer:
+    """Running extractive summary of a meeting.
+
+    Key points use the same word-frequency scoring as structured_summary, but
+    only a bounded pool of the best sentences is re-ranked on each snapshot.
+    A sentence that falls out of the pool is not reconsidered, so the live
+    view can differ slightly from the final summary, which is still exact.
+    """
+
+    def __init__(self, max_sentences=10, clean=None, max_items=20, pool_factor=4):
+        self.max_sentences = max_sentences
+        self.pool_size = max_sentences * pool_factor
+        self._clean = clean
+        self._sent_tokenize, self._word_tokenize = tokenizers()
+        self._stop_words = stop_words()
+        self.word_freq = Counter()
+        # sentence -> Counter of its scoring words, only for pooled sentences
+        self._pool = {}
+        self.action_items = deque(maxlen=max_items)
+        self.decisions = deque(maxlen=max_items)
+        self.sentence_count = 0
+        self.version = 0
+
+    def add_chunk(self, text):
+        """Fold one finalized transcript chunk into the running summary.
+
+        Returns the chunk's new action items and decisions as (kind, sentence)
+        pairs, kind being 'action' or 'decision'.
+        """
+        if self._clean is not None:
+            text = self._clean(text)
+        if not text.strip():
+            return []
+        detected = []
+
+        for sent in self._sent_tokenize(text):
+            words = [w for w in self._word_tokenize(sent.lower())
+                     if w.isalpha() and w not in self._stop_words]
+            self.word_freq.update(words)
+            self.sentence_count += 1
+
+            if len(sent.split()) <= MAX_SENTENCE_WORDS and words:
+                self._pool[sent] = Counter(words)
+            kinds = classify_sentence(sent)
+            if 'action' in kinds:
+                self.action_items.append(sent)
+                detected.append(('action', sent))
+            if 'decision' in kinds:
+                self.decisions.append(sent)
+                detected.append(('decision', sent))
+
+        if len(self._pool) > self.pool_size:
+            ranked = self._ranked_pool()
+            self._pool = {sent: self._pool[sent] for sent in ranked[:self.pool_size]}
+        self.version += 1
+        return detected
+
+    def _score(self, terms):
+        return sum(count * self.word_freq[word] for word, count in terms.items())
+
+    def _ranked_pool(self):
+        # Dividing by max frequency does not change the ranking, so raw counts are used
+        return heapq.nlargest(len(self._pool), self._pool, key=lambda s: self._score(self._pool[s]))
+
+    def key_points(self):
+        return heapq.nlargest(self.max_sentences, self._pool, key=lambda s: self._score(self._pool[s]))
+
+    def snapshot(self):
+        """Current Key Points / Action Items / Decisions, with the newest items last."""
+        return {
+            'key_points': self.key_points(),
+            'action_items': list(self.action_items),
+            'decisions': list(self.decisions),
+            'sentences': self.sentence_count,
+            'version': self.version,
+        }
@@ -1,9 +1,12 @@
+import json
 import os
-import queue
 import time
 import sounddevice as sd
-import vosk
-from app import clean_transcript, structured_summary  # your existing functions
+import transcript_journal
+from finalize_jobs import finalize_meeting
+from vosk_models import registry as model_registry
+from audio_buffer import AudioRingBuffer
+from vad import VoiceActivityGate
 
 # Folders to save transcripts and summaries
 TRANSCRIPT_FOLDER = "transcripts"
@@ -13,54 +16,64 @@ os.makedirs(SUMMARY_FOLDER, exist_ok=True)
 
 # Vosk model path
 MODEL_PATH = "vosk-model-small-en-us-0.15"
-model = vosk.Model(MODEL_PATH)
+model_registry.preload([MODEL_PATH])
 
-# Audio queue
-q = queue.Queue()
-accumulated_text = ""
+# Audio queue, capped at 10 seconds so a slow machine skips ahead instead of growing without bound
+q = AudioRingBuffer(max_seconds=10.0, policy="drop_oldest")
 SAMPLE_RATE = 16000
+# Silence between utterances is dropped before it reaches the recognizer
+vad = VoiceActivityGate(SAMPLE_RATE)
 
 def audio_callback(indata, frames, time_info, status):
     if status:
         print(status)
-    q.put(bytes(indata))
+    q.put((time.monotonic(), bytes(indata)))
 
-def save_final_transcript_and_summary(text, meeting_name="live_meeting"):
-    cleaned_text = clean_transcript(text)
-    
-    # Save transcript
-    transcript_file = os.path.join(TRANSCRIPT_FOLDER, meeting_name + "_transcript.txt")
-    with open(transcript_file, "w", encoding="utf8") as f:
-        f.write(cleaned_text)
-    
-    # Generate summary
-    summary = structured_summary(cleaned_text, max_sentences=12)
-    summary_file = os.path.join(SUMMARY_FOLDER, meeting_name + "_structured_summary.txt")
-    with open(summary_file, "w", encoding="utf8") as f:
-        f.write(summary)
-    
-    print(f"\n✅ Final transcript saved: {transcript_file}")
-    print(f"✅ Final summary saved: {summary_file}")
+MEETING_NAME = "live_meeting"
+# Every final result is journaled as it arrives, so a crash loses at most about a second of
+# transcript; the transcript server (app.py) turns a journal left behind into files on its next start
+journal_file = transcript_journal.journal_path(TRANSCRIPT_FOLDER, MEETING_NAME)
+journal = transcript_journal.TranscriptJournal(journal_file)
+seq = 0
+
+def add_final(result):
+    global seq
+    text_chunk = json.loads(result)['text'].strip()
+    if text_chunk:
+        seq += 1
+        journal.append({'seq': seq, 'text': text_chunk, 'timestamp': time.time()})
+
+def save_final_transcript_and_summary(meeting_name=MEETING_NAME):
+    """Build the transcript and summary from the journal, which is removed once they are written."""
+    journal.close()
+    result = finalize_meeting(journal_file,
+                              os.path.join(TRANSCRIPT_FOLDER, meeting_name + "_transcript.txt"),
+                              os.path.join(SUMMARY_FOLDER, meeting_name + "_structured_summary.txt"),
+                              "en", 12)
+    if result['summary_file']:
+        print(f"\n✅ Final transcript saved: {result['transcript_file']}")
+        print(f"✅ Final summary saved: {result['summary_file']}")
 
 # Start live audio capture
 with sd.RawInputStream(samplerate=SAMPLE_RATE, blocksize=8000, dtype='int16',
                        channels=1, callback=audio_callback):
     print("🎤 Live transcription started. Press Ctrl+C to end the meeting.")
-    rec = vosk.KaldiRecognizer(model, SAMPLE_RATE)
+    rec = model_registry.acquire(MODEL_PATH, SAMPLE_RATE)
 
     try:
         while True:
-            data = q.get()
-            if rec.AcceptWaveform(data):
-                result = rec.Result()
-                text_chunk = eval(result)['text']  # result is JSON
-                if text_chunk.strip():
-                    accumulated_text += " " + text_chunk.strip()
-            else:
-                # optional: handle partial results
-                pass
+            _, data = q.get()
+            data = vad.process(data)
+            if data and rec.AcceptWaveform(data):
+                add_final(rec.Result())
+            if vad.closed:
+                # The gate dropped the silence the recognizer would endpoint on; end the utterance here
+                add_final(rec.FinalResult())
+            journal.maybe_commit()
 
     except KeyboardInterrupt:
-        # Meeting ended, save final transcript and summary
-        save_final_transcript_and_summary(accumulated_text)
+        # Meeting ended: finalize the words still pending, then save transcript and summary
+        add_final(rec.FinalResult())
+        save_final_transcript_and_summary()
+        print(f"🔇 Voice-activity gate skipped {vad.skipped_fraction:.0%} of the audio")
         print("🛑 Live transcription stopped.")
@@ -0,0 +1,501 @@
+"""
+SQLite storage for simple_app meetings.
+The database runs in WAL mode so several worker processes can share it,
+with indexes on date, status and participant for filtered listings.
+Every meeting carries a version counter that goes up on each change, which
+the API uses as its ETag.
+
+The live transcript is kept as a base text (the aiNotes column) followed by
+numbered segments. Appending is a single insert, and readers can ask for only
+the segments after the offset they already have. Each piece of transcript
+text is also parsed once, when written, into a line index (start time, speaker
+id and character span in the full transcript) with running per-speaker totals,
+so speaker and time-range queries read only the lines they return.
+"""
+
+import base64
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+from transcript_lines import line_text, parse_lines
+
+# API field name -> column name
+FIELDS = {
+    "title": "title",
+    "description": "description",
+    "date": "date",
+    "time": "time",
+    "duration": "duration",
+    "participants": "participants",
+    "status": "status",
+    "meetingLink": "meeting_link",
+    "notes": "notes",
+    "aiNotes": "ai_notes",
+    "manualNotes": "manual_notes",
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meetings (
+    num INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL UNIQUE,
+    title TEXT NOT NULL DEFAULT '',
+    description TEXT NOT NULL DEFAULT '',
+    date TEXT NOT NULL DEFAULT '',
+    time TEXT NOT NULL DEFAULT '',
+    duration INTEGER NOT NULL DEFAULT 60,
+    participants TEXT NOT NULL DEFAULT '[]',
+    status TEXT NOT NULL DEFAULT 'scheduled',
+    meeting_link TEXT NOT NULL DEFAULT '',
+    notes TEXT NOT NULL DEFAULT '',
+    ai_notes TEXT NOT NULL DEFAULT '',
+    manual_notes TEXT NOT NULL DEFAULT '',
+    version INTEGER NOT NULL DEFAULT 1,
+    transcript_seq INTEGER NOT NULL DEFAULT 0,
+    transcript_base INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_meetings_date ON meetings (date, num);
+CREATE INDEX IF NOT EXISTS idx_meetings_status_date ON meetings (status, date, num);
+
+CREATE TABLE IF NOT EXISTS meeting_participants (
+    meeting_num INTEGER NOT NULL REFERENCES meetings (num) ON DELETE CASCADE,
+    email TEXT NOT NULL,
+    PRIMARY KEY (email, meeting_num)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_participants_meeting ON meeting_participants (meeting_num);
+
+CREATE TABLE IF NOT EXISTS transcript_segments (
+    meeting_num INTEGER NOT NULL REFERENCES meetings (num) ON DELETE CASCADE,
+    seq INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    PRIMARY KEY (meeting_num, seq)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS transcript_speakers (
+    meeting_num INTEGER NOT NULL REFERENCES meetings (num) ON DELETE CASCADE,
+    speaker_id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    lines INTEGER NOT NULL DEFAULT 0,
+    words INTEGER NOT NULL DEFAULT 0,
+    talk_seconds INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (meeting_num, speaker_id)
+) WITHOUT ROWID;
+CREATE UNIQUE INDEX IF NOT EXISTS idx_speakers_name ON transcript_speakers (meeting_num, name);
+
+CREATE TABLE IF NOT EXISTS transcript_lines (
+    meeting_num INTEGER NOT NULL REFERENCES meetings (num) ON DELETE CASCADE,
+    line INTEGER NOT NULL,
+    start INTEGER NOT NULL,
+    speaker_id INTEGER,
+    span_start INTEGER NOT NULL,
+    span_end INTEGER NOT NULL,
+    PRIMARY KEY (meeting_num, line)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_lines_start ON transcript_lines (meeting_num, start, line);
+CREATE INDEX IF NOT EXISTS idx_lines_speaker ON transcript_lines (meeting_num, speaker_id, line);
+"""
+
+# Columns added after the first release, created on older databases at startup
+ADDED_COLUMNS = {
+    "version": "INTEGER NOT NULL DEFAULT 1",
+    "transcript_seq": "INTEGER NOT NULL DEFAULT 0",
+    "transcript_base": "INTEGER NOT NULL DEFAULT 0",
+    "transcript_chars": "INTEGER NOT NULL DEFAULT 0",
+}
+
+MEETING_COLUMNS = "num, id, version, transcript_base, " + ", ".join(FIELDS.values())
+
+TRANSCRIPT_SEPARATOR = "\n\n"
+
+
+def encode_cursor(date, num):
+    return base64.urlsafe_b64encode(f"{date}|{num}".encode("utf8")).decode("ascii")
+
+
+def decode_cursor(cursor):
+    """Return (date, num) from a cursor, raising ValueError if it is malformed."""
+    try:
+        date, num = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf8").rsplit("|", 1)
+        return date, int(num)
+    except (UnicodeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+class MeetingStore:
+    """Meetings persisted in SQLite.
+
+    Connections come from a small pool and are held for one call only. Under
+    gevent every request is its own greenlet, so per-thread connections would
+    mean one connection (and its file handles) per open request.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._pool = []
+        self._pool_lock = threading.Lock()
+        self._watch_conn = None
+        with self._connection() as conn, conn:
+            line_columns = {row["name"] for row in conn.execute("PRAGMA table_info(transcript_lines)")}
+            if "text" in line_columns:
+                # Early line indexes kept a copy of each line's text; rebuild them without it
+                conn.execute("DROP TABLE transcript_lines")
+                line_columns = set()
+            had_line_index = bool(line_columns)
+            conn.executescript(SCHEMA)
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(meetings)")}
+            for column, definition in ADDED_COLUMNS.items():
+                if column not in columns:
+                    conn.execute(f"ALTER TABLE meetings ADD COLUMN {column} {definition}")
+            if not had_line_index:
+                # Databases from before the line index: parse every stored transcript once
+                for row in conn.execute("SELECT num, ai_notes, transcript_base FROM meetings").fetchall():
+                    text = self._full_transcript(conn, row["num"], row["transcript_base"], row["ai_notes"])
+                    self._reset_lines(conn, row["num"], text)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        return conn
+
+    @contextmanager
+    def _connection(self):
+        with self._pool_lock:
+            conn = self._pool.pop() if self._pool else None
+        if conn is None:
+            conn = self._connect()
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            with self._pool_lock:
+                self._pool.append(conn)
+
+    @staticmethod
+    def _columns(fields):
+        """SELECT list for a projection; None selects every field."""
+        if fields is None:
+            return MEETING_COLUMNS
+        unknown = [f for f in fields if f not in FIELDS and f not in ("id", "version")]
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+        # num and date are always read for the pagination cursor
+        base = ["num", "id", "version", "transcript_base", "date"]
+        return ", ".join(base + [FIELDS[f] for f in fields if f in FIELDS and f != "date"])
+
+    def _to_dict(self, conn, row, fields=None):
+        meeting = {"id": row["id"], "version": row["version"]}
+        for field, column in FIELDS.items():
+            if fields is None or field in fields:
+                meeting[field] = row[column]
+        if "participants" in meeting:
+            meeting["participants"] = json.loads(meeting["participants"])
+        if "aiNotes" in meeting:
+            meeting["aiNotes"] = self._full_transcript(conn, row["num"], row["transcript_base"], meeting["aiNotes"])
+        return meeting
+
+    def _full_transcript(self, conn, num, base_seq, base_text):
+        """The base text followed by every segment appended since it was set."""
+        rows = conn.execute(
+            "SELECT text FROM transcript_segments WHERE meeting_num = ? AND seq > ? ORDER BY seq",
+            (num, base_seq))
+        parts = [base_text] if base_text else []
+        parts.extend(row["text"] for row in rows)
+        return TRANSCRIPT_SEPARATOR.join(parts)
+
+    def _set_participants(self, conn, num, participants):
+        conn.execute("DELETE FROM meeting_participants WHERE meeting_num = ?", (num,))
+        conn.executemany("INSERT OR IGNORE INTO meeting_participants (meeting_num, email) VALUES (?, ?)",
+                         [(num, email) for email in participants])
+
+    def _reset_lines(self, conn, num, text):
+        """Replace a meeting's line index with the lines of text."""
+        conn.execute("DELETE FROM transcript_lines WHERE meeting_num = ?", (num,))
+        conn.execute("DELETE FROM transcript_speakers WHERE meeting_num = ?", (num,))
+        conn.execute("UPDATE meetings SET transcript_chars = 0 WHERE num = ?", (num,))
+        self._index_lines(conn, num, text, separator=False)
+
+    def _index_lines(self, conn, num, text, separator=True):
+        """Parse text appended to a meeting's transcript into its line index.
+
+        separator says whether the text follows earlier transcript text (and
+        so a TRANSCRIPT_SEPARATOR). A line's talk time is the time until the
+        next line starts, so each new line completes the one before it.
+        """
+        chars = conn.execute("SELECT transcript_chars FROM meetings WHERE num = ?", (num,)).fetchone()[0]
+        offset = chars + (len(TRANSCRIPT_SEPARATOR) if separator else 0)
+        conn.execute("UPDATE meetings SET transcript_chars = ? WHERE num = ?", (offset + len(text), num))
+        last = conn.execute(
+            "SELECT line, start, speaker_id FROM transcript_lines WHERE meeting_num = ? ORDER BY line DESC LIMIT 1",
+            (num,)).fetchone()
+        line_num, previous_start, previous_speaker = tuple(last) if last is not None else (0, None, None)
+        speaker_ids = {}
+        for line in parse_lines(text, offset, previous_start):
+            if previous_speaker is not None:
+                conn.execute(
+                    "UPDATE transcript_speakers SET talk_seconds = talk_seconds + ? "
+                    "WHERE meeting_num = ? AND speaker_id = ?",
+                    (line["start"] - previous_start, num, previous_speaker))
+            speaker_id = None
+            if line["speaker"] is not None:
+                speaker_id = speaker_ids.get(line["speaker"]) or self._speaker_id(conn, num, line["speaker"])
+                speaker_ids[line["speaker"]] = speaker_id
+                conn.execute(
+                    "UPDATE transcript_speakers SET lines = lines + 1, words = words + ? "
+                    "WHERE meeting_num = ? AND speaker_id = ?",
+                    (len(line["text"].split()), num, speaker_id))
+            line_num += 1
+            conn.execute(
+                "INSERT INTO transcript_lines (meeting_num, line, start, speaker_id, span_start, span_end) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (num, line_num, line["start"], speaker_id, *line["span"]))
+            previous_start, previous_speaker = line["start"], speaker_id
+
+    @staticmethod
+    def _speaker_id(conn, num, name):
+        row = conn.execute("SELECT speaker_id FROM transcript_speakers WHERE meeting_num = ? AND name = ?",
+                           (num, name)).fetchone()
+        if row is not None:
+            return row["speaker_id"]
+        speaker_id = conn.execute(
+            "SELECT COALESCE(MAX(speaker_id), 0) + 1 FROM transcript_speakers WHERE meeting_num = ?",
+            (num,)).fetchone()[0]
+        conn.execute("INSERT INTO transcript_speakers (meeting_num, speaker_id, name) VALUES (?, ?, ?)",
+                     (num, speaker_id, name))
+        return speaker_id
+
+    def data_version(self):
+        """Changes whenever any other connection (thread or process) commits a write.
+
+        Uses a connection of its own, so call it from a single watcher thread.
+        """
+        if self._watch_conn is None:
+            self._watch_conn = self._connect()
+        return self._watch_conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def count(self):
+        with self._connection() as conn:
+            return conn.execute("SELECT COUNT(*) FROM meetings").fetchone()[0]
+
+    def get(self, meeting_id):
+        with self._connection() as conn:
+            row = conn.execute(f"SELECT {MEETING_COLUMNS} FROM meetings WHERE id = ?",
+                               (meeting_id,)).fetchone()
+            return self._to_dict(conn, row) if row is not None else None
+
+    def versions(self):
+        """Version of every meeting, by id."""
+        with self._connection() as conn:
+            return dict(conn.execute("SELECT id, version FROM meetings").fetchall())
+
+    def version(self, meeting_id):
+        """Current version of a meeting, or None if it doesn't exist."""
+        with self._connection() as conn:
+            row = conn.execute("SELECT version FROM meetings WHERE id = ?", (meeting_id,)).fetchone()
+        return row["version"] if row is not None else None
+
+    def list(self, date_from=None, date_to=None, status=None, participant=None,
+             cursor=None, limit=None, fields=None):
+        """Meetings ordered by date, filtered in SQL.
+
+        fields limits the returned fields (id and version are always included),
+        so large columns like the transcript are not read at all.
+        Returns (meetings, next_cursor); next_cursor is None on the last page.
+        """
+        columns = self._columns(fields)
+        where, params = [], []
+        if date_from:
+            where.append("date >= ?")
+            params.append(date_from)
+        if date_to:
+            where.append("date <= ?")
+            params.append(date_to)
+        if status:
+            where.append("status = ?")
+            params.append(status)
+        if participant:
+            where.append("num IN (SELECT meeting_num FROM meeting_participants WHERE email = ?)")
+            params.append(participant)
+        if cursor:
+            date, num = decode_cursor(cursor)
+            where.append("(date, num) > (?, ?)")
+            params.extend([date, num])
+
+        sql = f"SELECT {columns} FROM meetings"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY date, num"
+        if limit is not None:
+            # Fetch one extra row to know whether another page exists
+            sql += " LIMIT ?"
+            params.append(limit + 1)
+
+        with self._connection() as conn:
+            rows = conn.execute(sql, params).fetchall()
+            next_cursor = None
+            if limit is not None and len(rows) > limit:
+                rows = rows[:limit]
+                next_cursor = encode_cursor(rows[-1]["date"], rows[-1]["num"])
+            return [self._to_dict(conn, row, fields) for row in rows], next_cursor
+
+    def create(self, meeting, meeting_id=None, link_format=None):
+        """Insert a meeting; without meeting_id one is generated as meeting_<n>.
+
+        link_format (e.g. "https://meet.example.com/{id}") sets the meeting
+        link from the id, in the same transaction.
+        """
+        with self._connection() as conn, conn:
+            # IMMEDIATE takes the write lock up front so concurrent workers can't pick the same id
+            conn.execute("BEGIN IMMEDIATE")
+            values = {column: meeting.get(field, "") for field, column in FIELDS.items()}
+            values["participants"] = json.dumps(meeting.get("participants", []))
+            if meeting_id is None:
+                # Numbers come from the AUTOINCREMENT sequence, which never hands out the number of a
+                # deleted meeting again, so an id (and its ETag) is never reused for other content
+                row = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'meetings'").fetchone()
+                values["num"] = (row[0] if row is not None else 0) + 1
+                meeting_id = f"meeting_{values['num']}"
+            if link_format is not None:
+                values["meeting_link"] = link_format.format(id=meeting_id)
+            cur = conn.execute(
+                f"INSERT INTO meetings (id, {', '.join(values)}) VALUES (?, {', '.join('?' * len(values))})",
+                [meeting_id, *values.values()])
+            self._set_participants(conn, cur.lastrowid, meeting.get("participants", []))
+            self._reset_lines(conn, cur.lastrowid, values["ai_notes"])
+        return self.get(meeting_id)
+
+    def update(self, meeting_id, fields):
+        """Update known fields of a meeting. Returns the updated meeting, or None if it doesn't exist."""
+        fields = {f: v for f, v in fields.items() if f in FIELDS}
+        with self._connection() as conn, conn:
+            row = conn.execute("SELECT num FROM meetings WHERE id = ?", (meeting_id,)).fetchone()
+            if row is None:
+                return None
+            if fields:
+                values = [json.dumps(v) if f == "participants" else v for f, v in fields.items()]
+                assignments = [f"{FIELDS[f]} = ?" for f in fields] + ["version = version + 1"]
+                if "aiNotes" in fields:
+                    # Replacing the transcript folds away its segments; offsets keep counting up
+                    assignments.append("transcript_base = transcript_seq")
+                    conn.execute("DELETE FROM transcript_segments WHERE meeting_num = ?", (row["num"],))
+                conn.execute(f"UPDATE meetings SET {', '.join(assignments)} WHERE num = ?", [*values, row["num"]])
+                if "participants" in fields:
+                    self._set_participants(conn, row["num"], fields["participants"])
+                if "aiNotes" in fields:
+                    self._reset_lines(conn, row["num"], fields["aiNotes"])
+        return self.get(meeting_id)
+
+    def append_transcript(self, meeting_id, text):
+        """Add a segment to a meeting's transcript.
+
+        Returns the new transcript offset, or None if the meeting doesn't exist.
+        """
+        with self._connection() as conn, conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute("SELECT num, transcript_seq, transcript_base, transcript_chars FROM meetings WHERE id = ?",
+                               (meeting_id,)).fetchone()
+            if row is None:
+                return None
+            seq = row["transcript_seq"] + 1
+            conn.execute("INSERT INTO transcript_segments (meeting_num, seq, text) VALUES (?, ?, ?)",
+                         (row["num"], seq, text))
+            conn.execute("UPDATE meetings SET transcript_seq = ?, version = version + 1 WHERE num = ?",
+                         (seq, row["num"]))
+            # The first segment after an empty base is not preceded by a separator
+            self._index_lines(conn, row["num"], text,
+                              separator=row["transcript_chars"] > 0 or seq > row["transcript_base"] + 1)
+        return seq
+
+    def transcript(self, meeting_id, since=None):
+        """A meeting's transcript, or None if the meeting doesn't exist.
+
+        Returns a dict with the meeting 'status' and the current 'offset'. With
+        since at or after the last full replacement of the transcript it holds
+        the 'segments' newer than since ({'offset', 'text'}), otherwise the full
+        'transcript' text and the 'participants'.
+        """
+        with self._connection() as conn:
+            row = conn.execute(
+                "SELECT num, status, participants, ai_notes, transcript_seq, transcript_base FROM meetings WHERE id = ?",
+                (meeting_id,)).fetchone()
+            if row is None:
+                return None
+            result = {"status": row["status"], "offset": row["transcript_seq"]}
+            if since is not None and since >= row["transcript_base"]:
+                rows = conn.execute(
+                    "SELECT seq, text FROM transcript_segments WHERE meeting_num = ? AND seq > ? ORDER BY seq",
+                    (row["num"], since))
+                result["segments"] = [{"offset": r["seq"], "text": r["text"]} for r in rows]
+            else:
+                result["transcript"] = self._full_transcript(conn, row["num"], row["transcript_base"], row["ai_notes"])
+                result["participants"] = json.loads(row["participants"])
+            return result
+
+    def speakers(self, meeting_id):
+        """Talk-time totals per speaker in order of first appearance, or None if the meeting doesn't exist.
+
+        A line's talk time runs until the next line starts, so the latest line
+        only counts once another one follows it.
+        """
+        with self._connection() as conn:
+            row = conn.execute("SELECT num FROM meetings WHERE id = ?", (meeting_id,)).fetchone()
+            if row is None:
+                return None
+            rows = conn.execute(
+                "SELECT speaker_id, name, lines, words, talk_seconds FROM transcript_speakers "
+                "WHERE meeting_num = ? ORDER BY speaker_id", (row["num"],))
+            return [{"id": r["speaker_id"], "name": r["name"], "lines": r["lines"], "words": r["words"],
+                     "talkSeconds": r["talk_seconds"]} for r in rows]
+
+    def lines(self, meeting_id, start=None, end=None, speaker=None, after=0, limit=None):
+        """Indexed transcript lines of a meeting, or None if the meeting (or speaker) doesn't exist.
+
+        start/end bound the line start in seconds (start inclusive, end
+        exclusive); speaker is a speaker id or name. Only lines after line
+        number `after` are returned, at most limit of them. Line text is
+        sliced out of the stored transcript by span.
+        """
+        with self._connection() as conn:
+            row = conn.execute("SELECT num, ai_notes, transcript_base FROM meetings WHERE id = ?",
+                               (meeting_id,)).fetchone()
+            if row is None:
+                return None
+            where, params = ["l.meeting_num = ?", "l.line > ?"], [row["num"], after]
+            if speaker is not None:
+                found = conn.execute(
+                    "SELECT speaker_id FROM transcript_speakers WHERE meeting_num = ? AND "
+                    + ("speaker_id = ?" if isinstance(speaker, int) else "name = ?"),
+                    (row["num"], speaker)).fetchone()
+                if found is None:
+                    return None
+                where.append("l.speaker_id = ?")
+                params.append(found["speaker_id"])
+            if start is not None:
+                where.append("l.start >= ?")
+                params.append(start)
+            if end is not None:
+                where.append("l.start < ?")
+                params.append(end)
+            sql = (f"SELECT l.line, l.start, l.speaker_id, s.name, l.span_start, l.span_end "
+                   f"FROM transcript_lines l LEFT JOIN transcript_speakers s "
+                   f"ON s.meeting_num = l.meeting_num AND s.speaker_id = l.speaker_id "
+                   f"WHERE {' AND '.join(where)} ORDER BY l.line")
+            if limit is not None:
+                sql += " LIMIT ?"
+                params.append(limit)
+            rows = conn.execute(sql, params).fetchall()
+            text = self._full_transcript(conn, row["num"], row["transcript_base"], row["ai_notes"]) if rows else ""
+            return [{"line": r["line"], "start": r["start"], "speakerId": r["speaker_id"], "speaker": r["name"],
+                     "span": [r["span_start"], r["span_end"]],
+                     "text": line_text(text[r["span_start"]:r["span_end"]])}
+                    for r in rows]
+
+    def delete(self, meeting_id):
+        """Delete a meeting. Returns False if it did not exist."""
+        with self._connection() as conn, conn:
+            cur = conn.execute("DELETE FROM meetings WHERE id = ?", (meeting_id,))
+        return cur.rowcount > 0
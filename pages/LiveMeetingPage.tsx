@@ -1,4 +1,4 @@
-import React, { useState, useEffect, useMemo } from 'react';
+import React, { useState, useEffect, useMemo, useRef } from 'react';
 import { useParams, useNavigate } from 'react-router-dom';
 import type { Meeting } from '../types';
 import * as api from '../services/api';
@@ -206,6 +206,7 @@ const LiveMeetingPage: React.FC = () => {
     // Transcript state
     const [liveTranscript, setLiveTranscript] = useState('');
     const [isTranscribing, setIsTranscribing] = useState(false);
+    const transcriptOffsetRef = useRef<number | null>(null);
 
     useEffect(() => {
         const fetchMeeting = async () => {
@@ -291,6 +292,23 @@ const LiveMeetingPage: React.FC = () => {
         simulateLiveTranscript();
     };
 
+    // Fetch only what was added since the last known offset; the first call
+    // (or a reset after the transcript was replaced) returns the full text
+    const fetchTranscriptUpdates = async () => {
+        const since = transcriptOffsetRef.current;
+        const query = since === null ? '' : `?since=${since}`;
+        const response = await fetch(`http://localhost:5000/api/meetings/${meetingId}/transcript${query}`);
+        if (!response.ok) return;
+        const data = await response.json();
+        if (data.reset) {
+            setLiveTranscript(data.transcript);
+        } else if (data.segments.length > 0) {
+            const text = data.segments.map((segment: { text: string }) => segment.text).join('\n\n');
+            setLiveTranscript(prev => (prev ? prev + '\n\n' : '') + text);
+        }
+        transcriptOffsetRef.current = data.offset;
+    };
+
     const simulateLiveTranscript = () => {
         if (!meetingId) return;
         
@@ -332,8 +350,7 @@ const LiveMeetingPage: React.FC = () => {
                 });
 
                 if (response.ok) {
-                    const data = await response.json();
-                    setLiveTranscript(data.transcript);
+                    await fetchTranscriptUpdates();
                 }
             } catch (error) {
                 console.error('Failed to update transcript', error);
@@ -0,0 +1,112 @@
+"""
+Pipeline-stage timings for the transcript server's /metrics endpoint.
+Stages only record while something is scraping: before the first scrape, and
+once scrapes stop for a while, a stage timer is a shared no-op, so an
+unmonitored server pays one clock read per stage. Gauges (queue depth,
+sessions, clients) are read at scrape time and cost nothing in between.
+"""
+
+import bisect
+import threading
+import time
+from contextlib import nullcontext
+
+# Upper bounds of the duration histogram buckets, in seconds
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_IDLE_TIMER = nullcontext()
+
+
+def _label_value(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_gauge(name, help_text, samples, kind="gauge"):
+    """Prometheus text lines for one gauge; samples are (labels dict, value) pairs."""
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+    for labels, value in samples:
+        if labels:
+            label_text = ",".join(f'{k}="{_label_value(v)}"' for k, v in labels.items())
+            lines.append(f"{name}{{{label_text}}} {value}")
+        else:
+            lines.append(f"{name} {value}")
+    return lines
+
+
+def format_counter(name, help_text, samples):
+    """Like format_gauge, for a value that only goes up."""
+    return format_gauge(name, help_text, samples, kind="counter")
+
+
+class _StageTimer:
+    __slots__ = ("metrics", "stage", "started")
+
+    def __init__(self, metrics, stage):
+        self.metrics = metrics
+        self.stage = stage
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.metrics._record(self.stage, time.perf_counter() - self.started)
+        return False
+
+
+class PipelineMetrics:
+    """Duration histograms per pipeline stage, recorded while /metrics is being scraped."""
+
+    def __init__(self, idle_seconds=300.0, name="transcript_stage_duration_seconds"):
+        self.idle_seconds = idle_seconds
+        self.name = name
+        self._lock = threading.Lock()
+        self._stages = {}   # stage -> [bucket counts, sum, count]
+        self._record_until = 0.0
+
+    @property
+    def recording(self):
+        return time.monotonic() < self._record_until
+
+    def timer(self, stage):
+        """Context manager timing one pass through stage."""
+        if time.monotonic() >= self._record_until:
+            return _IDLE_TIMER
+        return _StageTimer(self, stage)
+
+    def observe(self, stage, seconds):
+        """Record a duration the caller measured itself."""
+        if time.monotonic() < self._record_until:
+            self._record(stage, seconds)
+
+    def _record(self, stage, seconds):
+        with self._lock:
+            entry = self._stages.get(stage)
+            if entry is None:
+                entry = self._stages[stage] = [[0] * len(BUCKETS), 0.0, 0]
+            index = bisect.bisect_left(BUCKETS, seconds)
+            if index < len(BUCKETS):
+                entry[0][index] += 1
+            entry[1] += seconds
+            entry[2] += 1
+
+    def render(self):
+        """Histogram lines for every stage seen so far; keeps recording for idle_seconds."""
+        self._record_until = time.monotonic() + self.idle_seconds
+        with self._lock:
+            stages = {stage: (list(buckets), total, count)
+                      for stage, (buckets, total, count) in self._stages.items()}
+        lines = [f"# HELP {self.name} Time spent in each transcription pipeline stage.",
+                 f"# TYPE {self.name} histogram"]
+        for stage, (buckets, total, count) in sorted(stages.items()):
+            label = _label_value(stage)
+            cumulative = 0
+            for bound, n in zip(BUCKETS, buckets):
+                cumulative += n
+                lines.append(f'{self.name}_bucket{{stage="{label}",le="{bound}"}} {cumulative}')
+            lines.append(f'{self.name}_bucket{{stage="{label}",le="+Inf"}} {count}')
+            lines.append(f'{self.name}_sum{{stage="{label}"}} {total:.6f}')
+            lines.append(f'{self.name}_count{{stage="{label}"}} {count}')
+        return lines
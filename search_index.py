@@ -0,0 +1,274 @@
+"""
+In-process full-text search over meetings and saved transcript/summary files.
+An inverted index maps each term to the documents containing it, ranked with
+BM25. Documents are updated incrementally (a live transcript append only adds
+the new text's terms) and the index is saved gzip-compressed, together with
+each document's version or file stamp, so a restart only re-reads what
+changed.
+"""
+
+import array
+import glob
+import gzip
+import heapq
+import json
+import math
+import os
+import re
+import sys
+import threading
+from collections import Counter
+
+try:
+    import fcntl
+except ImportError:  # Windows: no worker processes to coordinate
+    fcntl = None
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+
+# Very common words are left out of the index; they would make every query
+# walk nearly every document
+STOP_WORDS = frozenset("""
+a an and are as at be but by can do for from has have i if in into is it its
+just me my of on or our so that the their then there these they this to up us
+was we were what when which will with you your
+""".split())
+
+INDEX_FORMAT = 2
+BM25_K1 = 1.2
+BM25_B = 0.75
+SNIPPET_CHARS = 160
+
+
+def tokenize(text):
+    return [t for t in TOKEN_PATTERN.findall(text.lower()) if t not in STOP_WORDS and len(t) > 1]
+
+
+def snippet(text, terms, width=SNIPPET_CHARS):
+    """A short excerpt of text around the first query term it contains."""
+    if not text:
+        return ""
+    match = None
+    if terms:
+        pattern = re.compile(r"\b(?:" + "|".join(map(re.escape, terms)) + r")\b", re.IGNORECASE)
+        match = pattern.search(text)
+    start = max(0, match.start() - width // 3) if match else 0
+    end = min(len(text), start + width)
+    excerpt = " ".join(text[start:end].split())
+    return ("…" if start > 0 else "") + excerpt + ("…" if end < len(text) else "")
+
+
+class SearchIndex:
+    """Inverted index of documents identified by string keys.
+
+    Each document has a stamp (a meeting version or a file mtime/size) used to
+    tell which documents changed while the index was not running. Several
+    processes may keep an index of the same path; only the one holding the
+    path's lock file saves it, the others keep theirs in memory.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._postings = {}   # term -> {doc number: term frequency}
+        self._doc_num = {}    # key -> doc number
+        self._docs = {}       # doc number -> [key, length, stamp]
+        self._doc_terms = {}  # doc number -> set of its terms, so removal touches only those postings
+        self._next_num = 0
+        self._total_length = 0
+        self._lock_file = None
+        self.dirty = False
+        if path and os.path.exists(path):
+            self._load()
+
+    def __len__(self):
+        return len(self._doc_num)
+
+    def stamps(self):
+        """Stamp of every indexed document, by key."""
+        with self._lock:
+            return {doc[0]: doc[2] for doc in self._docs.values()}
+
+    def _add_terms(self, num, counts):
+        terms = self._doc_terms.setdefault(num, set())
+        for term, tf in counts.items():
+            postings = self._postings.setdefault(term, {})
+            postings[num] = postings.get(num, 0) + tf
+            terms.add(term)
+        added = sum(counts.values())
+        self._docs[num][1] += added
+        self._total_length += added
+
+    def _remove(self, key):
+        num = self._doc_num.pop(key, None)
+        if num is None:
+            return
+        _, length, _ = self._docs.pop(num)
+        for term in self._doc_terms.pop(num, ()):
+            postings = self._postings[term]
+            del postings[num]
+            if not postings:
+                del self._postings[term]
+        self._total_length -= length
+
+    def update(self, key, text, stamp=None):
+        """Index (or re-index) a document's full text."""
+        counts = Counter(tokenize(text))
+        with self._lock:
+            self._remove(key)
+            num = self._next_num
+            self._next_num += 1
+            self._doc_num[key] = num
+            self._docs[num] = [key, 0, stamp]
+            self._add_terms(num, counts)
+            self.dirty = True
+
+    def append(self, key, text, stamp=None, previous=None):
+        """Add text to the end of an indexed document without re-reading the rest.
+
+        With previous, the text is only added to the document indexed at that
+        stamp, and False is returned otherwise: the document was re-indexed
+        with the text already in it, or it missed an earlier change, and the
+        next full update brings it up to date.
+        """
+        counts = Counter(tokenize(text))
+        with self._lock:
+            num = self._doc_num.get(key)
+            if previous is not None and (num is None or self._docs[num][2] != previous):
+                return False
+            if num is None:
+                num = self._next_num
+                self._next_num += 1
+                self._doc_num[key] = num
+                self._docs[num] = [key, 0, stamp]
+            self._docs[num][2] = stamp
+            self._add_terms(num, counts)
+            self.dirty = True
+        return True
+
+    def touch(self, key, stamp):
+        """Record a new stamp for a document whose text did not change."""
+        with self._lock:
+            num = self._doc_num.get(key)
+            if num is not None:
+                self._docs[num][2] = stamp
+                self.dirty = True
+
+    def remove(self, key):
+        with self._lock:
+            if key in self._doc_num:
+                self._remove(key)
+                self.dirty = True
+
+    def search(self, query, limit=10):
+        """Keys of the best matching documents as (key, score), best first."""
+        terms = set(tokenize(query))
+        with self._lock:
+            n_docs = len(self._docs)
+            if not terms or not n_docs:
+                return []
+            avg_length = self._total_length / n_docs or 1.0
+            scores = {}
+            for term in terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+                for num, tf in postings.items():
+                    norm = BM25_K1 * (1 - BM25_B + BM25_B * self._docs[num][1] / avg_length)
+                    scores[num] = scores.get(num, 0.0) + idf * tf * (BM25_K1 + 1) / (tf + norm)
+            best = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+            return [(self._docs[num][0], score) for num, score in best]
+
+    def save(self):
+        """Write the index to its path (temp file + rename) if this process is its saver."""
+        if not self.path:
+            return
+        with self._save_lock:
+            if self._claim_path():
+                self._save()
+
+    def _claim_path(self):
+        """Whether this process holds the index's lock file, taking it if it is free.
+
+        The holder keeps it until it exits, so a worker process that dies
+        hands the saving over to the next one that tries.
+        """
+        if fcntl is None or self._lock_file is not None:
+            return True
+        lock_file = open(self.path + ".lock", "a")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        self._lock_file = lock_file
+        return True
+
+    def _save(self):
+        # Copy the tables under the lock; the file is built and compressed without it
+        with self._lock:
+            docs_table = {num: list(doc) for num, doc in self._docs.items()}
+            postings_table = [(term, dict(postings)) for term, postings in self._postings.items()]
+            self.dirty = False
+        # A JSON header with the documents and terms, followed by every posting
+        # list as raw uint32 doc numbers and then the matching term frequencies.
+        # Doc numbers are renumbered densely so the file carries no holes.
+        order = sorted(docs_table)
+        dense = {num: i for i, num in enumerate(order)}
+        header = {
+            "format": INDEX_FORMAT,
+            "byteorder": sys.byteorder,
+            "docs": [docs_table[num] for num in order],
+            "terms": [[term, len(postings)] for term, postings in postings_table],
+        }
+        docs, tfs = array.array("I"), array.array("I")
+        for _, postings in postings_table:
+            docs.extend(dense[num] for num in postings)
+            tfs.extend(postings.values())
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with gzip.open(tmp_path, "wb", compresslevel=1) as f:
+            f.write(json.dumps(header, separators=(",", ":")).encode("utf8") + b"\n")
+            f.write(docs.tobytes())
+            f.write(tfs.tobytes())
+        os.replace(tmp_path, self.path)
+
+    def _load(self):
+        try:
+            with gzip.open(self.path, "rb") as f:
+                header = json.loads(f.readline())
+                if header.get("format") != INDEX_FORMAT:
+                    return
+                docs, tfs = array.array("I"), array.array("I")
+                total = sum(n for _, n in header["terms"])
+                docs.frombytes(f.read(total * docs.itemsize))
+                tfs.frombytes(f.read(total * tfs.itemsize))
+        except (OSError, ValueError, EOFError):
+            # A damaged index is rebuilt from the sources by the next sync
+            return
+        if len(docs) != total or len(tfs) != total:
+            return
+        if header["byteorder"] != sys.byteorder:
+            docs.byteswap()
+            tfs.byteswap()
+        for num, (key, length, stamp) in enumerate(header["docs"]):
+            self._doc_num[key] = num
+            self._docs[num] = [key, length, stamp]
+            self._total_length += length
+        offset = 0
+        for term, n in header["terms"]:
+            postings = self._postings[term] = dict(zip(docs[offset:offset + n], tfs[offset:offset + n]))
+            for num in postings:
+                self._doc_terms.setdefault(num, set()).add(term)
+            offset += n
+        self._next_num = len(self._docs)
+
+
+def file_stamp(path):
+    stat = os.stat(path)
+    return f"{stat.st_mtime_ns}:{stat.st_size}"
+
+
+def text_files(folder):
+    return sorted(glob.glob(os.path.join(folder, "*.txt")))
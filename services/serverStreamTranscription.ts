@@ -0,0 +1,145 @@
+// Server Stream Transcription Service
+// Captures the microphone in the browser and streams binary 16 kHz int16 PCM
+// frames to the transcript server, which runs Vosk for this meeting
+import { useState, useEffect, useRef } from 'react';
+import { io, Socket } from 'socket.io-client';
+
+const TRANSCRIPT_SERVER_URL = 'http://localhost:5000';
+const TARGET_SAMPLE_RATE = 16000;
+const FRAME_SIZE = 4096;
+
+// Convert Float32 samples to int16 PCM, resampling to 16 kHz when the
+// browser ignored the requested AudioContext sample rate
+const toInt16Pcm = (input: Float32Array, inputRate: number): Int16Array => {
+  const ratio = inputRate / TARGET_SAMPLE_RATE;
+  const length = Math.floor(input.length / ratio);
+  const output = new Int16Array(length);
+  for (let i = 0; i < length; i++) {
+    const sample = Math.max(-1, Math.min(1, input[Math.floor(i * ratio)]));
+    output[i] = sample < 0 ? sample * 0x8000 : sample * 0x7fff;
+  }
+  return output;
+};
+
+export const useServerStreamTranscription = (meetingId: string) => {
+  const [isRecording, setIsRecording] = useState(false);
+  const [transcript, setTranscript] = useState('');
+  const [interimTranscript, setInterimTranscript] = useState('');
+  const [error, setError] = useState<string | null>(null);
+
+  const socketRef = useRef<Socket | null>(null);
+  const audioContextRef = useRef<AudioContext | null>(null);
+  const processorRef = useRef<ScriptProcessorNode | null>(null);
+  const streamRef = useRef<MediaStream | null>(null);
+  const lastSeqRef = useRef(0);
+
+  useEffect(() => {
+    return () => {
+      stopRecording();
+    };
+  }, []);
+
+  const startRecording = async () => {
+    try {
+      setError(null);
+      setTranscript('');
+      setInterimTranscript('');
+      lastSeqRef.current = 0;
+
+      const socket = io(TRANSCRIPT_SERVER_URL);
+      socketRef.current = socket;
+
+      // Segments carry increasing sequence numbers; anything already seen is skipped
+      const appendSegments = (segments: { seq: number; text: string }[]) => {
+        const fresh = segments.filter(segment => segment.seq > lastSeqRef.current);
+        if (fresh.length === 0) return;
+        lastSeqRef.current = fresh[fresh.length - 1].seq;
+        const text = fresh.map(segment => segment.text).join(' ');
+        setTranscript(prev => (prev ? prev + ' ' : '') + text);
+      };
+
+      socket.on('connect', () => {
+        // Rooms and the stream source are per connection, so (re)join this meeting's room and
+        // re-register as its audio source on every connect; frames are routed by connection
+        socket.emit('join_meeting', { meeting_id: meetingId });
+        socket.emit('start_transcription', { meeting_id: meetingId, source: 'stream' });
+        // After a reconnect, fetch only the segments missed while offline
+        if (lastSeqRef.current > 0) {
+          socket.emit('transcript_resync', { meeting_id: meetingId, since_seq: lastSeqRef.current });
+        }
+      });
+      socket.on('transcript_update', (data: any) => {
+        if (data.meeting_id !== meetingId) return;
+        appendSegments([data]);
+        setInterimTranscript('');
+      });
+      socket.on('transcript_segments', (data: any) => {
+        if (data.meeting_id !== meetingId) return;
+        appendSegments(data.segments);
+      });
+      socket.on('transcript_partial', (data: any) => {
+        if (data.meeting_id !== meetingId) return;
+        setInterimTranscript(data.partial_text);
+      });
+      socket.on('transcription_rejected', (data: any) => {
+        setError(data.message);
+        stopRecording();
+      });
+
+      const stream = await navigator.mediaDevices.getUserMedia({
+        audio: { channelCount: 1, echoCancellation: true, noiseSuppression: true }
+      });
+      streamRef.current = stream;
+
+      const audioContext = new AudioContext({ sampleRate: TARGET_SAMPLE_RATE });
+      audioContextRef.current = audioContext;
+      const sourceNode = audioContext.createMediaStreamSource(stream);
+      const processor = audioContext.createScriptProcessor(FRAME_SIZE, 1, 1);
+      processorRef.current = processor;
+
+      processor.onaudioprocess = (event) => {
+        const pcm = toInt16Pcm(event.inputBuffer.getChannelData(0), audioContext.sampleRate);
+        // Sent as a binary attachment, no base64 or JSON wrapping
+        socket.emit('audio_frame', pcm.buffer);
+      };
+
+      sourceNode.connect(processor);
+      processor.connect(audioContext.destination);
+      setIsRecording(true);
+    } catch (err) {
+      console.error('Failed to start server stream transcription:', err);
+      setError('Failed to start audio capture. Please check microphone permissions.');
+      stopRecording();
+    }
+  };
+
+  const stopRecording = () => {
+    if (processorRef.current) {
+      processorRef.current.disconnect();
+      processorRef.current = null;
+    }
+    if (audioContextRef.current) {
+      audioContextRef.current.close();
+      audioContextRef.current = null;
+    }
+    if (streamRef.current) {
+      streamRef.current.getTracks().forEach(track => track.stop());
+      streamRef.current = null;
+    }
+    if (socketRef.current) {
+      socketRef.current.emit('stop_transcription', { meeting_id: meetingId });
+      socketRef.current.disconnect();
+      socketRef.current = null;
+    }
+    setIsRecording(false);
+  };
+
+  return {
+    isRecording,
+    transcript,
+    interimTranscript,
+    error,
+    startRecording,
+    stopRecording
+  };
+};
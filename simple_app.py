@@ -1,16 +1,45 @@
 from flask import Flask, request, jsonify
 from flask_cors import CORS
+import gzip
+import hashlib
 import json
 import os
+import sqlite3
+import atexit
+import threading
+import time
 from datetime import datetime
+from meeting_store import MeetingStore
+from search_index import SearchIndex, file_stamp, snippet, text_files, tokenize
+from transcript_lines import SECONDS_PER_DAY, format_clock, parse_clock
 
 # Initialize Flask app
 app = Flask(__name__)
-CORS(app)
-
-# Simple in-memory storage (in production, use a database)
-meetings_db = {}
+# Cross-origin clients (the Vite frontend) need to read the pagination cursor and ETag
+CORS(app, expose_headers=["X-Next-Cursor", "ETag"])
+
+# Configuration
+MEETINGS_DB_PATH = os.environ.get("MEETINGS_DB", "meetings.db")
+DEFAULT_PAGE_SIZE = 100  # page size when a cursor is sent without a limit
+MAX_PAGE_SIZE = 500
+MEETING_LINK_FORMAT = "https://meet.example.com/{id}"  # link of a meeting created without one
+GZIP_MIN_BYTES = 1024  # smaller responses aren't worth compressing
+MAX_TRANSCRIPT_WAIT = 30.0  # longest long-poll on /transcript?wait=
+DB_WATCH_INTERVAL = 0.25  # how often each process checks for writes by other worker processes
+SSE_KEEPALIVE_SECONDS = 15.0
+# Saved transcripts and summaries written by the transcript server (app.py) are searchable too
+TRANSCRIPT_FOLDER = os.environ.get("TRANSCRIPT_FOLDER", "transcripts")
+SUMMARY_FOLDER = os.environ.get("SUMMARY_FOLDER", "meeting_summaries")
+SEARCH_INDEX_PATH = os.environ.get("SEARCH_INDEX", "search_index.json.gz")
+SEARCH_SYNC_INTERVAL = 30.0  # seconds between catching up with other workers and saving the index
+SEARCH_TEXT_FIELDS = ("title", "aiNotes", "manualNotes")
+
+# Meetings live in SQLite (WAL mode), so data survives restarts and worker processes share it
+meetings_db = MeetingStore(MEETINGS_DB_PATH)
 users_db = {}
+# Transcript readers waiting for new segments sleep on this until something is written
+transcript_appended = threading.Condition()
+transcript_generation = 0
 
 # Sample data with live transcript mock
 sample_meeting = {
@@ -223,9 +252,116 @@ sample_meeting_3 = {
     "manualNotes": "Client Demo Notes:\n- New dashboard interface\n- Real-time analytics (30s refresh)\n- Customizable widgets\n- Multi-format exports\n- Collaboration features\n- Mobile app updates\n- Deployment next week\n- Training session scheduled"
 }
 
-meetings_db["meeting_1"] = sample_meeting
-meetings_db["meeting_2"] = sample_meeting_2  
-meetings_db["meeting_3"] = sample_meeting_3
+# Seed the sample meetings into a fresh database
+if meetings_db.count() == 0:
+    for meeting in (sample_meeting, sample_meeting_2, sample_meeting_3):
+        try:
+            meetings_db.create(meeting, meeting_id=meeting["id"])
+        except sqlite3.IntegrityError:
+            pass  # another worker process seeded it first
+
+# ---------------- Search index ----------------
+
+search_index = SearchIndex(SEARCH_INDEX_PATH)
+
+def meeting_key(meeting_id):
+    return f"meeting:{meeting_id}"
+
+def meeting_text(meeting):
+    return "\n".join(meeting[field] for field in SEARCH_TEXT_FIELDS if meeting[field])
+
+def index_meeting(meeting, changed=SEARCH_TEXT_FIELDS):
+    """Re-index a meeting if searchable text changed, otherwise just record its version."""
+    if any(field in changed for field in SEARCH_TEXT_FIELDS):
+        search_index.update(meeting_key(meeting['id']), meeting_text(meeting), meeting['version'])
+    else:
+        search_index.touch(meeting_key(meeting['id']), meeting['version'])
+
+def search_folders():
+    return (("transcript", TRANSCRIPT_FOLDER), ("summary", SUMMARY_FOLDER))
+
+def sync_search_index():
+    """Index whatever changed in the database or the folders since the index was last updated."""
+    stamps = search_index.stamps()
+    versions = meetings_db.versions()
+    for meeting_id, version in versions.items():
+        if stamps.get(meeting_key(meeting_id)) != version:
+            meeting = meetings_db.get(meeting_id)
+            if meeting is not None:
+                index_meeting(meeting)
+
+    file_keys = set()
+    for kind, folder in search_folders():
+        for path in text_files(folder):
+            key = f"{kind}:{os.path.basename(path)}"
+            file_keys.add(key)
+            try:
+                stamp = file_stamp(path)
+                if stamps.get(key) != stamp:
+                    with open(path, encoding="utf8", errors="replace") as f:
+                        search_index.update(key, f.read(), stamp)
+            except OSError:
+                continue
+
+    for key in stamps:
+        kind, _, name = key.partition(":")
+        if (name not in versions) if kind == "meeting" else (key not in file_keys):
+            search_index.remove(key)
+
+def search_sync_loop():
+    while True:
+        time.sleep(SEARCH_SYNC_INTERVAL)
+        try:
+            sync_search_index()
+            if search_index.dirty:
+                search_index.save()
+        except Exception as e:
+            print(f"Search index sync failed: {e}")
+
+def save_search_index():
+    if search_index.dirty:
+        search_index.save()
+
+sync_search_index()
+save_search_index()
+atexit.register(save_search_index)
+threading.Thread(target=search_sync_loop, daemon=True).start()
+
+# ---------------- HTTP helpers ----------------
+
+def meeting_etag(meeting_id, version):
+    return f"{meeting_id}-{version}"
+
+def listing_etag(meetings, next_cursor):
+    """ETag of a meeting list, derived from the ids and versions it contains."""
+    digest = hashlib.sha1(request.query_string)
+    for meeting in meetings:
+        digest.update(f"|{meeting['id']}:{meeting['version']}".encode("utf8"))
+    digest.update(f"|{next_cursor}".encode("utf8"))
+    return digest.hexdigest()
+
+def parse_fields():
+    """The fields= query parameter as a list, or None for all fields."""
+    fields = request.args.get('fields')
+    if not fields:
+        return None
+    return [f.strip() for f in fields.split(',') if f.strip()]
+
+@app.after_request
+def compress_response(response):
+    """Gzip large responses for clients that accept it."""
+    if (response.direct_passthrough or response.is_streamed or response.status_code != 200 or
+            'Content-Encoding' in response.headers):
+        return response
+    response.vary.add('Accept-Encoding')
+    if 'gzip' not in request.accept_encodings:
+        return response
+    data = response.get_data()
+    if len(data) < GZIP_MIN_BYTES:
+        return response
+    response.set_data(gzip.compress(data, compresslevel=6))
+    response.headers['Content-Encoding'] = 'gzip'
+    return response
 
 # ---------------- API Routes ----------------
 
@@ -235,27 +371,62 @@ def health_check():
 
 @app.route('/api/meetings', methods=['GET'])
 def get_meetings():
-    """Get all meetings"""
-    return jsonify(list(meetings_db.values()))
+    """Get meetings ordered by date.
+
+    Optional query parameters: date_from, date_to (YYYY-MM-DD, inclusive),
+    status, participant, limit and cursor. Without limit or cursor every
+    matching meeting is returned. When more meetings match, the cursor for
+    the next page is returned in the X-Next-Cursor header.
+    fields=title,date,time,status returns only those fields (plus id and
+    version), leaving out the transcript and notes.
+    """
+    try:
+        limit = None
+        if 'limit' in request.args or 'cursor' in request.args:
+            limit = max(1, min(request.args.get('limit', DEFAULT_PAGE_SIZE, type=int), MAX_PAGE_SIZE))
+        meetings, next_cursor = meetings_db.list(
+            date_from=request.args.get('date_from'),
+            date_to=request.args.get('date_to'),
+            status=request.args.get('status'),
+            participant=request.args.get('participant'),
+            cursor=request.args.get('cursor'),
+            limit=limit,
+            fields=parse_fields(),
+        )
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    response = jsonify(meetings)
+    if next_cursor:
+        response.headers['X-Next-Cursor'] = next_cursor
+    response.set_etag(listing_etag(meetings, next_cursor), weak=True)
+    return response.make_conditional(request)
 
 @app.route('/api/meetings/<meeting_id>', methods=['GET'])
 def get_meeting(meeting_id):
     """Get a specific meeting by ID"""
-    if meeting_id in meetings_db:
-        return jsonify(meetings_db[meeting_id])
-    else:
+    # Check the version first so an unchanged meeting's transcript is never read
+    version = meetings_db.version(meeting_id)
+    if version is None:
         return jsonify({'error': 'Meeting not found'}), 404
+    if request.if_none_match.contains_weak(meeting_etag(meeting_id, version)):
+        response = app.response_class(status=304)
+        response.set_etag(meeting_etag(meeting_id, version), weak=True)
+        return response
+
+    meeting = meetings_db.get(meeting_id)
+    if meeting is None:
+        return jsonify({'error': 'Meeting not found'}), 404
+    response = jsonify(meeting)
+    response.set_etag(meeting_etag(meeting_id, meeting['version']), weak=True)
+    return response
 
 @app.route('/api/meetings', methods=['POST'])
 def create_meeting():
     """Create a new meeting"""
     data = request.get_json()
     
-    # Generate a simple ID
-    meeting_id = f"meeting_{len(meetings_db) + 1}"
-    
     meeting = {
-        "id": meeting_id,
         "title": data.get('title', 'New Meeting'),
         "description": data.get('description', ''),
         "date": data.get('date', datetime.now().strftime('%Y-%m-%d')),
@@ -263,110 +434,285 @@ def create_meeting():
         "duration": data.get('duration', 60),
         "participants": data.get('participants', []),
         "status": data.get('status', 'scheduled'),
-        "meetingLink": data.get('meetingLink', f"https://meet.example.com/{meeting_id}"),
+        "meetingLink": data.get('meetingLink', ''),
         "notes": data.get('notes', ''),
         "aiNotes": data.get('aiNotes', ''),
         "manualNotes": data.get('manualNotes', '')
     }
     
-    meetings_db[meeting_id] = meeting
+    # The store generates the meeting_<n> ID, and the default link from it
+    meeting = meetings_db.create(meeting, link_format=None if 'meetingLink' in data else MEETING_LINK_FORMAT)
+    index_meeting(meeting)
     return jsonify(meeting), 201
 
 @app.route('/api/meetings/<meeting_id>', methods=['PUT'])
 def update_meeting(meeting_id):
     """Update an existing meeting"""
-    if meeting_id not in meetings_db:
-        return jsonify({'error': 'Meeting not found'}), 404
-    
     data = request.get_json()
     
-    # Update the meeting
-    for key, value in data.items():
-        if key in meetings_db[meeting_id]:
-            meetings_db[meeting_id][key] = value
+    # Only known meeting fields are updated
+    meeting = meetings_db.update(meeting_id, data)
+    if meeting is None:
+        return jsonify({'error': 'Meeting not found'}), 404
+    index_meeting(meeting, changed=data)
     
-    return jsonify(meetings_db[meeting_id])
+    return jsonify(meeting)
 
 @app.route('/api/meetings/<meeting_id>', methods=['DELETE'])
 def delete_meeting(meeting_id):
     """Delete a meeting"""
-    if meeting_id not in meetings_db:
+    if not meetings_db.delete(meeting_id):
         return jsonify({'error': 'Meeting not found'}), 404
+    search_index.remove(meeting_key(meeting_id))
     
-    del meetings_db[meeting_id]
     return jsonify({'message': 'Meeting deleted successfully'})
 
 @app.route('/api/meetings/<meeting_id>/start', methods=['POST'])
 def start_meeting(meeting_id):
     """Start a meeting"""
-    if meeting_id not in meetings_db:
+    meeting = meetings_db.update(meeting_id, {'status': 'live'})
+    if meeting is None:
         return jsonify({'error': 'Meeting not found'}), 404
+    index_meeting(meeting, changed=('status',))
     
-    meetings_db[meeting_id]['status'] = 'live'
-    return jsonify(meetings_db[meeting_id])
+    return jsonify(meeting)
 
 @app.route('/api/meetings/<meeting_id>/end', methods=['POST'])
 def end_meeting(meeting_id):
     """End a meeting"""
-    if meeting_id not in meetings_db:
+    meeting = meetings_db.update(meeting_id, {'status': 'completed'})
+    if meeting is None:
         return jsonify({'error': 'Meeting not found'}), 404
+    index_meeting(meeting, changed=('status',))
     
-    meetings_db[meeting_id]['status'] = 'completed'
-    return jsonify(meetings_db[meeting_id])
+    return jsonify(meeting)
 
 @app.route('/api/meetings/<meeting_id>/notes', methods=['POST'])
 def update_meeting_notes(meeting_id):
     """Update meeting notes"""
-    if meeting_id not in meetings_db:
-        return jsonify({'error': 'Meeting not found'}), 404
-    
     data = request.get_json()
     notes_type = data.get('type', 'manual')  # 'manual' or 'ai'
     notes_content = data.get('notes', '')
     
+    fields = {}
     if notes_type == 'manual':
-        meetings_db[meeting_id]['manualNotes'] = notes_content
+        fields['manualNotes'] = notes_content
     elif notes_type == 'ai':
-        meetings_db[meeting_id]['aiNotes'] = notes_content
+        fields['aiNotes'] = notes_content
+    
+    meeting = meetings_db.update(meeting_id, fields)
+    if meeting is None:
+        return jsonify({'error': 'Meeting not found'}), 404
+    index_meeting(meeting, changed=fields)
     
-    return jsonify(meetings_db[meeting_id])
+    return jsonify(meeting)
+
+def notify_transcript_waiters():
+    global transcript_generation
+    with transcript_appended:
+        transcript_generation += 1
+        transcript_appended.notify_all()
+
+def watch_database():
+    """Wake waiting transcript readers when another worker process writes to the database."""
+    last_version = meetings_db.data_version()
+    while True:
+        time.sleep(DB_WATCH_INTERVAL)
+        version = meetings_db.data_version()
+        if version != last_version:
+            last_version = version
+            notify_transcript_waiters()
+
+threading.Thread(target=watch_database, daemon=True).start()
+
+def read_transcript(meeting_id, since, wait=0.0):
+    """Transcript since an offset, waiting up to `wait` seconds for new segments."""
+    deadline = time.monotonic() + wait
+    while True:
+        with transcript_appended:
+            generation = transcript_generation
+        transcript = meetings_db.transcript(meeting_id, since)
+        if transcript is None or transcript.get('segments', True):
+            return transcript
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return transcript
+        # Readers only re-query after a write, not on a timer
+        with transcript_appended:
+            transcript_appended.wait_for(lambda: transcript_generation != generation, remaining)
+
+def transcript_body(meeting_id, transcript):
+    body = {'meeting_id': meeting_id, **transcript}
+    if 'transcript' in body:
+        # Full transcript: the client is (re)starting from scratch
+        body['reset'] = True
+    return body
 
 @app.route('/api/meetings/<meeting_id>/transcript', methods=['GET'])
 def get_live_transcript(meeting_id):
-    """Get live transcript for a meeting"""
-    if meeting_id not in meetings_db:
+    """Get the live transcript for a meeting.
+
+    Without `since` the full transcript is returned with its `offset`.
+    With ?since=<offset> only the newer `segments` are returned; add
+    &wait=<seconds> to hold the request open until one arrives.
+    """
+    since = request.args.get('since', type=int)
+    wait = min(max(request.args.get('wait', 0.0, type=float), 0.0), MAX_TRANSCRIPT_WAIT)
+    transcript = read_transcript(meeting_id, since, wait if since is not None else 0.0)
+    if transcript is None:
         return jsonify({'error': 'Meeting not found'}), 404
     
-    meeting = meetings_db[meeting_id]
-    return jsonify({
-        'meeting_id': meeting_id,
-        'transcript': meeting.get('aiNotes', ''),
-        'status': meeting.get('status', 'scheduled'),
-        'participants': meeting.get('participants', [])
-    })
+    return jsonify(transcript_body(meeting_id, transcript))
+
+@app.route('/api/meetings/<meeting_id>/transcript/stream', methods=['GET'])
+def stream_live_transcript(meeting_id):
+    """Server-sent events with each new transcript segment.
+
+    Resumes after ?since=<offset> or the Last-Event-ID header. The stream
+    ends when the meeting is completed or deleted.
+    """
+    since = request.headers.get('Last-Event-ID', type=int)
+    if since is None:
+        since = request.args.get('since', type=int)
+    if meetings_db.version(meeting_id) is None:
+        return jsonify({'error': 'Meeting not found'}), 404
+
+    def events(since):
+        while True:
+            transcript = read_transcript(meeting_id, since, SSE_KEEPALIVE_SECONDS)
+            if transcript is None:
+                return
+            if 'transcript' in transcript:
+                yield (f"id: {transcript['offset']}\nevent: reset\n"
+                       f"data: {json.dumps(transcript_body(meeting_id, transcript))}\n\n")
+            for segment in transcript.get('segments', []):
+                yield f"id: {segment['offset']}\nevent: segment\ndata: {json.dumps(segment)}\n\n"
+            if not transcript.get('segments') and 'transcript' not in transcript:
+                if transcript['status'] == 'completed':
+                    return
+                yield ": keepalive\n\n"
+            since = transcript['offset']
+
+    return app.response_class(events(since), mimetype='text/event-stream',
+                              headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
 
 @app.route('/api/meetings/<meeting_id>/transcript/update', methods=['POST'])
 def update_live_transcript(meeting_id):
-    """Simulate live transcript updates"""
-    if meeting_id not in meetings_db:
-        return jsonify({'error': 'Meeting not found'}), 404
-    
+    """Append a segment to the live transcript; returns only the new offset"""
     data = request.get_json()
     new_text = data.get('text', '')
     
-    # Append new text to existing transcript
-    current_transcript = meetings_db[meeting_id].get('aiNotes', '')
-    if current_transcript:
-        meetings_db[meeting_id]['aiNotes'] = current_transcript + '\n\n' + new_text
-    else:
-        meetings_db[meeting_id]['aiNotes'] = new_text
+    offset = meetings_db.append_transcript(meeting_id, new_text)
+    if offset is None:
+        return jsonify({'error': 'Meeting not found'}), 404
+    notify_transcript_waiters()
+    # Only the new text is tokenized. It is added to the version this append followed; if the
+    # sync thread already re-indexed the meeting, or another process appended too, it is skipped
+    version = meetings_db.version(meeting_id)
+    if version is not None:
+        search_index.append(meeting_key(meeting_id), new_text, version, previous=version - 1)
     
     return jsonify({
         'meeting_id': meeting_id,
-        'transcript': meetings_db[meeting_id]['aiNotes'],
+        'offset': offset,
         'status': 'updated'
     })
 
+def lines_body(meeting_id, lines, limit):
+    """Response body for indexed transcript lines; `next` is the `after` value for the following page."""
+    for line in lines:
+        line['time'] = format_clock(line['start'])
+    return {
+        'meeting_id': meeting_id,
+        'lines': lines,
+        'next': lines[-1]['line'] if len(lines) == limit else None,
+    }
+
+def lines_page():
+    """The after= and limit= query parameters of the line endpoints."""
+    limit = request.args.get('limit', MAX_PAGE_SIZE, type=int)
+    return max(0, request.args.get('after', 0, type=int)), max(1, min(limit, MAX_PAGE_SIZE))
+
+@app.route('/api/meetings/<meeting_id>/speakers', methods=['GET'])
+def get_speakers(meeting_id):
+    """Talk time, line and word counts per speaker, from the transcript line index"""
+    speakers = meetings_db.speakers(meeting_id)
+    if speakers is None:
+        return jsonify({'error': 'Meeting not found'}), 404
+    return jsonify({'meeting_id': meeting_id, 'speakers': speakers})
+
+@app.route('/api/meetings/<meeting_id>/speakers/<speaker>/lines', methods=['GET'])
+def get_speaker_lines(meeting_id, speaker):
+    """One speaker's transcript lines; speaker is an id from /speakers or a name.
+
+    Optional: after=<line> and limit=<n> (max 500) to page through them.
+    """
+    after, limit = lines_page()
+    lines = meetings_db.lines(meeting_id, speaker=int(speaker) if speaker.isdigit() else speaker,
+                              after=after, limit=limit)
+    if lines is None:
+        return jsonify({'error': 'Meeting or speaker not found'}), 404
+    return jsonify(lines_body(meeting_id, lines, limit))
+
+@app.route('/api/meetings/<meeting_id>/transcript/lines', methods=['GET'])
+def get_transcript_lines(meeting_id):
+    """Transcript lines starting in a time range.
+
+    ?from=10:05 AM&to=10:10 AM (from inclusive, to exclusive; either may be
+    left out), plus after=<line> and limit=<n> to page through them. Times
+    are on the day the transcript starts; a to before from is the next day.
+    """
+    try:
+        start = parse_clock(request.args['from']) if request.args.get('from') else None
+        end = parse_clock(request.args['to']) if request.args.get('to') else None
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    if start is not None and end is not None and end <= start:
+        end += SECONDS_PER_DAY  # the range runs past midnight
+    after, limit = lines_page()
+    lines = meetings_db.lines(meeting_id, start=start, end=end, after=after, limit=limit)
+    if lines is None:
+        return jsonify({'error': 'Meeting not found'}), 404
+    return jsonify(lines_body(meeting_id, lines, limit))
+
+@app.route('/api/search', methods=['GET'])
+def search():
+    """Full-text search over meetings and saved transcripts and summaries.
+
+    ?q=<words>&limit=<n>; results are ranked best first, each with a snippet.
+    """
+    query = request.args.get('q', '').strip()
+    if not query:
+        return jsonify({'error': 'Query parameter q is required'}), 400
+    limit = max(1, min(request.args.get('limit', 10, type=int), 50))
+    terms = tokenize(query)
+
+    results = []
+    for key, score in search_index.search(query, limit):
+        kind, _, name = key.partition(':')
+        if kind == 'meeting':
+            meeting = meetings_db.get(name)
+            if meeting is None:
+                continue
+            results.append({
+                'type': 'meeting',
+                'id': name,
+                'title': meeting['title'],
+                'date': meeting['date'],
+                'score': round(score, 3),
+                'snippet': snippet(meeting_text(meeting), terms),
+            })
+        else:
+            folder = dict(search_folders())[kind]
+            try:
+                with open(os.path.join(folder, name), encoding='utf8', errors='replace') as f:
+                    text = f.read()
+            except OSError:
+                continue
+            results.append({'type': kind, 'file': name, 'score': round(score, 3), 'snippet': snippet(text, terms)})
+
+    return jsonify({'query': query, 'results': results})
+
 # ---------------- Entry Point ----------------
 if __name__ == "__main__":
     print("🚀 Starting AI Buddy API Server...")
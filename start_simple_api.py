@@ -2,10 +2,18 @@
 """
 Start the simple AI Buddy API server.
 This provides basic meeting management without complex transcription features.
+
+--production runs the API under gunicorn with gevent workers, so long-polls
+and transcript streams cost a green thread instead of an OS thread. Workers
+share the SQLite database. Install production_requirements.txt first.
 """
 
-import sys
+import argparse
+import importlib.util
 import os
+import sys
+
+PRODUCTION_MODULES = ["gunicorn", "gevent"]
 
 def check_python():
     """Check if Python is available."""
@@ -19,24 +27,80 @@ def check_python():
         print("Please run: pip install flask flask-cors")
         return False
 
+def check_production():
+    """Check for the production server dependencies, without importing them."""
+    missing = [name for name in PRODUCTION_MODULES if importlib.util.find_spec(name) is None]
+    if missing:
+        print(f"❌ Missing dependency for --production: {', '.join(missing)}")
+        print("Please run: pip install -r production_requirements.txt")
+        return False
+    return True
+
+def run_production(port, workers, worker_connections):
+    """Serve simple_app with gunicorn gevent workers."""
+    from gunicorn.app.base import BaseApplication
+
+    class SimpleAPIApplication(BaseApplication):
+        def __init__(self, options):
+            self.options = options
+            super().__init__()
+
+        def load_config(self):
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            # Imported in each worker, after gevent has patched the standard library
+            from simple_app import app
+            return app
+
+    SimpleAPIApplication({
+        "bind": f"0.0.0.0:{port}",
+        "workers": workers,
+        "worker_class": "gevent",
+        "worker_connections": worker_connections,
+        # Streams and long-polls stay open; async workers only use this for heartbeats
+        "timeout": 60,
+        "graceful_timeout": 10,
+    }).run()
+
 def main():
+    parser = argparse.ArgumentParser(description="Start the AI Buddy simple API server.")
+    parser.add_argument("--port", type=int, default=5000, help="port to listen on")
+    parser.add_argument("--production", action="store_true",
+                        help="serve with gunicorn gevent workers instead of the development server")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="worker processes with --production (default: one per CPU core)")
+    parser.add_argument("--worker-connections", type=int, default=1000,
+                        help="concurrent connections per worker with --production (default: 1000)")
+    args = parser.parse_args()
+
     print("🚀 Starting AI Buddy Simple API Server...")
-    
+
     if not check_python():
         print("\n📋 Setup Instructions:")
         print("1. Install Python from https://www.python.org/downloads/")
         print("2. Run: pip install flask flask-cors")
         print("3. Run: python start_simple_api.py")
         sys.exit(1)
-    
-    print("📡 API will be available at: http://localhost:5000")
-    print("🔗 Health check: http://localhost:5000/api/health")
-    print("📋 Meetings API: http://localhost:5000/api/meetings")
+
+    if args.production and not check_production():
+        sys.exit(1)
+
+    print(f"📡 API will be available at: http://localhost:{args.port}")
+    print(f"🔗 Health check: http://localhost:{args.port}/api/health")
+    print(f"📋 Meetings API: http://localhost:{args.port}/api/meetings")
     print("Press Ctrl+C to stop the server")
-    
+
+    if args.production:
+        print(f"⚙️  gunicorn: {args.workers} gevent worker(s), "
+              f"{args.worker_connections} connections each")
+        run_production(args.port, args.workers, args.worker_connections)
+        return
+
     # Import and run the simple app
     from simple_app import app
-    app.run(host='0.0.0.0', port=5000, debug=True)
+    app.run(host='0.0.0.0', port=args.port, debug=True)
 
 if __name__ == "__main__":
     main()
@@ -2,26 +2,42 @@
 """
 Start the transcript server for live meeting transcription.
 Make sure to install dependencies first: pip install -r requirements.txt
+
+By default NLTK data and the Vosk model are loaded on the first transcription
+request, so the server starts quickly and without network access.
+Use --preload to load everything before accepting connections.
+
+--production serves with gevent (or eventlet) instead of the Werkzeug
+development server: every Socket.IO connection is a green thread and the
+recognizers run on a pool of OS threads. Install production_requirements.txt.
 """
 
+import argparse
+import importlib.util
 import os
 import sys
+import time
+
+STARTED = time.perf_counter()
 
-def check_dependencies():
-    """Check if required dependencies are installed."""
-    try:
-        import flask
-        import flask_cors
-        import flask_socketio
-        import sounddevice
-        import vosk
-        import nltk
-        print("✅ All dependencies are installed")
-        return True
-    except ImportError as e:
-        print(f"❌ Missing dependency: {e}")
+REQUIRED_MODULES = ["flask", "flask_cors", "flask_socketio", "sounddevice", "vosk", "nltk"]
+PRODUCTION_MODULES = {"gevent": ["gevent", "geventwebsocket"], "eventlet": ["eventlet"]}
+
+def check_dependencies(async_mode=None):
+    """Check if required dependencies are installed, without importing them."""
+    missing = [name for name in REQUIRED_MODULES if importlib.util.find_spec(name) is None]
+    if missing:
+        print(f"❌ Missing dependency: {', '.join(missing)}")
         print("Please run: pip install -r requirements.txt")
         return False
+    missing = [name for name in PRODUCTION_MODULES.get(async_mode, [])
+               if importlib.util.find_spec(name) is None]
+    if missing:
+        print(f"❌ Missing dependency for --production: {', '.join(missing)}")
+        print("Please run: pip install -r production_requirements.txt")
+        return False
+    print("✅ All dependencies are installed")
+    return True
 
 def check_vosk_model():
     """Check if Vosk model is available."""
@@ -34,22 +50,92 @@ def check_vosk_model():
     print("✅ Vosk model found")
     return True
 
+def preload(model_path, sample_rate):
+    """Load NLTK data, the Vosk model and the audio backend before serving."""
+    from summarization import ensure_nltk_data, stop_words, tokenizers
+    from vosk_models import registry as model_registry
+
+    ensure_nltk_data()
+    tokenizers()
+    stop_words()
+    model_registry.preload([model_path], sample_rate)
+    import sounddevice  # noqa: F401  (loads PortAudio)
+
+def enable_async_mode(async_mode, recognizer_threads):
+    """Patch the standard library for green threads; must run before the app is imported."""
+    os.environ["SOCKETIO_ASYNC_MODE"] = async_mode
+    if async_mode == "gevent":
+        from gevent import monkey
+        monkey.patch_all()
+        import gevent
+        gevent.get_hub().threadpool.maxsize = recognizer_threads
+    else:
+        os.environ.setdefault("EVENTLET_THREADPOOL_SIZE", str(recognizer_threads))
+        import eventlet
+        eventlet.monkey_patch()
+
 def main():
+    parser = argparse.ArgumentParser(description="Start the AI Buddy transcript server.")
+    parser.add_argument("--preload", action="store_true",
+                        help="load NLTK data and the Vosk model before accepting connections")
+    parser.add_argument("--download-nltk", action="store_true",
+                        help="download missing NLTK data (punkt, stopwords) into NLTK_DATA_DIR")
+    parser.add_argument("--port", type=int, default=5000, help="port to listen on")
+    parser.add_argument("--production", action="store_true",
+                        help="serve with a cooperative async server instead of the development server")
+    parser.add_argument("--async-mode", choices=sorted(PRODUCTION_MODULES), default="gevent",
+                        help="async server used with --production (default: gevent)")
+    parser.add_argument("--recognizer-threads", type=int,
+                        default=int(os.environ.get("MAX_TRANSCRIPTION_SESSIONS", 4)),
+                        help="OS threads running recognizers with --production "
+                             "(default: MAX_TRANSCRIPTION_SESSIONS)")
+    args = parser.parse_args()
+
     print("🎤 Starting AI Buddy Transcript Server...")
-    
-    if not check_dependencies():
+
+    if not check_dependencies(args.async_mode if args.production else None):
         sys.exit(1)
-    
+
     if not check_vosk_model():
         sys.exit(1)
-    
-    print("🚀 Starting server on http://localhost:5000")
-    print("📡 WebSocket endpoint: ws://localhost:5000")
-    print("Press Ctrl+C to stop the server")
-    
+
+    if args.production:
+        enable_async_mode(args.async_mode, args.recognizer_threads)
+
+    if args.download_nltk:
+        # Read by summarization when the app imports it
+        os.environ["NLTK_DOWNLOAD"] = "1"
+
     # Import and run the app
-    from app import socketio, app
-    socketio.run(app, host='0.0.0.0', port=5000, debug=True)
+    import_started = time.perf_counter()
+    from app import socketio, app, MODEL_PATH, SAMPLE_RATE, recover_transcripts
+    import_seconds = time.perf_counter() - import_started
+
+    # Turn journals left by a crashed run into transcripts before new meetings start
+    recover_transcripts()
+
+    preload_seconds = 0.0
+    if args.preload:
+        preload_started = time.perf_counter()
+        preload(MODEL_PATH, SAMPLE_RATE)
+        preload_seconds = time.perf_counter() - preload_started
+
+    total_seconds = time.perf_counter() - STARTED
+    print(f"⏱️  Startup took {total_seconds * 1000:.0f} ms "
+          f"(app import {import_seconds * 1000:.0f} ms, preload {preload_seconds * 1000:.0f} ms)")
+    if not args.preload:
+        print("ℹ️  NLTK data and the Vosk model will load on the first transcription request")
+
+    print(f"🚀 Starting server on http://localhost:{args.port}"
+          + (f" ({args.async_mode})" if args.production else " (development server)"))
+    print(f"📡 WebSocket endpoint: ws://localhost:{args.port}")
+    print("Press Ctrl+C to stop the server")
+
+    if args.production:
+        # One process: sessions, rooms and segment logs live in this process's memory
+        socketio.run(app, host='0.0.0.0', port=args.port, debug=False, log_output=False)
+    else:
+        socketio.run(app, host='0.0.0.0', port=args.port, debug=True)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,172 @@
+"""
+The single-transcript summarizer and the pieces it shares with the live and
+batch summarizers: lazy access to the NLTK tokenizers and stop words, the
+action/decision vocabularies and the text layout of a structured summary.
+"""
+
+import heapq
+import os
+import re
+import threading
+
+ACTION_ITEM_TERMS = ['action', 'task', r'follow[- ]?up', 'responsible', 'assign']
+DECISION_TERMS = ['decision', 'decided', 'approved', 'agreement']
+
+
+def _extra_terms(name):
+    """Comma-separated words or phrases added to a vocabulary through the environment."""
+    return [re.escape(term.strip()) for term in os.environ.get(name, "").split(",") if term.strip()]
+
+
+ACTION_ITEM_TERMS += _extra_terms("ACTION_ITEM_TERMS")
+DECISION_TERMS += _extra_terms("DECISION_TERMS")
+
+# Both vocabularies in one pattern, so a sentence is classified in a single scan
+ITEM_PATTERN = re.compile(r'\b(?:(?P<action>' + '|'.join(ACTION_ITEM_TERMS) + r')|(?P<decision>' +
+                          '|'.join(DECISION_TERMS) + r'))\b', re.IGNORECASE)
+
+# Sentences longer than this never become key points
+MAX_SENTENCE_WORDS = 50
+
+NO_CONTENT_SUMMARY = "No meaningful content to summarize."
+
+# NLTK data is looked up here first
+NLTK_DATA_DIR = os.path.abspath(os.environ.get("NLTK_DATA_DIR", "nltk_data"))
+# Set NLTK_DOWNLOAD=1 to fetch missing resources into NLTK_DATA_DIR on first use; by default
+# nothing is downloaded and a missing resource is reported with the command that installs it
+NLTK_DOWNLOAD = os.environ.get("NLTK_DOWNLOAD", "") == "1"
+NLTK_RESOURCES = {
+    'punkt': 'tokenizers/punkt',
+    'stopwords': 'corpora/stopwords',
+}
+
+_nltk_lock = threading.Lock()
+_nltk_ready = False
+_stop_words = None
+
+
+def ensure_nltk_data():
+    """Check the NLTK resources once per process; missing ones are downloaded only with NLTK_DOWNLOAD."""
+    global _nltk_ready
+    if _nltk_ready:
+        return
+    with _nltk_lock:
+        if _nltk_ready:
+            return
+        import nltk
+
+        if NLTK_DATA_DIR not in nltk.data.path:
+            nltk.data.path.insert(0, NLTK_DATA_DIR)
+        for name, resource in NLTK_RESOURCES.items():
+            try:
+                nltk.data.find(resource)
+            except LookupError:
+                if not NLTK_DOWNLOAD:
+                    raise LookupError(f"NLTK resource '{name}' not found. Install it with: "
+                                      f"python -m nltk.downloader -d {NLTK_DATA_DIR} {name} "
+                                      f"(or set NLTK_DOWNLOAD=1)")
+                print(f"📥 Downloading NLTK resource '{name}' to {NLTK_DATA_DIR}")
+                if not nltk.download(name, download_dir=NLTK_DATA_DIR, quiet=True):
+                    raise LookupError(f"Could not download NLTK resource '{name}'")
+        _nltk_ready = True
+
+
+def tokenizers():
+    """Return (sent_tokenize, word_tokenize), importing NLTK on first use."""
+    ensure_nltk_data()
+    from nltk.tokenize import sent_tokenize, word_tokenize
+    return sent_tokenize, word_tokenize
+
+
+def stop_words():
+    """English stop words, built once per process."""
+    global _stop_words
+    if _stop_words is None:
+        ensure_nltk_data()
+        from nltk.corpus import stopwords
+        _stop_words = frozenset(stopwords.words('english'))
+    return _stop_words
+
+
+def classify_sentence(sentence):
+    """Which of 'action' and 'decision' a sentence is, from one scan of ITEM_PATTERN."""
+    kinds = set()
+    for match in ITEM_PATTERN.finditer(sentence):
+        kinds.add(match.lastgroup)
+        if len(kinds) == 2:
+            break
+    return kinds
+
+
+def split_items(sentences):
+    """(action_items, decisions) among sentences, in order."""
+    action_items, decisions = [], []
+    for sentence in sentences:
+        kinds = classify_sentence(sentence)
+        if 'action' in kinds:
+            action_items.append(sentence)
+        if 'decision' in kinds:
+            decisions.append(sentence)
+    return action_items, decisions
+
+
+def format_summary(key_points, action_items, decisions):
+    """Render the structured summary text saved to SUMMARY_FOLDER."""
+    summary_text = "📝 Meeting Summary\n\n"
+    summary_text += "Key Points:\n"
+    for s in key_points:
+        summary_text += f"- {s}\n"
+
+    if action_items:
+        summary_text += "\nAction Items:\n"
+        for a in action_items:
+            summary_text += f"- {a}\n"
+
+    if decisions:
+        summary_text += "\nDecisions Made:\n"
+        for d in decisions:
+            summary_text += f"- {d}\n"
+
+    return summary_text
+
+
+def summarize_text(text, max_sentences=10):
+    """Structured summary of an already-cleaned transcript.
+
+    The server and the finalize workers both summarize through this, so a
+    summary cached on disk by one is the same text the other would compute.
+    """
+    sent_tokenize, word_tokenize = tokenizers()
+    sentences = sent_tokenize(text)
+    stop = stop_words()
+
+    # Each sentence is tokenized once, as in summarize_batch and LiveSummarizer. Tokenizing
+    # the lowercased text as a whole would split sentences differently around abbreviations.
+    sentence_words = [[word for word in word_tokenize(sent.lower())
+                       if word.isalpha() and word not in stop]
+                      for sent in sentences]
+
+    # Score sentences by word frequency
+    word_freq = {}
+    for words in sentence_words:
+        for word in words:
+            word_freq[word] = word_freq.get(word, 0) + 1
+
+    if not word_freq:
+        return NO_CONTENT_SUMMARY
+
+    max_freq = max(word_freq.values())
+    for word in word_freq:
+        word_freq[word] /= max_freq
+
+    sentence_scores = {}
+    for sent, words in zip(sentences, sentence_words):
+        if len(sent.split()) <= MAX_SENTENCE_WORDS:
+            for word in words:
+                sentence_scores[sent] = sentence_scores.get(sent, 0) + word_freq[word]
+
+    top_sentences = heapq.nlargest(max_sentences, sentence_scores, key=sentence_scores.get)
+
+    # Structured summary
+    action_items, decisions = split_items(sentences)
+    return format_summary(top_sentences, action_items, decisions)
@@ -0,0 +1,103 @@
+"""
+Content-addressed cache of structured summaries.
+A summary is stored under a hash of the cleaned transcript and the summary
+parameters, so the same meeting summarized again (dashboard, notes page,
+re-exports) is a lookup instead of a full NLTK pass. A bounded in-memory LRU
+sits on top of an on-disk tier inside SUMMARY_FOLDER that survives restarts.
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+from summarization import ITEM_PATTERN
+
+# Bump when the summarizer's output changes so older cached summaries are not served
+SUMMARY_FORMAT = 2
+
+CACHE_DIR_NAME = ".cache"
+
+
+def summary_key(cleaned_text, max_sentences):
+    # The action/decision vocabulary is configurable, and changes which sentences are listed
+    params = f"{SUMMARY_FORMAT}\0{ITEM_PATTERN.pattern}\0{max_sentences}\0"
+    digest = hashlib.sha256(params.encode("utf8"))
+    digest.update(cleaned_text.encode("utf8"))
+    return digest.hexdigest()
+
+
+class SummaryCache:
+    """Summaries by content key: memory LRU first, then files, then summarize(text, max_sentences)."""
+
+    def __init__(self, folder, summarize, max_entries=64):
+        self.folder = os.path.join(folder, CACHE_DIR_NAME) if folder else None
+        self.summarize = summarize
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()
+        self.hits = {"memory": 0, "disk": 0}
+        self.misses = 0
+
+    def _path(self, key):
+        return os.path.join(self.folder, key[:2], key + ".txt")
+
+    def get(self, cleaned_text, max_sentences):
+        """Return (summary, tier) where tier is 'memory', 'disk' or 'computed'."""
+        key = summary_key(cleaned_text, max_sentences)
+        with self._lock:
+            summary = self._memory.get(key)
+            if summary is not None:
+                self._memory.move_to_end(key)
+                self.hits["memory"] += 1
+                return summary, "memory"
+
+        tier = "disk"
+        summary = self._read(key)
+        if summary is None:
+            tier = "computed"
+            summary = self.summarize(cleaned_text, max_sentences)
+            self._write(key, summary)
+
+        with self._lock:
+            if tier == "disk":
+                self.hits["disk"] += 1
+            else:
+                self.misses += 1
+            self._memory[key] = summary
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+        return summary, tier
+
+    def _read(self, key):
+        if not self.folder:
+            return None
+        try:
+            with open(self._path(key), encoding="utf8") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _write(self, key, summary):
+        if not self.folder:
+            return
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp_path, "w", encoding="utf8") as f:
+                f.write(summary)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            # The memory tier still has it; a read-only summary folder only costs the disk tier
+            print(f"Could not cache summary {key[:12]}: {e}")
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._memory),
+                "max_entries": self.max_entries,
+                "hits": dict(self.hits),
+                "misses": self.misses,
+            }
@@ -0,0 +1,231 @@
+import contextlib
+import importlib
+import json
+import os
+import sys
+import time
+import types
+
+import pytest
+
+
+@pytest.fixture(scope="module")
+def app_module(tmp_path_factory):
+    # app.py creates its transcript and summary folders in the working directory
+    cwd = os.getcwd()
+    os.chdir(tmp_path_factory.mktemp("transcript_server"))
+    os.environ["FINALIZE_WORKERS"] = "0"
+    try:
+        yield importlib.import_module("app")
+    finally:
+        os.chdir(cwd)
+
+
+@pytest.fixture
+def client(app_module):
+    return app_module.app.test_client()
+
+
+def test_batch_summary_rejects_invalid_max_sentences(client):
+    for value in ("abc", 0, None):
+        response = client.post("/api/summaries/batch",
+                               json={'transcripts': [{'id': 1, 'text': "Budget review."}],
+                                     'max_sentences': value})
+        assert response.status_code == 400
+
+
+def test_batch_summary_with_a_content_free_transcript(client):
+    response = client.post("/api/summaries/batch", json={'transcripts': [
+        {'id': 'a', 'text': "the and of"},
+        {'id': 'b', 'text': "We decided to approve the marketing budget."},
+    ]})
+    assert response.status_code == 200
+    summaries = {s['id']: s['summary'] for s in response.get_json()['summaries']}
+    assert summaries['a'] == "No meaningful content to summarize."
+    assert "Decisions Made:" in summaries['b']
+
+
+def test_batch_summary_matches_structured_summary_around_abbreviations(app_module):
+    from batch_summary import summarize_batch
+
+    texts = [
+        "Dr. Smith reviewed the budget e.g. travel and hiring. We decided to approve it. "
+        "Mr. Jones will follow up with finance i.e. the U.S. team.",
+        "The plan vs. the budget was discussed at 3 p.m. today. Action: Dr. Lee sends the deck.",
+    ]
+    expected = [app_module.structured_summary(text, 5, cleaned=True) for text in texts]
+    assert summarize_batch(texts, 5) == expected
+
+
+class CountingRecognizer:
+    """Ends an utterance on every block it is given."""
+
+    def __init__(self):
+        self.blocks = 0
+
+    def AcceptWaveform(self, data):
+        self.blocks += 1
+        return True
+
+    def Result(self):
+        return json.dumps({'text': f"block {self.blocks}"})
+
+    def PartialResult(self):
+        return json.dumps({'partial': ""})
+
+    def FinalResult(self):
+        return json.dumps({'text': ""})
+
+
+class ScriptedRecognizer:
+    """Plays back one (kind, text) step per block: 'partial', 'final' or None for silence."""
+
+    def __init__(self, steps=()):
+        self.steps = list(steps)
+        self.step = (None, "")
+
+    def AcceptWaveform(self, data):
+        self.step = self.steps.pop(0) if self.steps else (None, "")
+        return self.step[0] == 'final'
+
+    def Result(self):
+        return json.dumps({'text': self.step[1]})
+
+    def PartialResult(self):
+        return json.dumps({'partial': self.step[1] if self.step[0] == 'partial' else ""})
+
+    def FinalResult(self):
+        return json.dumps({'text': ""})
+
+
+class StubRegistry:
+    def __init__(self, make=CountingRecognizer, make_extra=ScriptedRecognizer):
+        self.make = make
+        self.make_extra = make_extra
+
+    @contextlib.contextmanager
+    def recognizer(self, model_path, sample_rate):
+        yield self.make()
+
+    def acquire(self, model_path, sample_rate):
+        return self.make_extra()
+
+    def release(self, rec):
+        pass
+
+
+def test_stopped_stream_session_transcribes_its_queued_audio(app_module, monkeypatch):
+    from transcript_journal import read_segments
+    from transcription_sessions import TranscriptionSession
+
+    journals = []
+    monkeypatch.setattr(app_module, 'model_registry', StubRegistry())
+    monkeypatch.setattr(app_module, 'VAD_ENABLED', False)
+    monkeypatch.setattr(app_module, 'finalize_in_background',
+                        lambda meeting_id, journal_file: journals.append(journal_file))
+
+    session = TranscriptionSession('drain_test', source='stream')
+    for _ in range(5):
+        session.feed_audio(b"\x10\x00" * 4000)
+    session.stop()
+    app_module.start_live_transcription(session)
+
+    texts = [segment['text'] for segment in read_segments(journals[0])]
+    assert texts == [f"block {n}" for n in range(1, 6)]
+
+
+def test_finalize_job_stage_timings_reach_metrics(app_module, client, tmp_path):
+    from transcript_journal import TranscriptJournal
+
+    client.get("/metrics")  # stage timings are only recorded while something scrapes
+    journal_file = str(tmp_path / "meeting_metrics.journal")
+    journal = TranscriptJournal(journal_file)
+    journal.append({'seq': 1, 'text': "The metrics stage review approved the rollout.",
+                    'timestamp': 0.0})
+    journal.close()
+    job_id = app_module.finalize_in_background('metrics_test', journal_file)
+    assert app_module.finalize_jobs.get(job_id)['status'] == 'completed'
+
+    body = client.get("/metrics").get_data(as_text=True)
+    for stage in ('structured_summary', 'file_write', 'finalize_job'):
+        assert f'transcript_stage_duration_seconds_count{{stage="{stage}"}}' in body
+
+
+def test_second_stream_sender_is_rejected_and_stays_a_listener(app_module, monkeypatch):
+    monkeypatch.setattr(app_module, 'model_registry', StubRegistry())
+    monkeypatch.setattr(app_module, 'VAD_ENABLED', False)
+    source = app_module.socketio.test_client(app_module.app)
+    listener = app_module.socketio.test_client(app_module.app)
+    try:
+        source.emit('start_transcription', {'meeting_id': 'one_source', 'source': 'stream'})
+        listener.emit('start_transcription', {'meeting_id': 'one_source', 'source': 'stream'})
+        rejected = [event for event in listener.get_received() if event['name'] == 'transcription_rejected']
+        assert rejected and "Another client" in rejected[0]['args'][0]['message']
+        assert list(app_module.stream_clients.values()).count('one_source') == 1
+
+        session = app_module.session_manager.get('one_source')
+        source.emit('audio_frame', b"\x10\x00" * 4000)
+        source.emit('stop_transcription', {'meeting_id': 'one_source'})
+        session.thread.join(10)
+        # The listener still hears the meeting it tried to stream
+        names = [event['name'] for event in listener.get_received()]
+        assert 'transcript_update' in names and 'transcript_complete' in names
+    finally:
+        source.disconnect()
+        listener.disconnect()
+
+
+def test_dual_lane_partials_restart_after_that_lanes_final(app_module, monkeypatch):
+    from transcription_sessions import TranscriptionSession
+
+    steps = [('partial', "hello"), ('final', "hello"), ('partial', "hello"), ('final', "hello")]
+    monkeypatch.setattr(app_module, 'model_registry', StubRegistry(lambda: ScriptedRecognizer(steps)))
+    monkeypatch.setattr(app_module, 'VAD_ENABLED', False)
+    monkeypatch.setattr(app_module, 'MAX_PARTIAL_EMITS_PER_SECOND', 0)
+    monkeypatch.setattr(app_module, 'finalize_in_background', lambda meeting_id, journal_file: None)
+    monkeypatch.setitem(sys.modules, 'sounddevice',
+                        types.SimpleNamespace(RawInputStream=lambda **kwargs: contextlib.nullcontext()))
+    emitted = []
+    monkeypatch.setattr(app_module.socketio, 'emit',
+                        lambda event, data=None, **kwargs: emitted.append((event, data)))
+
+    session = TranscriptionSession('dual_partials', source='dual', channels=2)
+    for _ in steps:
+        session.audio_queue.put((time.monotonic(), b"\x10\x00" * 2 * 4000))
+    session.stop()
+    app_module.start_live_transcription(session)
+
+    partials = [data['partial_text'] for event, data in emitted if event == 'transcript_partial']
+    finals = [data['text'] for event, data in emitted if event == 'transcript_update']
+    assert partials == ["[You] hello", "[You] hello"]
+    assert finals == ["[You] hello", "[You] hello"]
+
+
+def test_resync_sends_only_the_missed_segments(app_module):
+    log = app_module.transcript_segments.open('resync_test')
+    for text in ("one", "two", "three"):
+        log.append(text)
+    client = app_module.socketio.test_client(app_module.app)
+    try:
+        client.emit('transcript_resync', {'meeting_id': 'resync_test', 'since_seq': 1})
+        reply = [event['args'][0] for event in client.get_received() if event['name'] == 'transcript_segments']
+    finally:
+        client.disconnect()
+        app_module.transcript_segments.finish('resync_test')
+    assert [segment['seq'] for segment in reply[0]['segments']] == [2, 3]
+    assert reply[0]['last_seq'] == 3
+
+
+def test_meeting_summary_is_served_from_the_cache(app_module, client):
+    log = app_module.transcript_segments.open('summary_test')
+    log.append("The cache review decided to keep the disk tier.")
+    app_module.transcript_segments.finish('summary_test')
+
+    first = client.get("/api/meetings/summary_test/summary?max_sentences=3")
+    assert first.status_code == 200
+    assert "Decisions Made:" in first.get_json()['summary']
+    assert client.get("/api/meetings/summary_test/summary?max_sentences=3").get_json()['cache'] == 'memory'
+    cached = client.get("/api/meetings/summary_test/summary?max_sentences=3",
+                        headers={'If-None-Match': first.headers['ETag']})
+    assert cached.status_code == 304
+    assert client.get("/api/meetings/unknown/summary").status_code == 404
@@ -0,0 +1,53 @@
+import queue
+
+import numpy as np
+import pytest
+
+from audio_buffer import AudioRingBuffer
+
+BLOCK = 16000  # 0.5 s of 16 kHz int16 audio
+
+
+def loud(n=BLOCK):
+    return (np.full(n // 2, 3000)).astype("<i2").tobytes()
+
+
+def quiet(n=BLOCK):
+    return bytes(n)
+
+
+def test_drop_oldest_keeps_the_newest_audio():
+    buffer = AudioRingBuffer(max_seconds=1.0)
+    for n in range(3):
+        buffer.put((n, loud()))
+    assert buffer.buffered_seconds == 1.0
+    assert buffer.dropped_seconds == 0.5
+    assert [buffer.get(timeout=0)[0] for _ in range(2)] == [1, 2]
+    with pytest.raises(queue.Empty):
+        buffer.get(timeout=0)
+
+
+def test_skip_silence_drops_silent_blocks_first():
+    buffer = AudioRingBuffer(max_seconds=1.0, policy="skip_silence")
+    buffer.put((0, loud()))
+    buffer.put((1, quiet()))
+    buffer.put((2, loud()))
+    assert [buffer.get(timeout=0)[0] for _ in range(2)] == [0, 2]
+
+
+def test_fallback_model_degrades_until_the_buffer_drains():
+    buffer = AudioRingBuffer(max_seconds=2.0, policy="fallback_model")
+    buffer.put((0, loud()))
+    assert not buffer.degraded
+    buffer.put((1, loud()))
+    assert buffer.degraded
+    buffer.get(timeout=0)
+    assert buffer.degraded
+    buffer.get(timeout=0)
+    assert not buffer.degraded
+    assert buffer.dropped_seconds == 0
+
+
+def test_unknown_policy_is_rejected():
+    with pytest.raises(ValueError):
+        AudioRingBuffer(policy="grow")
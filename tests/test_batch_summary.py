@@ -0,0 +1,12 @@
+from batch_summary import summarize_batch
+from summarization import NO_CONTENT_SUMMARY
+
+
+def test_batch_without_any_content_words():
+    assert summarize_batch(["", "the and of"]) == [NO_CONTENT_SUMMARY, NO_CONTENT_SUMMARY]
+
+
+def test_empty_document_does_not_fail_the_batch():
+    summaries = summarize_batch(["the and of", "We decided to ship the budget review. Dr. Smith approved it."])
+    assert summaries[0] == NO_CONTENT_SUMMARY
+    assert "Decisions Made:" in summaries[1]
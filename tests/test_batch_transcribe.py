@@ -0,0 +1,45 @@
+import wave
+
+import numpy as np
+
+from batch_transcribe import MappedWav, split_at_silence
+
+SAMPLE_RATE = 16000
+
+
+def tone(seconds, level=3000):
+    t = np.arange(int(seconds * SAMPLE_RATE))
+    return (level * np.sin(2 * np.pi * 220 * t / SAMPLE_RATE)).astype("<i2")
+
+
+def silence(seconds):
+    return np.zeros(int(seconds * SAMPLE_RATE), dtype="<i2")
+
+
+def write_wav(path, samples, channels=1):
+    with wave.open(str(path), "wb") as f:
+        f.setnchannels(channels)
+        f.setsampwidth(2)
+        f.setframerate(SAMPLE_RATE)
+        f.writeframes(samples.tobytes())
+
+
+def test_mapped_wav_reads_the_first_channel(tmp_path):
+    left, right = tone(0.5), silence(0.5)
+    path = tmp_path / "stereo.wav"
+    write_wav(path, np.stack([left, right], axis=1), channels=2)
+    with MappedWav(str(path)) as recording:
+        assert recording.channels == 2
+        assert recording.duration == 0.5
+        assert np.array_equal(recording.samples, left)
+
+
+def test_chunks_are_cut_in_silence_and_cover_the_recording():
+    samples = np.concatenate([tone(1.0), silence(0.5), tone(1.0), silence(0.5), tone(1.0)])
+    chunks = split_at_silence(samples, SAMPLE_RATE, min_seconds=0.5, max_seconds=1.8)
+
+    assert chunks[0][0] == 0 and chunks[-1][1] == len(samples)
+    assert all(end == next_start for (_, end), (next_start, _) in zip(chunks, chunks[1:]))
+    for _, end in chunks[:-1]:
+        assert not samples[end:end + SAMPLE_RATE // 10].any()
+    assert all(end - start <= 1.8 * SAMPLE_RATE for start, end in chunks)
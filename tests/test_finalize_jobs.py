@@ -0,0 +1,91 @@
+import os
+
+from finalize_jobs import JobQueue, finalize_meeting
+from summarization import NO_CONTENT_SUMMARY
+from transcript_journal import TranscriptJournal
+
+
+def write_journal(path, *texts):
+    journal = TranscriptJournal(str(path))
+    for seq, text in enumerate(texts, 1):
+        journal.append({'seq': seq, 'text': text, 'timestamp': 0.0})
+    journal.close()
+    return str(path)
+
+
+def test_finalize_stopword_only_meeting(tmp_path):
+    journal_file = write_journal(tmp_path / "meeting_1.journal", "the", "and of")
+    transcript_file = str(tmp_path / "meeting_1_transcript.txt")
+    summary_file = str(tmp_path / "meeting_1_structured_summary.txt")
+
+    result = finalize_meeting(journal_file, transcript_file, summary_file, "en")
+
+    assert result['summary'] == NO_CONTENT_SUMMARY
+    with open(summary_file, encoding="utf8") as f:
+        assert f.read() == NO_CONTENT_SUMMARY
+    assert not os.path.exists(journal_file)
+
+
+def test_finalize_empty_journal_writes_nothing(tmp_path):
+    journal_file = write_journal(tmp_path / "meeting_2.journal")
+    result = finalize_meeting(journal_file, str(tmp_path / "t.txt"), str(tmp_path / "s.txt"), "en")
+    assert result['summary_file'] is None
+    assert not os.path.exists(journal_file)
+
+
+def test_job_queue_runs_finalize_on_worker_process(tmp_path):
+    journal_file = write_journal(tmp_path / "meeting_3.journal", "We decided to approve the budget.")
+    finished = []
+    queue = JobQueue(workers=1)
+    try:
+        job_id = queue.submit('finalize_meeting', finalize_meeting, journal_file,
+                              str(tmp_path / "t.txt"), str(tmp_path / "s.txt"), "en",
+                              on_done=finished.append)
+    finally:
+        queue.shutdown()
+    assert finished[0]['id'] == job_id
+    assert finished[0]['status'] == 'completed', finished[0]['error']
+    assert "Decisions Made:" in finished[0]['result']['summary']
+
+
+def test_inline_job_queue_reports_failures():
+    queue = JobQueue(workers=0)
+    job_id = queue.submit('fail', int, "not a number")
+    assert queue.get(job_id)['status'] == 'failed'
+    assert queue.counts() == {'failed': 1}
+
+
+def test_job_queue_retries_a_failed_job_under_the_same_id():
+    calls = []
+
+    def flaky():
+        calls.append(1)
+        if len(calls) == 1:
+            raise OSError("disk full")
+        return "done"
+
+    finished = []
+    queue = JobQueue(workers=0, retries=1)
+    job_id = queue.submit('flaky', flaky, on_done=finished.append)
+    assert len(calls) == 2
+    assert [job['id'] for job in finished] == [job_id]
+    assert finished[0]['status'] == 'completed'
+    assert finished[0]['attempts'] == 2
+
+
+def test_finalize_summary_matches_the_server_summary(tmp_path):
+    from summarization import summarize_text
+
+    journal_file = write_journal(tmp_path / "meeting_4.journal",
+                                 "Dr. Smith reviewed the budget. We decided to approve it.")
+    transcript_file = str(tmp_path / "meeting_4_transcript.txt")
+    result = finalize_meeting(journal_file, transcript_file, str(tmp_path / "s.txt"), "en")
+    with open(transcript_file, encoding="utf8") as f:
+        assert result['summary'] == summarize_text(f.read(), 12)
+
+
+def test_finalize_reports_stage_timings(tmp_path):
+    journal_file = write_journal(tmp_path / "meeting_5.journal", "The timing review went well.")
+    result = finalize_meeting(journal_file, str(tmp_path / "t.txt"), str(tmp_path / "s.txt"), "en")
+    assert [stage for stage, _ in result['timings']] == ['file_write', 'structured_summary', 'file_write']
+    assert all(seconds >= 0 for _, seconds in result['timings'])
@@ -0,0 +1,28 @@
+from live_summary import LiveSummarizer
+from summarization import summarize_text
+
+CHUNKS = [
+    "The budget review covered hiring. Hiring is behind plan.",
+    "Action: Dana will follow up on hiring.",
+    "We decided to keep the budget. The roadmap slips a week.",
+]
+
+
+def test_chunks_report_their_action_items_and_decisions():
+    summarizer = LiveSummarizer(max_sentences=3)
+    detected = [summarizer.add_chunk(chunk) for chunk in CHUNKS]
+    assert detected == [
+        [],
+        [('action', "Action: Dana will follow up on hiring.")],
+        [('decision', "We decided to keep the budget.")],
+    ]
+    assert summarizer.version == 3
+    assert summarizer.snapshot()['sentences'] == 5
+
+
+def test_key_points_match_the_final_summary():
+    summarizer = LiveSummarizer(max_sentences=3)
+    for chunk in CHUNKS:
+        summarizer.add_chunk(chunk)
+    key_points = "".join(f"- {sentence}\n" for sentence in summarizer.key_points())
+    assert f"Key Points:\n{key_points}\n" in summarize_text(" ".join(CHUNKS), 3)
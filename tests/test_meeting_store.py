@@ -0,0 +1,53 @@
+from meeting_store import MeetingStore
+
+
+def make_store(tmp_path):
+    return MeetingStore(str(tmp_path / "meetings.db"))
+
+
+def test_projection_of_only_base_fields(tmp_path):
+    store = make_store(tmp_path)
+    store.create({"title": "Sync", "date": "2024-01-15"})
+    meetings, next_cursor = store.list(fields=["id", "date", "version"])
+    assert meetings == [{"id": "meeting_1", "version": 1, "date": "2024-01-15"}]
+    assert next_cursor is None
+
+
+def test_projection_with_extra_fields(tmp_path):
+    store = make_store(tmp_path)
+    store.create({"title": "Sync", "date": "2024-01-15"})
+    meetings, _ = store.list(fields=["title"])
+    assert meetings[0]["title"] == "Sync"
+    assert "aiNotes" not in meetings[0]
+
+
+def test_deleted_meeting_id_is_not_reused(tmp_path):
+    store = make_store(tmp_path)
+    store.create({"title": "First"})
+    second = store.create({"title": "Second"})
+    assert store.delete(second["id"])
+
+    third = store.create({"title": "Third"})
+    assert third["id"] != second["id"]
+    assert (third["id"], third["version"]) != (second["id"], second["version"])
+
+
+def test_generated_ids_follow_seeded_ids(tmp_path):
+    store = make_store(tmp_path)
+    store.create({"title": "Seed"}, meeting_id="meeting_1")
+    assert store.create({"title": "New"})["id"] == "meeting_2"
+
+
+def test_line_index_with_a_text_copy_is_rebuilt(tmp_path):
+    import sqlite3
+
+    store = make_store(tmp_path)
+    meeting = store.create({"title": "Sync", "aiNotes": "[9:00 AM] Ann: Hello there."})
+    with sqlite3.connect(store.path) as conn:
+        conn.execute("ALTER TABLE transcript_lines ADD COLUMN text TEXT NOT NULL DEFAULT ''")
+
+    store = make_store(tmp_path)
+    assert [line["text"] for line in store.lines(meeting["id"])] == ["Hello there."]
+    with sqlite3.connect(store.path) as conn:
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(transcript_lines)")}
+    assert "text" not in columns
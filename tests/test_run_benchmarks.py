@@ -0,0 +1,27 @@
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+
+from run_benchmarks import compare, growth, result  # noqa: E402
+
+
+def timings(sizes, cost):
+    return [result("text", "clean_transcript", size, "words", {"median_ms": cost(size), "best_ms": 0})
+            for size in sizes]
+
+
+def test_growth_exponent_tells_linear_from_quadratic():
+    assert growth(timings([1_000, 10_000], lambda n: n / 100))[("text", "clean_transcript")] == pytest.approx(1.0)
+    assert growth(timings([1_000, 10_000], lambda n: n * n))[("text", "clean_transcript")] == pytest.approx(2.0)
+
+
+def test_compare_reports_slowdowns_past_the_threshold(tmp_path):
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(json.dumps({"results": timings([1_000, 10_000], lambda n: 10.0)}))
+    current = timings([1_000, 10_000], lambda n: 10.0 if n == 1_000 else 20.0)
+    regressions = compare(current, str(baseline), 1.25)
+    assert [(r["size"], ratio) for r, _, ratio in regressions] == [(10_000, 2.0)]
@@ -0,0 +1,57 @@
+from search_index import SearchIndex
+
+
+def test_update_replaces_only_that_documents_terms():
+    index = SearchIndex()
+    index.update("meeting:1", "budget review with finance")
+    index.update("meeting:2", "budget planning for marketing")
+    index.update("meeting:1", "hiring plan")
+
+    assert [key for key, _ in index.search("finance")] == []
+    assert [key for key, _ in index.search("budget")] == ["meeting:2"]
+    assert [key for key, _ in index.search("hiring")] == ["meeting:1"]
+    assert "finance" not in index._postings
+
+
+def test_appended_terms_are_removed_with_the_document():
+    index = SearchIndex()
+    index.update("meeting:1", "budget review")
+    index.append("meeting:1", "quarterly roadmap")
+    index.remove("meeting:1")
+    assert len(index) == 0
+    assert index._postings == {}
+
+
+def test_removal_after_reload(tmp_path):
+    path = str(tmp_path / "index.json.gz")
+    index = SearchIndex(path)
+    index.update("meeting:1", "budget review", 1)
+    index.update("meeting:2", "roadmap review", 1)
+    index.save()
+
+    reloaded = SearchIndex(path)
+    reloaded.remove("meeting:1")
+    assert [key for key, _ in reloaded.search("review")] == ["meeting:2"]
+    assert "budget" not in reloaded._postings
+
+
+def test_append_after_a_full_reindex_is_not_counted_twice():
+    index = SearchIndex()
+    index.update("meeting:1", "budget review", 1)
+    # The sync thread re-indexed version 2, which already holds the appended text
+    index.update("meeting:1", "budget review roadmap", 2)
+    assert index.append("meeting:1", "roadmap", 2, previous=1) is False
+    assert index._postings["roadmap"] == {index._doc_num["meeting:1"]: 1}
+
+    assert index.append("meeting:1", "roadmap", 3, previous=2) is True
+    assert index._postings["roadmap"] == {index._doc_num["meeting:1"]: 2}
+
+
+def test_only_one_index_saves_a_shared_path(tmp_path):
+    path = str(tmp_path / "index.json.gz")
+    first, second = SearchIndex(path), SearchIndex(path)
+    first.update("meeting:1", "budget review", 1)
+    second.update("meeting:2", "roadmap review", 1)
+    first.save()
+    second.save()
+    assert SearchIndex(path).stamps() == {"meeting:1": 1}
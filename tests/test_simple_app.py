@@ -0,0 +1,149 @@
+import importlib
+import json
+import os
+import threading
+import time
+
+import pytest
+
+
+@pytest.fixture(scope="module")
+def client(tmp_path_factory):
+    folder = tmp_path_factory.mktemp("simple_app")
+    os.environ["MEETINGS_DB"] = str(folder / "meetings.db")
+    os.environ["SEARCH_INDEX"] = str(folder / "search_index.json.gz")
+    os.environ["TRANSCRIPT_FOLDER"] = str(folder / "transcripts")
+    os.environ["SUMMARY_FOLDER"] = str(folder / "meeting_summaries")
+    simple_app = importlib.import_module("simple_app")
+    return simple_app.app.test_client()
+
+
+def test_projection_of_only_base_fields(client):
+    response = client.get("/api/meetings?fields=id,date,version")
+    assert response.status_code == 200
+    assert set(response.get_json()[0]) == {"id", "date", "version"}
+
+
+def test_etag_of_deleted_meeting_does_not_match_its_successor(client):
+    created = client.post("/api/meetings", json={"title": "Old"})
+    old_id = created.get_json()["id"]
+    old_etag = client.get(f"/api/meetings/{old_id}").headers["ETag"]
+    client.delete(f"/api/meetings/{old_id}")
+
+    new_id = client.post("/api/meetings", json={"title": "New"}).get_json()["id"]
+    response = client.get(f"/api/meetings/{new_id}", headers={"If-None-Match": old_etag})
+    assert response.status_code == 200
+    assert response.get_json()["title"] == "New"
+
+
+def test_cursor_header_is_exposed_to_other_origins(client):
+    response = client.get("/api/meetings?limit=1", headers={"Origin": "http://localhost:3000"})
+    assert "X-Next-Cursor" in response.headers
+    exposed = response.headers.get("Access-Control-Expose-Headers", "")
+    assert "X-Next-Cursor" in exposed
+
+
+def create_transcribed_meeting(client):
+    meeting_id = client.post("/api/meetings", json={
+        "title": "Line index",
+        "aiNotes": "[10:00 AM] Alice: Welcome everyone.\n[10:02 AM] Bob: Budget first.",
+    }).get_json()["id"]
+    client.post(f"/api/meetings/{meeting_id}/transcript/update",
+                json={"text": "[10:05 AM] Alice: Roadmap next.\n[10:06 AM] Meeting ended."})
+    return meeting_id
+
+
+def test_speakers_report_talk_time_until_the_next_line(client):
+    meeting_id = create_transcribed_meeting(client)
+    response = client.get(f"/api/meetings/{meeting_id}/speakers")
+    assert response.status_code == 200
+    speakers = {s["name"]: s for s in response.get_json()["speakers"]}
+    assert speakers["Alice"]["talkSeconds"] == 120 + 60
+    assert speakers["Alice"]["lines"] == 2
+    assert speakers["Bob"]["talkSeconds"] == 180
+    assert speakers["Bob"]["words"] == 2
+
+    alice = client.get(f"/api/meetings/{meeting_id}/speakers/Alice/lines").get_json()["lines"]
+    assert [line["text"] for line in alice] == ["Welcome everyone.", "Roadmap next."]
+    assert client.get("/api/meetings/missing/speakers").status_code == 404
+
+
+def test_transcript_lines_by_time_range(client):
+    meeting_id = create_transcribed_meeting(client)
+    response = client.get(f"/api/meetings/{meeting_id}/transcript/lines?from=10:02 AM&to=10:06 AM")
+    assert response.status_code == 200
+    lines = response.get_json()["lines"]
+    assert [(line["time"], line["speaker"], line["text"]) for line in lines] == [
+        ("10:02 AM", "Bob", "Budget first."),
+        ("10:05 AM", "Alice", "Roadmap next."),
+    ]
+    assert client.get(f"/api/meetings/{meeting_id}/transcript/lines?from=noon").status_code == 400
+
+
+def test_listing_without_limit_or_cursor_is_not_paginated(client):
+    for n in range(3):
+        client.post("/api/meetings", json={"title": f"Listing {n}"})
+    everything = client.get("/api/meetings?fields=id")
+    assert "X-Next-Cursor" not in everything.headers
+
+    first = client.get("/api/meetings?fields=id&limit=2")
+    rest = client.get(f"/api/meetings?fields=id&cursor={first.headers['X-Next-Cursor']}")
+    assert first.get_json() + rest.get_json() == everything.get_json()
+
+
+def test_created_meeting_starts_with_its_link(client):
+    meeting = client.post("/api/meetings", json={"title": "Linked"}).get_json()
+    assert meeting["meetingLink"] == f"https://meet.example.com/{meeting['id']}"
+    assert meeting["version"] == 1
+
+    custom = client.post("/api/meetings", json={"title": "Custom", "meetingLink": "https://x.test/1"}).get_json()
+    assert custom["meetingLink"] == "https://x.test/1"
+
+
+def create_live_meeting(client):
+    meeting_id = client.post("/api/meetings", json={"title": "Live", "aiNotes": "Opening."}).get_json()["id"]
+    offset = client.get(f"/api/meetings/{meeting_id}/transcript").get_json()["offset"]
+    return meeting_id, offset
+
+
+def test_transcript_since_returns_only_appended_segments(client):
+    meeting_id, offset = create_live_meeting(client)
+    appended = client.post(f"/api/meetings/{meeting_id}/transcript/update", json={"text": "First point."})
+    assert appended.get_json()["offset"] == offset + 1
+
+    body = client.get(f"/api/meetings/{meeting_id}/transcript?since={offset}").get_json()
+    assert body["segments"] == [{"offset": offset + 1, "text": "First point."}]
+    assert "reset" not in body and "transcript" not in body
+    assert client.get(f"/api/meetings/{meeting_id}/transcript?since={offset + 1}").get_json()["segments"] == []
+
+
+def test_long_poll_is_woken_by_an_append(client):
+    meeting_id, offset = create_live_meeting(client)
+    timer = threading.Timer(0.2, client.post, (f"/api/meetings/{meeting_id}/transcript/update",),
+                            {"json": {"text": "Late point."}})
+    timer.start()
+    started = time.monotonic()
+    body = client.get(f"/api/meetings/{meeting_id}/transcript?since={offset}&wait=10").get_json()
+    timer.join()
+    assert [segment["text"] for segment in body["segments"]] == ["Late point."]
+    assert time.monotonic() - started < 5
+
+
+def test_replaced_transcript_resets_readers(client):
+    meeting_id, offset = create_live_meeting(client)
+    client.post(f"/api/meetings/{meeting_id}/transcript/update", json={"text": "Draft."})
+    client.put(f"/api/meetings/{meeting_id}", json={"aiNotes": "Edited transcript."})
+
+    body = client.get(f"/api/meetings/{meeting_id}/transcript?since={offset}").get_json()
+    assert body["reset"] is True
+    assert body["transcript"] == "Edited transcript."
+
+    response = client.get(f"/api/meetings/{meeting_id}/transcript/stream",
+                          headers={"Last-Event-ID": str(offset)}, buffered=False)
+    try:
+        first_event = next(iter(response.response))
+    finally:
+        response.close()
+    first_event = first_event.decode("utf8") if isinstance(first_event, bytes) else first_event
+    assert "event: reset" in first_event
+    assert json.loads(first_event.split("data: ", 1)[1])["transcript"] == "Edited transcript."
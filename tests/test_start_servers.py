@@ -0,0 +1,26 @@
+import importlib.util
+
+import start_simple_api
+import start_transcript_server
+
+
+def missing(*names):
+    def find_spec(name, *args):
+        return None if name in names else object()
+    return find_spec
+
+
+def test_production_mode_needs_gunicorn_and_gevent(monkeypatch, capsys):
+    monkeypatch.setattr(importlib.util, 'find_spec', missing("gunicorn"))
+    assert not start_simple_api.check_production()
+    assert "production_requirements.txt" in capsys.readouterr().out
+
+    monkeypatch.setattr(importlib.util, 'find_spec', missing())
+    assert start_simple_api.check_production()
+
+
+def test_transcript_server_checks_the_chosen_async_mode(monkeypatch):
+    monkeypatch.setattr(importlib.util, 'find_spec', missing("eventlet"))
+    assert start_transcript_server.check_dependencies("gevent")
+    assert start_transcript_server.check_dependencies(None)
+    assert not start_transcript_server.check_dependencies("eventlet")
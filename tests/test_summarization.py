@@ -0,0 +1,25 @@
+import nltk
+import pytest
+
+import summarization
+from summarization import classify_sentence, split_items
+
+
+def test_classify_sentence_finds_both_kinds():
+    assert classify_sentence("We decided Bob will follow up on the task.") == {'action', 'decision'}
+    assert classify_sentence("The weather was nice.") == set()
+
+
+def test_split_items_keeps_order():
+    sentences = ["Action: send the deck.", "It was approved.", "Nothing here."]
+    assert split_items(sentences) == (["Action: send the deck."], ["It was approved."])
+
+
+def test_missing_nltk_data_is_reported_not_downloaded(tmp_path, monkeypatch):
+    monkeypatch.setattr(nltk.data, 'path', [])
+    monkeypatch.setattr(nltk, 'download', lambda *args, **kwargs: pytest.fail("downloaded NLTK data"))
+    monkeypatch.setattr(summarization, 'NLTK_DATA_DIR', str(tmp_path))
+    monkeypatch.setattr(summarization, 'NLTK_DOWNLOAD', False)
+    monkeypatch.setattr(summarization, '_nltk_ready', False)
+    with pytest.raises(LookupError, match="nltk.downloader"):
+        summarization.ensure_nltk_data()
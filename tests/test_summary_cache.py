@@ -0,0 +1,37 @@
+from summary_cache import SummaryCache, summary_key
+
+
+def counting_summarizer(calls):
+    def summarize(text, max_sentences):
+        calls.append((text, max_sentences))
+        return f"{max_sentences}: {text}"
+    return summarize
+
+
+def test_summaries_come_from_memory_then_disk(tmp_path):
+    calls = []
+    cache = SummaryCache(str(tmp_path), counting_summarizer(calls))
+    assert cache.get("budget review", 5) == ("5: budget review", "computed")
+    assert cache.get("budget review", 5) == ("5: budget review", "memory")
+
+    restarted = SummaryCache(str(tmp_path), counting_summarizer(calls))
+    assert restarted.get("budget review", 5) == ("5: budget review", "disk")
+    assert len(calls) == 1
+    assert restarted.stats()['hits'] == {'memory': 0, 'disk': 1}
+
+
+def test_key_depends_on_the_summary_parameters():
+    assert summary_key("budget review", 5) != summary_key("budget review", 6)
+    assert summary_key("budget review", 5) == summary_key("budget review", 5)
+
+
+def test_memory_tier_evicts_the_least_recently_used():
+    calls = []
+    cache = SummaryCache(None, counting_summarizer(calls), max_entries=2)
+    cache.get("a", 1)
+    cache.get("b", 1)
+    cache.get("a", 1)
+    cache.get("c", 1)
+    assert cache.get("a", 1)[1] == "memory"
+    assert cache.get("b", 1)[1] == "computed"
+    assert cache.stats()['entries'] == 2
@@ -0,0 +1,35 @@
+import threading
+
+from transcript_cleaning import TranscriptCleaner, get_cleaner
+
+
+def test_clean_removes_fillers_and_collapses_whitespace():
+    cleaner = TranscriptCleaner(["um", "you know"])
+    assert cleaner.clean("  Um we   you know ship it\n") == " we  ship it"
+    assert cleaner.clean_chunk("umbrella sums") == "umbrella sums"
+
+
+def test_clean_cache_is_shared_between_threads():
+    cleaner = TranscriptCleaner(["uh"], cache_size=2)
+    texts = [f"uh line {n}" for n in range(8)]
+    errors = []
+
+    def worker():
+        try:
+            for _ in range(200):
+                for text in texts:
+                    assert cleaner.clean(text) == text[2:]
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert len(cleaner._cache) <= 2
+
+
+def test_get_cleaner_shares_one_cleaner_per_lexicon():
+    assert get_cleaner("en") is get_cleaner("en")
@@ -0,0 +1,30 @@
+import os
+
+import transcript_journal
+from transcript_journal import TranscriptJournal, journal_meeting_name, journal_path, pending_journals
+
+
+def test_each_session_gets_its_own_journal(tmp_path):
+    first = journal_path(str(tmp_path), "meeting_7")
+    second = journal_path(str(tmp_path), "meeting_7")
+    assert first != second
+    assert journal_meeting_name(first) == journal_meeting_name(second) == "meeting_7"
+
+
+def test_meeting_name_of_journal_without_session(tmp_path):
+    assert journal_meeting_name(str(tmp_path / "meeting_a.b.journal")) == "meeting_a.b"
+
+
+def test_restarted_session_keeps_its_segments_when_earlier_journal_is_removed(tmp_path):
+    old = TranscriptJournal(journal_path(str(tmp_path), "meeting_1", "1"))
+    old.append({'seq': 1, 'text': "first session", 'timestamp': 0.0})
+    old.close()
+    new = TranscriptJournal(journal_path(str(tmp_path), "meeting_1", "2"))
+    new.append({'seq': 2, 'text': "second session", 'timestamp': 0.0})
+    new.close()
+
+    # What the finalize job of the first session does when it is done
+    os.remove(old.path)
+
+    assert pending_journals(str(tmp_path)) == [new.path]
+    assert [s['text'] for s in transcript_journal.read_segments(new.path)] == ["second session"]
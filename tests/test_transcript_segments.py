@@ -0,0 +1,48 @@
+from transcript_segments import PartialCoalescer, SegmentLog, SegmentStore
+
+
+def test_held_back_partial_is_sent_by_flush():
+    partials = PartialCoalescer(max_per_second=4)
+    assert partials.offer("hello", 0.0) == "hello"
+    assert partials.offer("hello wor", 0.1) is None
+    assert partials.flush(0.2) is None
+    assert partials.flush(0.3) == "hello wor"
+    assert partials.flush(1.0) is None
+
+
+def test_drain_returns_pending_partial_at_end_of_stream():
+    partials = PartialCoalescer(max_per_second=4)
+    partials.offer("hello", 0.0)
+    partials.offer("hello world", 0.05)
+    assert partials.drain() == "hello world"
+    assert partials.drain() is None
+
+
+def test_repeated_partial_is_dropped():
+    partials = PartialCoalescer(max_per_second=4)
+    assert partials.offer("hello", 0.0) == "hello"
+    assert partials.offer("hello", 1.0) is None
+
+
+def test_segment_log_since():
+    log = SegmentLog("m1")
+    for text in ("one", "two", "three"):
+        log.append(text, timestamp=0.0)
+    assert [s['text'] for s in log.since(1)] == ["two", "three"]
+    assert log.text() == "one two three"
+
+
+def test_restarted_meeting_continues_its_sequence_numbers():
+    store = SegmentStore(max_finished=1)
+    store.open("m1").append("before the restart", timestamp=0.0)
+    store.finish("m1")
+    assert store.open("m1").append("after the restart", timestamp=0.0)['seq'] == 2
+
+
+def test_only_the_latest_finished_logs_are_kept():
+    store = SegmentStore(max_finished=1)
+    for meeting_id in ("m1", "m2"):
+        store.open(meeting_id).append("text", timestamp=0.0)
+        store.finish(meeting_id)
+    assert store.get("m1") is None
+    assert store.get("m2").last_seq == 1
@@ -0,0 +1,65 @@
+import threading
+import time
+
+from transcription_sessions import SessionManager
+
+
+def draining_target(drained, runs):
+    def target(session):
+        runs.append(session)
+        session.stop_event.wait()
+        # Saving the transcript after the stop
+        drained.wait(5)
+    return target
+
+
+def test_restart_while_draining_is_queued_behind_the_stopped_session():
+    drained, runs = threading.Event(), []
+    manager = SessionManager(draining_target(drained, runs), max_active=1)
+    first, status = manager.start("m1")
+    assert status == 'running'
+    manager.stop("m1")
+
+    second, status = manager.start("m1")
+    assert status == 'queued'
+    assert second is not first
+    assert manager.get("m1") is second
+    # The restart keeps the meeting's slot, other meetings still wait for a free one
+    assert manager.start("m2")[1] == 'queued'
+
+    drained.set()
+    first.thread.join(5)
+    deadline = time.monotonic() + 5
+    while second.state != 'running' and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert second.state == 'running'
+    assert runs[-1] is second
+
+    manager.stop("m1")
+    second.thread.join(5)
+    manager.stop("m2")
+
+
+def test_start_of_running_session_is_already_active():
+    drained, runs = threading.Event(), []
+    manager = SessionManager(draining_target(drained, runs))
+    first, _ = manager.start("m1")
+    assert manager.start("m1") == (first, 'already_active')
+    drained.set()
+    manager.stop("m1")
+    first.thread.join(5)
+
+
+def test_stop_cancels_a_pending_restart():
+    drained, runs = threading.Event(), []
+    manager = SessionManager(draining_target(drained, runs))
+    first, _ = manager.start("m1")
+    manager.stop("m1")
+    second, _ = manager.start("m1")
+    manager.stop("m1")
+    assert second.state == 'cancelled'
+
+    drained.set()
+    first.thread.join(5)
+    assert manager.get("m1") is None
+    assert runs == [first]
@@ -0,0 +1,36 @@
+import numpy as np
+
+from vad import FRAME_SECONDS, HANGOVER_SECONDS, VoiceActivityGate
+
+SAMPLE_RATE = 16000
+
+
+def block(seconds, amplitude):
+    t = np.arange(int(seconds * SAMPLE_RATE))
+    return (amplitude * np.sin(2 * np.pi * 220 * t / SAMPLE_RATE)).astype("<i2").tobytes()
+
+
+def test_gate_closes_once_when_hangover_runs_out():
+    gate = VoiceActivityGate(SAMPLE_RATE)
+    closed = []
+    for pcm in [block(0.5, 0), block(0.5, 3000), block(0.25, 0), block(0.25, 0),
+                block(0.25, 0), block(0.5, 0)]:
+        gate.process(pcm)
+        closed.append(gate.closed)
+    # Speech ends after 1.0 s; the 0.6 s hangover runs out in the block covering 1.5-1.75 s
+    assert closed == [False, False, False, False, True, False]
+
+
+def test_silence_alone_never_closes_the_gate():
+    gate = VoiceActivityGate(SAMPLE_RATE)
+    assert gate.process(block(1.0, 0)) == b""
+    assert not gate.closed
+
+
+def test_hangover_silence_is_passed_on():
+    gate = VoiceActivityGate(SAMPLE_RATE)
+    speech = block(0.2, 3000)
+    kept = gate.process(speech + block(1.0, 0))
+    hangover_bytes = int(HANGOVER_SECONDS / FRAME_SECONDS) * int(SAMPLE_RATE * FRAME_SECONDS) * 2
+    assert len(kept) == len(speech) + hangover_bytes
+    assert gate.closed
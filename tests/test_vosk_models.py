@@ -0,0 +1,55 @@
+import sys
+import types
+
+import pytest
+
+from vosk_models import ModelRegistry
+
+
+@pytest.fixture
+def loads(monkeypatch):
+    """A stand-in vosk module; the returned list records every model load."""
+    loaded = []
+
+    class Model:
+        def __init__(self, path):
+            loaded.append(path)
+
+    class KaldiRecognizer:
+        def __init__(self, model, sample_rate):
+            self.model = model
+            self.resets = 0
+
+        def Reset(self):
+            self.resets += 1
+
+    monkeypatch.setitem(sys.modules, 'vosk', types.SimpleNamespace(Model=Model, KaldiRecognizer=KaldiRecognizer))
+    return loaded
+
+
+def test_model_is_loaded_once_for_many_recognizers(loads):
+    registry = ModelRegistry()
+    recognizers = [registry.acquire("model", 16000) for _ in range(5)]
+    assert loads == ["model"]
+    assert len({id(rec.model) for rec in recognizers}) == 1
+
+    stats = registry.stats()['models']['model']
+    assert stats['active_recognizers'] == 5
+    assert stats['load_seconds'] >= 0
+
+
+def test_released_recognizer_is_reset_and_reused(loads):
+    registry = ModelRegistry()
+    with registry.recognizer("model", 16000) as first:
+        pass
+    assert first.resets == 1
+    assert registry.acquire("model", 16000) is first
+    assert registry.acquire("model", 8000) is not first
+
+
+def test_idle_pool_is_bounded(loads):
+    registry = ModelRegistry(max_idle_recognizers=1)
+    recognizers = [registry.acquire("model", 16000) for _ in range(3)]
+    for rec in recognizers:
+        registry.release(rec)
+    assert registry.stats()['models']['model']['idle_recognizers'] == 1
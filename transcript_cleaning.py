@@ -0,0 +1,90 @@
+"""
+Transcript cleaning stage.
+Filler words are removed by one precompiled alternation in a single pass
+over each chunk, with a configurable filler lexicon per language or team.
+"""
+
+import hashlib
+import os
+import re
+import threading
+from collections import OrderedDict
+
+FILLER_WORDS = ["en", "then", "uh", "um", "okay", "so", "like", "actually", "basically"]
+
+# Built-in lexicons; teams can add their own with register_lexicon or a words file
+FILLER_LEXICONS = {
+    "en": FILLER_WORDS,
+}
+
+
+class TranscriptCleaner:
+    """Removes filler words with one precompiled alternation.
+
+    Output matches the original clean_transcript: whitespace runs collapse to
+    one space and the text is stripped before fillers are removed, so removed
+    fillers leave their surrounding spaces behind.
+    """
+
+    def __init__(self, filler_words, cache_size=16):
+        words = sorted({" ".join(w.lower().split()) for w in filler_words if w.strip()},
+                       key=len, reverse=True)
+        # Multi-word fillers ("you know") match the single space left by split/join
+        alternation = "|".join(re.escape(w).replace(r'\ ', ' ') for w in words)
+        self._pattern = re.compile(r'\b(?:' + alternation + r')\b', re.IGNORECASE) if words else None
+        self.filler_words = words
+        # Cleaned text by digest of the raw text, so cached transcripts are not kept twice
+        self._cache = OrderedDict()
+        self._cache_size = cache_size
+        self._lock = threading.Lock()
+
+    def clean_chunk(self, text):
+        """Clean one chunk without caching; used for live, never-repeated chunks."""
+        # split/join collapses and strips whitespace in C before the single regex pass
+        text = " ".join(text.split())
+        return self._pattern.sub('', text) if self._pattern else text
+
+    def clean(self, text):
+        """Clean text, reusing the result if the same text was cleaned recently."""
+        key = hashlib.sha256(text.encode("utf8")).digest()
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                return cached
+        cleaned = self.clean_chunk(text)
+        with self._lock:
+            self._cache[key] = cleaned
+            self._cache.move_to_end(key)
+            while len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+        return cleaned
+
+
+def load_lexicon(path):
+    """Read a filler lexicon file: one word per line, '#' starts a comment."""
+    with open(path, encoding="utf8") as f:
+        return [line.split('#', 1)[0].strip() for line in f if line.split('#', 1)[0].strip()]
+
+
+def register_lexicon(name, words):
+    """Add or replace a named filler lexicon."""
+    FILLER_LEXICONS[name] = list(words)
+    _cleaners.pop(name, None)
+
+
+_cleaners = {}
+
+
+def get_cleaner(lexicon="en"):
+    """Return the shared cleaner for a lexicon name or a path to a lexicon file."""
+    cleaner = _cleaners.get(lexicon)
+    if cleaner is None:
+        if lexicon in FILLER_LEXICONS:
+            words = FILLER_LEXICONS[lexicon]
+        elif os.path.isfile(lexicon):
+            words = load_lexicon(lexicon)
+        else:
+            raise KeyError(f"Unknown filler lexicon: {lexicon}")
+        cleaner = _cleaners[lexicon] = TranscriptCleaner(words)
+    return cleaner
@@ -0,0 +1,122 @@
+"""
+Crash-safe transcript journal.
+Each finalized chunk is appended to a journal file of its own for every
+transcription session, as one JSON line. Writes are group-committed: the file is fsynced once per time window
+or size threshold instead of once per chunk. Journals left behind by a
+crash are turned into transcripts on the next start.
+"""
+
+import glob
+import json
+import os
+import time
+
+JOURNAL_SUFFIX = ".journal"
+# Separates the meeting name from the session in a journal file name; meeting names never contain it
+SESSION_SEPARATOR = "@"
+
+_fsync = getattr(os, "fdatasync", os.fsync)
+
+
+class TranscriptJournal:
+    """Append-only journal of one meeting's finalized transcript segments."""
+
+    def __init__(self, path, commit_interval=1.0, commit_bytes=64 * 1024):
+        self.path = path
+        self.commit_interval = commit_interval
+        self.commit_bytes = commit_bytes
+        self._file = open(path, "ab")
+        self._unsynced_bytes = 0
+        self._last_commit = time.monotonic()
+
+    def append(self, segment):
+        """Write one segment ({'seq', 'text', 'timestamp'}); it is durable after the next commit."""
+        line = json.dumps(segment, ensure_ascii=False).encode("utf8") + b"\n"
+        self._file.write(line)
+        self._unsynced_bytes += len(line)
+        self.maybe_commit()
+
+    def maybe_commit(self, now=None):
+        """Commit if the time window has passed or enough bytes are waiting."""
+        if not self._unsynced_bytes:
+            return False
+        now = time.monotonic() if now is None else now
+        if (self._unsynced_bytes >= self.commit_bytes or
+                now - self._last_commit >= self.commit_interval):
+            self.commit()
+            return True
+        return False
+
+    def commit(self):
+        """Flush buffered segments and fsync them to disk."""
+        self._file.flush()
+        _fsync(self._file.fileno())
+        self._unsynced_bytes = 0
+        self._last_commit = time.monotonic()
+
+    def close(self):
+        if self._file.closed:
+            return
+        self.commit()
+        self._file.close()
+
+
+def journal_path(folder, meeting_name, session=None):
+    """Journal file of one session of a meeting.
+
+    Every session gets its own file, so a meeting restarted while the last
+    session's journal is still being finalized never appends to (or loses)
+    a journal that is about to be removed. session defaults to a new,
+    time-ordered id.
+    """
+    if session is None:
+        session = f"{time.time_ns():x}-{os.getpid()}"
+    return os.path.join(folder, f"{meeting_name}{SESSION_SEPARATOR}{session}{JOURNAL_SUFFIX}")
+
+
+def journal_meeting_name(path):
+    """Meeting name a journal file belongs to."""
+    name = os.path.basename(path)[:-len(JOURNAL_SUFFIX)]
+    return name.split(SESSION_SEPARATOR, 1)[0]
+
+
+def read_segments(path):
+    """Yield the segments of a journal in order, skipping a torn last line."""
+    with open(path, "rb") as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                # A crash mid-write leaves at most one incomplete line at the end
+                continue
+
+
+def write_transcript(path, transcript_file, clean=None):
+    """Build a transcript file from a journal one segment at a time.
+
+    The file is written next to its final name and moved into place, so a
+    crash never leaves a half-written transcript behind. Returns False if the
+    journal held no segments.
+    """
+    tmp_file = transcript_file + ".tmp"
+    with open(tmp_file, "w", encoding="utf8") as out:
+        first = True
+        for segment in read_segments(path):
+            text = clean(segment['text']) if clean is not None else segment['text']
+            if not first:
+                out.write(" ")
+            out.write(text)
+            first = False
+        out.flush()
+        _fsync(out.fileno())
+    if first:
+        # Nothing was transcribed; like the live path, don't write an empty transcript
+        os.remove(tmp_file)
+        return False
+    os.replace(tmp_file, transcript_file)
+    return True
+
+
+def pending_journals(folder):
+    """Journals of sessions that never reached their final save, oldest session of a meeting first."""
+    return sorted(glob.glob(os.path.join(folder, "*" + JOURNAL_SUFFIX)))
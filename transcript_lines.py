@@ -0,0 +1,90 @@
+"""
+Parsing of "[10:00 AM] John: ..." transcript lines.
+Stored transcripts are one text made of timestamped speaker lines. The
+meeting store parses each piece of text once when it is written and keeps the
+result as a line index (start time, speaker, character span), so speaker and
+time-range queries never re-parse the transcript; a line's text is read back
+by slicing the stored transcript at its span.
+"""
+
+import re
+
+SECONDS_PER_DAY = 24 * 3600
+
+# "[10:00 AM] John: text", "[14:03:27] Jane: text" or "[10:20 AM] Meeting ended."
+LINE_PATTERN = re.compile(
+    r"^\[(?P<hour>\d{1,2}):(?P<minute>\d{2})(?::(?P<second>\d{2}))?\s*(?P<ampm>[AaPp][Mm])?\]"
+    r"[ \t]*(?:(?P<speaker>[^:\n.!?\[\]]{1,60}?):[ \t]+)?(?P<text>[^\n]*)$",
+    re.MULTILINE)
+
+CLOCK_PATTERN = re.compile(r"^\s*(\d{1,2}):(\d{2})(?::(\d{2}))?\s*([AaPp][Mm])?\s*$")
+
+
+def clock_seconds(hour, minute, second=0, ampm=None):
+    """Seconds since midnight of a clock time, or None if it is not a valid time."""
+    if ampm:
+        if not 1 <= hour <= 12:
+            return None
+        hour = hour % 12 + (12 if ampm.lower() == "pm" else 0)
+    if hour > 23 or minute > 59 or second > 59:
+        return None
+    return hour * 3600 + minute * 60 + second
+
+
+def parse_clock(value):
+    """Seconds since midnight of "10:05 AM", "14:05" or "14:05:30"; raises ValueError otherwise."""
+    match = CLOCK_PATTERN.match(value or "")
+    seconds = None
+    if match:
+        hour, minute, second, ampm = match.groups()
+        seconds = clock_seconds(int(hour), int(minute), int(second or 0), ampm)
+    if seconds is None:
+        raise ValueError(f"Invalid time: {value}")
+    return seconds
+
+
+def format_clock(seconds):
+    """Transcript-style label of a line start, e.g. "10:05 AM" (or "10:05:30 AM")."""
+    seconds %= SECONDS_PER_DAY
+    hour, minute, second = seconds // 3600, seconds // 60 % 60, seconds % 60
+    label = f"{hour % 12 or 12}:{minute:02d}"
+    if second:
+        label += f":{second:02d}"
+    return f"{label} {'PM' if hour >= 12 else 'AM'}"
+
+
+def line_text(line):
+    """The spoken text of one line sliced out of a transcript, without its time and speaker."""
+    match = LINE_PATTERN.match(line)
+    return match["text"].strip() if match else line.strip()
+
+
+def parse_lines(text, offset=0, previous_start=None):
+    """Timestamped lines of text, in order.
+
+    offset is where text begins in the full transcript, so spans index the
+    whole transcript. Starts count seconds from midnight of the day the
+    transcript began: a clock that jumps back by more than twelve hours from
+    previous_start (or the line before) is taken to be the next day.
+    Lines without a "Name:" prefix, such as "Meeting ended.", have speaker None.
+    """
+    lines = []
+    for match in LINE_PATTERN.finditer(text):
+        clock = clock_seconds(int(match["hour"]), int(match["minute"]),
+                              int(match["second"] or 0), match["ampm"])
+        if clock is None:
+            continue
+        start = clock
+        if previous_start is not None:
+            start += previous_start // SECONDS_PER_DAY * SECONDS_PER_DAY
+            if start < previous_start - SECONDS_PER_DAY // 2:
+                start += SECONDS_PER_DAY
+        speaker = match["speaker"].strip() if match["speaker"] else None
+        lines.append({
+            "start": start,
+            "speaker": speaker or None,
+            "span": (offset + match.start(), offset + match.end()),
+            "text": match["text"].strip(),
+        })
+        previous_start = start
+    return lines
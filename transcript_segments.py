@@ -0,0 +1,117 @@
+"""
+Transcript delivery to clients.
+Every finalized chunk becomes a numbered segment in an append-only log, so
+clients receive only new segments and can ask for "everything since seq N"
+after reconnecting. Partial results are deduplicated and rate-limited.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class SegmentLog:
+    """Numbered transcript segments of one meeting; seq starts at 1 and never repeats."""
+
+    def __init__(self, meeting_id):
+        self.meeting_id = meeting_id
+        self._segments = []
+
+    @property
+    def last_seq(self):
+        return len(self._segments)
+
+    def append(self, text, timestamp=None):
+        """Add a finalized chunk and return its segment."""
+        segment = {
+            'seq': len(self._segments) + 1,
+            'text': text,
+            'timestamp': timestamp if timestamp is not None else time.time(),
+        }
+        self._segments.append(segment)
+        return segment
+
+    def since(self, seq, limit=None):
+        """Segments with a sequence number greater than seq, oldest first."""
+        start = max(0, int(seq))
+        end = None if limit is None else start + limit
+        return self._segments[start:end]
+
+    def text(self):
+        return " ".join(segment['text'] for segment in self._segments)
+
+
+class SegmentStore:
+    """Segment logs by meeting id; keeps the logs of the most recently finished meetings."""
+
+    def __init__(self, max_finished=32):
+        self.max_finished = max_finished
+        self._lock = threading.Lock()
+        self._live = {}
+        self._finished = OrderedDict()
+
+    def open(self, meeting_id):
+        """Return the live log for a meeting, reopening a finished one if it exists."""
+        with self._lock:
+            log = self._live.get(meeting_id) or self._finished.pop(meeting_id, None)
+            if log is None:
+                log = SegmentLog(meeting_id)
+            self._live[meeting_id] = log
+            return log
+
+    def finish(self, meeting_id):
+        """Mark a meeting's log finished; old finished logs are dropped past max_finished."""
+        with self._lock:
+            log = self._live.pop(meeting_id, None)
+            if log is None:
+                return
+            self._finished[meeting_id] = log
+            while len(self._finished) > self.max_finished:
+                self._finished.popitem(last=False)
+
+    def get(self, meeting_id):
+        with self._lock:
+            return self._live.get(meeting_id) or self._finished.get(meeting_id)
+
+
+class PartialCoalescer:
+    """Drops repeated partial results and limits how often one meeting emits them.
+
+    offer() returns the text to emit now, or None. A partial held back by the
+    rate limit is kept and returned by flush() once the interval has passed,
+    so the recognizer loop calls flush() after every block and while idle,
+    and drain() when the stream stops.
+    """
+
+    def __init__(self, max_per_second=4.0):
+        self.min_interval = 1.0 / max_per_second if max_per_second > 0 else 0.0
+        self._last_sent = None
+        self._last_time = float('-inf')
+        self._pending = None
+
+    def offer(self, text, now):
+        if text == self._last_sent:
+            self._pending = None
+            return None
+        self._pending = text
+        return self.flush(now)
+
+    def flush(self, now):
+        if self._pending is None or now - self._last_time < self.min_interval:
+            return None
+        text, self._pending = self._pending, None
+        self._last_sent = text
+        self._last_time = now
+        return text
+
+    def drain(self):
+        """The held-back partial, if any, regardless of the rate limit."""
+        text, self._pending = self._pending, None
+        if text is not None:
+            self._last_sent = text
+        return text
+
+    def reset(self):
+        """Forget the current utterance once it has been finalized."""
+        self._last_sent = None
+        self._pending = None
@@ -0,0 +1,222 @@
+"""
+Per-meeting transcription sessions.
+Each meeting gets its own session with a stop event, and a bounded scheduler
+caps how many recognizers run at once, queueing or rejecting the rest.
+"""
+
+import queue
+import threading
+import time
+from collections import deque
+
+from audio_buffer import AudioRingBuffer
+
+
+class TranscriptionSession:
+    """State of one meeting's transcription: stop flag, worker thread and load figures."""
+
+    def __init__(self, meeting_id, source='local', buffer_seconds=10.0, overflow_policy='drop_oldest',
+                 channels=1):
+        self.meeting_id = meeting_id
+        self.source = source
+        # Interleaved int16 channels per captured block ('dual' sessions have two or more)
+        self.channels = channels
+        # (captured_at, pcm_bytes) blocks waiting for the recognizer, bounded by audio duration
+        self.audio_queue = AudioRingBuffer(buffer_seconds, overflow_policy, channels=channels)
+        self.stop_event = threading.Event()
+        self.stopped_at = None
+        self.state = 'queued'
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.thread = None
+        self.cpu_seconds = 0.0
+        self.lag_seconds = 0.0
+        self.recognizer_seconds = 0.0
+        self.audio_seconds = 0.0
+        self.vad_skipped_fraction = 0.0
+
+    @property
+    def stopped(self):
+        return self.stop_event.is_set()
+
+    def stop(self):
+        """Ask the worker loop to finish; it saves the transcript on its way out."""
+        if self.stopped_at is None:
+            self.stopped_at = time.monotonic()
+        self.stop_event.set()
+
+    def feed_audio(self, pcm):
+        """Queue one block of 16-bit mono PCM for the recognizer."""
+        self.audio_queue.put((time.monotonic(), pcm))
+
+    def next_block(self, timeout=0.5):
+        """Next (captured_at, pcm) block for the recognizer; raises queue.Empty while idle.
+
+        Once the session is stopped, the blocks captured before the stop are
+        still returned, without waiting, so a client's last frames are not
+        lost. None means the session is stopped and its audio is used up.
+        """
+        if not self.stopped:
+            return self.audio_queue.get(timeout=timeout)
+        try:
+            block = self.audio_queue.get(timeout=0)
+        except queue.Empty:
+            return None
+        return block if block[0] <= self.stopped_at else None
+
+    def record_progress(self, cpu_seconds, lag_seconds):
+        """Update CPU time used by the worker thread and how far it trails live audio."""
+        self.cpu_seconds = cpu_seconds
+        self.lag_seconds = lag_seconds
+
+    def record_recognizer(self, seconds, audio_seconds):
+        """Add one AcceptWaveform call: wall time spent and seconds of audio it took."""
+        self.recognizer_seconds += seconds
+        self.audio_seconds += audio_seconds
+
+    @property
+    def real_time_factor(self):
+        """Recognizer time per second of audio; above 1.0 the meeting falls behind."""
+        return self.recognizer_seconds / self.audio_seconds if self.audio_seconds else 0.0
+
+    def to_dict(self):
+        now = time.time()
+        return {
+            'meeting_id': self.meeting_id,
+            'state': self.state,
+            'source': self.source,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'running_seconds': round(now - self.started_at, 3) if self.started_at else 0.0,
+            'cpu_seconds': round(self.cpu_seconds, 3),
+            'lag_seconds': round(self.lag_seconds, 3),
+            'queue_depth': self.audio_queue.qsize(),
+            'buffered_seconds': round(self.audio_queue.buffered_seconds, 3),
+            'dropped_seconds': round(self.audio_queue.dropped_seconds, 3),
+            'overflow_policy': self.audio_queue.policy,
+            'degraded': self.audio_queue.degraded,
+            'real_time_factor': round(self.real_time_factor, 4),
+            'vad_skipped_fraction': round(self.vad_skipped_fraction, 4),
+        }
+
+
+class SessionManager:
+    """Runs at most max_active sessions at once and queues up to max_queued more."""
+
+    def __init__(self, target, max_active=4, max_queued=8, buffer_seconds=10.0,
+                 overflow_policy='drop_oldest'):
+        self.target = target
+        self.max_active = max_active
+        self.max_queued = max_queued
+        self.buffer_seconds = buffer_seconds
+        self.overflow_policy = overflow_policy
+        self._lock = threading.Lock()
+        self._active = {}
+        self._queued = deque()
+        # meeting_id -> session started again while its stopped predecessor is still draining
+        self._restarts = {}
+
+    def start(self, meeting_id, source='local', channels=1):
+        """Start or queue a session for meeting_id.
+
+        Returns (session, status) where status is 'running', 'queued',
+        'already_active' or 'rejected' (session is None when rejected).
+        A meeting started again while its stopped session is still saving is
+        'queued' behind it and takes over its slot once it has finished.
+        """
+        with self._lock:
+            existing = (self._restarts.get(meeting_id) or self._active.get(meeting_id) or
+                        self._find_queued(meeting_id))
+            if existing is not None and not existing.stopped:
+                return existing, 'already_active'
+
+            session = TranscriptionSession(meeting_id, source=source,
+                                           buffer_seconds=self.buffer_seconds,
+                                           overflow_policy=self.overflow_policy,
+                                           channels=channels)
+            if meeting_id in self._active:
+                self._restarts[meeting_id] = session
+                return session, 'queued'
+            if len(self._active) < self.max_active:
+                self._launch(session)
+                return session, 'running'
+            if len(self._queued) < self.max_queued:
+                self._queued.append(session)
+                return session, 'queued'
+            return None, 'rejected'
+
+    def stop(self, meeting_id):
+        """Stop the session for meeting_id, or drop it from the queue. Returns the session or None."""
+        with self._lock:
+            restart = self._restarts.pop(meeting_id, None)
+            if restart is not None:
+                restart.state = 'cancelled'
+                restart.stop()
+            session = self._active.get(meeting_id)
+            if session is None:
+                session = self._find_queued(meeting_id)
+                if session is not None:
+                    self._queued.remove(session)
+                    session.state = 'cancelled'
+                    session.stop()
+                return session or restart
+        session.stop()
+        return session
+
+    def get(self, meeting_id):
+        with self._lock:
+            return (self._restarts.get(meeting_id) or self._active.get(meeting_id) or
+                    self._find_queued(meeting_id))
+
+    def queue_position(self, meeting_id):
+        """1-based position of a queued meeting, or None if it is not waiting."""
+        with self._lock:
+            for position, session in enumerate(self._queued, start=1):
+                if session.meeting_id == meeting_id:
+                    return position
+        return None
+
+    def status(self):
+        """Snapshot of running and queued sessions for the status API."""
+        with self._lock:
+            return {
+                'max_active': self.max_active,
+                'max_queued': self.max_queued,
+                'active': [s.to_dict() for s in self._active.values()],
+                'queued': [s.to_dict() for s in (*self._restarts.values(), *self._queued)],
+            }
+
+    def _find_queued(self, meeting_id):
+        for session in self._queued:
+            if session.meeting_id == meeting_id:
+                return session
+        return None
+
+    def _launch(self, session):
+        # Caller holds self._lock
+        session.state = 'running'
+        session.started_at = time.time()
+        self._active[session.meeting_id] = session
+        session.thread = threading.Thread(target=self._run, args=(session,),
+                                          name=f"transcription-{session.meeting_id}")
+        session.thread.daemon = True
+        session.thread.start()
+
+    def _run(self, session):
+        try:
+            self.target(session)
+        except Exception as e:
+            print(f"Transcription session {session.meeting_id} failed: {e}")
+        finally:
+            with self._lock:
+                session.state = 'stopped'
+                session.finished_at = time.time()
+                self._active.pop(session.meeting_id, None)
+                restart = self._restarts.pop(session.meeting_id, None)
+                if restart is not None:
+                    # The same meeting was started again while this session was saving
+                    self._launch(restart)
+                # Hand the freed slot to the next waiting meeting
+                elif self._queued and len(self._active) < self.max_active:
+                    self._launch(self._queued.popleft())
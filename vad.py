@@ -0,0 +1,100 @@
+"""
+Voice-activity gate in front of the recognizer.
+Audio is cut into short frames and each frame is classed as speech by its
+energy, or by a lower energy together with a high zero-crossing rate (quiet
+fricatives such as "s" and "f"). Speech is extended by a hangover after it
+ends and a short pre-roll before it starts. Silence beyond that is not passed
+on, so a quiet meeting costs the recognizer almost nothing. The hangover is
+shorter than the silence the recognizer's endpointing waits for (1-2 s for the
+small Vosk models), so the gate reports when it closes and the caller ends the
+utterance itself with FinalResult().
+"""
+
+from collections import deque
+
+import numpy as np
+
+FRAME_SECONDS = 0.02
+SPEECH_RMS = 300         # int16 RMS at or above which a frame is speech
+FRICATIVE_RMS = 120      # quieter frames count as speech if they also cross zero often
+FRICATIVE_ZCR = 0.3      # zero crossings per sample for such frames
+HANGOVER_SECONDS = 0.6   # silence kept after speech before the gate closes
+PREROLL_SECONDS = 0.2    # silence kept before speech so word onsets are not clipped
+
+
+class VoiceActivityGate:
+    """Filters 16-bit mono PCM blocks down to speech plus the silence around it."""
+
+    def __init__(self, sample_rate=16000, speech_rms=SPEECH_RMS, hangover_seconds=HANGOVER_SECONDS,
+                 preroll_seconds=PREROLL_SECONDS):
+        self.frame_samples = int(sample_rate * FRAME_SECONDS)
+        self.speech_rms = speech_rms
+        self.hangover_frames = int(hangover_seconds / FRAME_SECONDS)
+        self.preroll = deque(maxlen=int(preroll_seconds / FRAME_SECONDS))
+        self._remainder = b""
+        # Frames since the last speech frame; starts past the hangover so leading silence is skipped
+        self._since_speech = self.hangover_frames + 1
+        self.bytes_in = 0
+        self.bytes_skipped = 0
+        # True after a process() call in which the hangover ran out: the utterance is over
+        self.closed = False
+
+    @property
+    def skipped_fraction(self):
+        return self.bytes_skipped / self.bytes_in if self.bytes_in else 0.0
+
+    def speech_frames(self, samples):
+        """Speech flag per frame of a (frames, frame_samples) int16 array."""
+        x = samples.astype(np.float32)
+        rms = np.sqrt((x * x).mean(axis=1))
+        zcr = (np.signbit(samples[:, 1:]) != np.signbit(samples[:, :-1])).mean(axis=1)
+        return (rms >= self.speech_rms) | ((rms >= FRICATIVE_RMS) & (zcr >= FRICATIVE_ZCR))
+
+    def process(self, pcm):
+        """Return the part of pcm the recognizer should see (possibly b"")."""
+        self.bytes_in += len(pcm)
+        self.closed = False
+        data = self._remainder + pcm
+        frame_bytes = self.frame_samples * 2
+        n_frames = len(data) // frame_bytes
+        # A partial frame waits for the next block so frames stay aligned
+        self._remainder = data[n_frames * frame_bytes:]
+        if not n_frames:
+            return b""
+        samples = np.frombuffer(data, dtype="<i2", count=n_frames * self.frame_samples)
+        speech = self.speech_frames(samples.reshape(n_frames, self.frame_samples))
+
+        # Hangover: frames since the last speech frame, carrying over from the previous block
+        index = np.arange(n_frames)
+        last_speech = np.maximum.accumulate(np.where(speech, index, -1 - self._since_speech))
+        since_speech = index - last_speech
+        keep = since_speech <= self.hangover_frames
+        # Closed: the block ends past the hangover, after speech in it or in an earlier block
+        self.closed = bool(since_speech[-1] > self.hangover_frames and
+                           (self._since_speech <= self.hangover_frames or keep.any()))
+        self._since_speech = int(since_speech[-1])
+
+        # Whole-block fast paths: steady speech and steady silence
+        if keep.all() and not self.preroll:
+            return data[:n_frames * frame_bytes]
+        if not keep.any():
+            start = max(0, n_frames - self.preroll.maxlen)
+            self.preroll.extend(data[i * frame_bytes:(i + 1) * frame_bytes]
+                                for i in range(start, n_frames))
+            self.bytes_skipped += n_frames * frame_bytes
+            return b""
+
+        out = []
+        for i in range(n_frames):
+            frame = data[i * frame_bytes:(i + 1) * frame_bytes]
+            if keep[i]:
+                if speech[i] and self.preroll:
+                    # Speech starting after a skipped gap: put back the frames just before it
+                    out.extend(self.preroll)
+                    self.bytes_skipped -= len(self.preroll) * frame_bytes
+                    self.preroll.clear()
+                out.append(frame)
+            else:
+                self.preroll.append(frame)
+                self.bytes_skipped += frame_bytes
+        return b"".join(out)
@@ -0,0 +1,134 @@
+"""
+Process-wide Vosk model registry.
+Each model is loaded from disk once and recognizers are handed out from a
+reusable pool, so starting many meetings does not mean many model loads.
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+
+def _resident_memory_bytes():
+    """Return the current resident set size of this process, or None if unknown."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+        usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is kilobytes on Linux and bytes on macOS
+        return usage if os.uname().sysname == "Darwin" else usage * 1024
+    except (ImportError, AttributeError):
+        return None
+
+
+class ModelRegistry:
+    """Loads each Vosk model once and pools KaldiRecognizer instances per model."""
+
+    def __init__(self, max_idle_recognizers=8):
+        self.max_idle_recognizers = max_idle_recognizers
+        self._lock = threading.Lock()
+        self._load_locks = {}
+        self._models = {}
+        self._model_stats = {}
+        self._idle = {}
+        self._in_use = {}
+
+    def get_model(self, model_path):
+        """Return the loaded model for model_path, loading it on first use."""
+        model = self._models.get(model_path)
+        if model is not None:
+            return model
+
+        with self._lock:
+            load_lock = self._load_locks.setdefault(model_path, threading.Lock())
+
+        # Only one thread loads a given model; the others wait and reuse it
+        with load_lock:
+            model = self._models.get(model_path)
+            if model is not None:
+                return model
+
+            import vosk
+
+            rss_before = _resident_memory_bytes()
+            started = time.perf_counter()
+            model = vosk.Model(model_path)
+            load_seconds = time.perf_counter() - started
+            rss_after = _resident_memory_bytes()
+
+            with self._lock:
+                self._models[model_path] = model
+                self._model_stats[model_path] = {
+                    'load_seconds': round(load_seconds, 3),
+                    'memory_bytes': (rss_after - rss_before
+                                     if rss_before is not None and rss_after is not None else None),
+                    'loaded_at': time.time(),
+                }
+            print(f"✅ Loaded Vosk model {model_path} in {load_seconds:.2f}s")
+            return model
+
+    def preload(self, model_paths, sample_rate=None, recognizers=0):
+        """Load the given models up front and optionally warm the recognizer pool."""
+        for model_path in model_paths:
+            self.get_model(model_path)
+            warm = [self.acquire(model_path, sample_rate) for _ in range(recognizers)]
+            for rec in warm:
+                self.release(rec)
+
+    def acquire(self, model_path, sample_rate):
+        """Take a recognizer from the pool, creating one if none is idle."""
+        key = (model_path, sample_rate)
+        with self._lock:
+            idle = self._idle.get(key)
+            rec = idle.pop() if idle else None
+        if rec is None:
+            import vosk
+            rec = vosk.KaldiRecognizer(self.get_model(model_path), sample_rate)
+        with self._lock:
+            self._in_use[id(rec)] = key
+        return rec
+
+    def release(self, rec):
+        """Return a recognizer to the pool so the next meeting can reuse it."""
+        with self._lock:
+            key = self._in_use.pop(id(rec), None)
+            if key is None:
+                return
+            idle = self._idle.setdefault(key, [])
+            if len(idle) >= self.max_idle_recognizers:
+                return
+        # Reset drops any partial utterance left over from the previous meeting
+        rec.Reset()
+        with self._lock:
+            idle.append(rec)
+
+    @contextmanager
+    def recognizer(self, model_path, sample_rate):
+        """Context manager that acquires a pooled recognizer and always releases it."""
+        rec = self.acquire(model_path, sample_rate)
+        try:
+            yield rec
+        finally:
+            self.release(rec)
+
+    def stats(self):
+        """Return load time, memory and pool usage for every loaded model."""
+        with self._lock:
+            models = {}
+            for model_path, info in self._model_stats.items():
+                idle = sum(len(recs) for (path, _), recs in self._idle.items() if path == model_path)
+                in_use = sum(1 for path, _ in self._in_use.values() if path == model_path)
+                models[model_path] = dict(info, idle_recognizers=idle, active_recognizers=in_use)
+            return {
+                'models': models,
+                'resident_memory_bytes': _resident_memory_bytes(),
+            }
+
+
+# Shared registry used by the transcript server and the CLI scripts
+registry = ModelRegistry()